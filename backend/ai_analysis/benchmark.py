@@ -0,0 +1,384 @@
+"""
+문서 생성 벤치마크 모듈 - 생성기 유형별 성능을 고정 코퍼스로 측정하여 JSON 보고서로 저장합니다.
+
+사용 예:
+    python -m ai_analysis.benchmark --output reports/baseline.json
+    python -m ai_analysis.benchmark --generators template hybrid --baseline reports/baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import queue as queue_module
+import argparse
+import platform
+import resource
+import logging
+import multiprocessing
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import BASE_DIR, MODEL_CONFIG, DOCUMENT_GENERATION_CONFIG
+from models.document import DocumentType, DocumentGenerationRequest
+
+logger = logging.getLogger(__name__)
+
+REPORT_SCHEMA_VERSION = 1
+DEFAULT_CORPUS_PATH = os.path.join(BASE_DIR.parent, "src", "data", "opportunities.json")
+GENERATOR_TYPES = ("transformer", "template", "hybrid")
+
+# 격리 프로세스 결과 확인 주기(초) 및 기본 제한 시간(초)
+_RESULT_POLL_INTERVAL = 1.0
+DEFAULT_TIMEOUT_SECONDS = 3600
+
+# 비교 대상 지표 (값이 작을수록 좋은 지표는 True)
+COMPARED_METRICS = {
+    "cold_start_seconds": True,
+    "wall_time_seconds": True,
+    "section_latency_p50": True,
+    "section_latency_p95": True,
+    "tokens_per_second": False,
+    "peak_memory_mb": True,
+}
+
+
+def load_corpus(corpus_path: str = DEFAULT_CORPUS_PATH,
+                limit: Optional[int] = None, max_tokens: int = 4000,
+                target_length: Optional[int] = None) -> List[Dict[str, Any]]:
+    """입찰 공고 데이터로 고정 생성 요청 목록 구성 (요청, 입찰 데이터 쌍)"""
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        opportunities = json.load(f)['opportunities']
+
+    corpus = []
+    for opportunity in sorted(opportunities, key=lambda o: o['id'])[:limit]:
+        request = DocumentGenerationRequest(
+            title=f"{opportunity['title']} 제안서",
+            document_type=DocumentType.PROPOSAL,
+            content_requirements={"requirements": opportunity.get('requirements', [])},
+            max_tokens=max_tokens,
+            target_length=target_length
+        )
+        tender_data = {
+            "title": opportunity['title'],
+            "description": opportunity.get('description', ''),
+            "organization_name": opportunity.get('agency', ''),
+            "estimated_value": opportunity.get('value', ''),
+            "currency": "USD",
+            "submission_deadline": opportunity.get('closeDate', '')
+        }
+        corpus.append({"id": opportunity['id'], "request": request, "tender_data": tender_data})
+
+    return corpus
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percentile / 100 * (len(ordered) - 1)))))
+    return round(ordered[index], 4)
+
+
+def _peak_memory_mb() -> float:
+    """프로세스 최대 상주 메모리 (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 는 바이트, Linux 는 KB 단위
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _instrument(obj: Any, method_name: str, sink: List[float]) -> None:
+    """인스턴스 메서드 호출 시간을 sink 에 기록하도록 감싸기"""
+    method = getattr(obj, method_name)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            sink.append(time.perf_counter() - start)
+
+    setattr(obj, method_name, timed)
+
+
+def _build_generator(generator_type: str, section_latencies: List[float]) -> Any:
+    """섹션 단위 시간 측정이 연결된 생성기 생성"""
+    from ai_analysis.document_generator import (
+        TransformerDocumentGenerator, TemplateBasedGenerator, HybridDocumentGenerator
+    )
+
+    if generator_type == "transformer":
+        generator = TransformerDocumentGenerator()
+        _instrument(generator, "_generate_text_for_section", section_latencies)
+    elif generator_type == "hybrid":
+        generator = HybridDocumentGenerator()
+        _instrument(generator, "_enhance_section_with_ai", section_latencies)
+    else:
+        generator = TemplateBasedGenerator()
+
+    return generator
+
+
+def _token_counter() -> Callable[[str], int]:
+    """생성 결과 토큰 수 계산 함수 (GPT-2 토크나이저 기준으로 통일)"""
+    from transformers import GPT2Tokenizer
+    tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
+    return lambda text: len(tokenizer.encode(text)) if text else 0
+
+
+def run_generator_benchmark(generator_type: str, corpus: List[Dict[str, Any]],
+                            use_db: bool = False, render_cache: bool = False) -> Dict[str, Any]:
+    """단일 생성기 유형 벤치마크"""
+    import ai_analysis.template_repository as template_repository_module
+
+    if not use_db:
+        # DB 연결 시간이 측정에 섞이지 않도록 파일 템플릿만 사용
+        template_repository_module.template_repository = template_repository_module.TemplateRepository(use_db=False)
+
+    # 이전 실행(디스크 캐시 포함)의 결과가 측정에 섞이지 않도록 섹션 캐시는 항상 끄고,
+    # 렌더링 캐시는 명시적으로 요청한 경우에만 사용
+    DOCUMENT_GENERATION_CONFIG['section_cache']['enabled'] = False
+    DOCUMENT_GENERATION_CONFIG['render_cache']['enabled'] = render_cache
+
+    count_tokens = _token_counter()
+    section_latencies: List[float] = []
+    generator = _build_generator(generator_type, section_latencies)
+
+    wall_start = time.perf_counter()
+
+    cold_start = time.perf_counter()
+    generator.initialize()
+    cold_start_seconds = time.perf_counter() - cold_start
+
+    documents = []
+    generated_tokens = 0
+    generation_seconds = 0.0
+
+    for item in corpus:
+        start = time.perf_counter()
+        document = generator.generate_document(item['request'], item['tender_data'])
+        elapsed = time.perf_counter() - start
+
+        tokens = sum(count_tokens(s['content']) for s in document['sections'])
+        generated_tokens += tokens
+        generation_seconds += elapsed
+
+        if generator_type == "template":
+            # 템플릿 생성기는 섹션별 호출이 없으므로 문서 시간을 섹션 수로 배분
+            sections = max(len(document['sections']), 1)
+            section_latencies.extend([elapsed / sections] * sections)
+
+        documents.append({
+            "id": item['id'],
+            "seconds": round(elapsed, 4),
+            "sections": len(document['sections']),
+            "tokens": tokens
+        })
+
+    wall_time_seconds = time.perf_counter() - wall_start
+
+    return {
+        "generator_type": generator_type,
+        "documents": len(documents),
+        "cold_start_seconds": round(cold_start_seconds, 4),
+        "wall_time_seconds": round(wall_time_seconds, 4),
+        "generation_seconds": round(generation_seconds, 4),
+        "section_count": len(section_latencies),
+        "section_latency_mean": round(sum(section_latencies) / len(section_latencies), 4) if section_latencies else 0.0,
+        "section_latency_p50": _percentile(section_latencies, 50),
+        "section_latency_p95": _percentile(section_latencies, 95),
+        "generated_tokens": generated_tokens,
+        "tokens_per_second": round(generated_tokens / generation_seconds, 2) if generation_seconds else 0.0,
+        "peak_memory_mb": _peak_memory_mb(),
+        "per_document": documents
+    }
+
+
+def _run_isolated(generator_type: str, corpus_options: Dict[str, Any], use_db: bool,
+                  render_cache: bool, queue: "multiprocessing.Queue") -> None:
+    """별도 프로세스에서 벤치마크 실행 (콜드 스타트와 최대 메모리를 생성기별로 분리)"""
+    try:
+        corpus = load_corpus(**corpus_options)
+        queue.put(run_generator_benchmark(generator_type, corpus, use_db, render_cache))
+    except Exception as e:
+        queue.put({"generator_type": generator_type, "error": str(e)})
+
+
+def _wait_for_result(generator_type: str, process: Any, result_queue: Any, timeout: float) -> Dict[str, Any]:
+    """
+    격리 프로세스의 결과 대기
+
+    - 결과 없이 프로세스가 종료되면 (비정상 종료) 종료 코드를 담은 오류 결과
+    - 제한 시간을 넘기면 프로세스를 종료하고 오류 결과
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            return result_queue.get(timeout=_RESULT_POLL_INTERVAL)
+        except queue_module.Empty:
+            pass
+
+        if process.exitcode is not None:
+            # 종료 직전에 넣은 결과가 아직 전달되지 않았을 수 있으므로 한 번 더 확인
+            try:
+                return result_queue.get(timeout=_RESULT_POLL_INTERVAL)
+            except queue_module.Empty:
+                return {"generator_type": generator_type, "error": f"프로세스 비정상 종료 (종료 코드: {process.exitcode})"}
+
+        if time.monotonic() >= deadline:
+            process.terminate()
+            return {"generator_type": generator_type, "error": f"제한 시간 초과 ({timeout}초)"}
+
+
+def run_benchmark(generator_types: List[str] = GENERATOR_TYPES, corpus_path: str = DEFAULT_CORPUS_PATH,
+                  limit: Optional[int] = None, max_tokens: int = 4000, target_length: Optional[int] = None,
+                  isolate: bool = True, use_db: bool = False, render_cache: bool = False,
+                  timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """전체 벤치마크 실행 및 보고서 구성"""
+    corpus_options = {
+        "corpus_path": corpus_path,
+        "limit": limit,
+        "max_tokens": max_tokens,
+        "target_length": target_length
+    }
+    corpus = load_corpus(**corpus_options)
+
+    results = {}
+    for generator_type in generator_types:
+        logger.info(f"벤치마크 실행: {generator_type} (요청 {len(corpus)}개)")
+
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            queue = context.Queue()
+            process = context.Process(
+                target=_run_isolated,
+                args=(generator_type, corpus_options, use_db, render_cache, queue)
+            )
+            process.start()
+            result = _wait_for_result(generator_type, process, queue, timeout)
+            process.join()
+        else:
+            try:
+                result = run_generator_benchmark(generator_type, corpus, use_db, render_cache)
+            except Exception as e:
+                result = {"generator_type": generator_type, "error": str(e)}
+
+        if "error" in result:
+            logger.error(f"벤치마크 실패: {generator_type} ({result['error']})")
+
+        results[generator_type] = result
+
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": _environment_info(),
+        "config": {
+            "transformer_backend": MODEL_CONFIG['transformer']['backend'],
+            "speculative_draft_model": DOCUMENT_GENERATION_CONFIG['speculative']['draft_model'] or None,
+            "max_tokens": max_tokens,
+            "target_length": target_length,
+            "isolated_processes": isolate,
+            "render_cache": render_cache,
+            "section_cache": False
+        },
+        "corpus": {
+            "path": os.path.relpath(corpus_path, BASE_DIR.parent),
+            "size": len(corpus),
+            "ids": [item['id'] for item in corpus]
+        },
+        "results": results
+    }
+
+
+def _environment_info() -> Dict[str, Any]:
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+    try:
+        import torch
+        import transformers
+        info.update({
+            "torch": torch.__version__,
+            "torch_threads": torch.get_num_threads(),
+            "transformers": transformers.__version__
+        })
+    except ImportError:
+        pass
+    return info
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """두 보고서의 생성기별 주요 지표 비교 (current / baseline 비율과 개선 여부)"""
+    comparison = {}
+
+    for generator_type, result in current['results'].items():
+        base = baseline.get('results', {}).get(generator_type)
+        if not base or "error" in base or "error" in result:
+            continue
+
+        metrics = {}
+        for metric, lower_is_better in COMPARED_METRICS.items():
+            before, after = base.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            metrics[metric] = {
+                "baseline": before,
+                "current": after,
+                "ratio": round(ratio, 4),
+                "improved": ratio < 1 if lower_is_better else ratio > 1
+            }
+        comparison[generator_type] = metrics
+
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="문서 생성기 벤치마크")
+    parser.add_argument("--generators", nargs="+", choices=GENERATOR_TYPES, default=list(GENERATOR_TYPES))
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_PATH, help="입찰 공고 JSON 경로")
+    parser.add_argument("--limit", type=int, default=None, help="사용할 공고 수")
+    parser.add_argument("--max-tokens", type=int, default=4000)
+    parser.add_argument("--target-length", type=int, default=None)
+    parser.add_argument("--no-isolate", action="store_true", help="생성기별 별도 프로세스를 사용하지 않음")
+    parser.add_argument("--with-db", action="store_true", help="DB 템플릿 포함")
+    parser.add_argument("--render-cache", action="store_true", help="템플릿 렌더링 캐시 사용")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="생성기별 제한 시간(초, 별도 프로세스 사용 시)")
+    parser.add_argument("--output", default=None, help="보고서 저장 경로 (없으면 표준 출력)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 보고서 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        generator_types=args.generators,
+        corpus_path=args.corpus,
+        limit=args.limit,
+        max_tokens=args.max_tokens,
+        target_length=args.target_length,
+        isolate=not args.no_isolate,
+        use_db=args.with_db,
+        render_cache=args.render_cache,
+        timeout=args.timeout
+    )
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['comparison'] = compare_reports(json.load(f), report)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"벤치마크 보고서 저장: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    main()
@@ -0,0 +1,65 @@
+"""
+생성 취소 모듈 - 클라이언트 연결이 끊어진 요청의 문서 생성을 협력적으로 중단합니다.
+
+요청 처리 측에서 토큰을 취소하면 생성기는 섹션 사이에서, 모델은 다음 토큰 생성 전에 중단합니다.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import torch
+from transformers import StoppingCriteria
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCancelled(Exception):
+    """문서 생성이 취소됨"""
+
+    def __init__(self, reason: Optional[str] = None):
+        self.reason = reason or "cancelled"
+        super().__init__(f"문서 생성이 취소되었습니다 ({self.reason})")
+
+
+class CancellationToken:
+    """스레드 간 공유되는 취소 신호"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+            logger.info(f"문서 생성 취소 요청: {reason}")
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """취소된 경우 GenerationCancelled 발생"""
+        if self._event.is_set():
+            raise GenerationCancelled(self.reason)
+
+
+def raise_if_cancelled(token: Optional[CancellationToken]) -> None:
+    """토큰이 있고 취소된 경우 GenerationCancelled 발생"""
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+class CancellationStoppingCriteria(StoppingCriteria):
+    """취소 신호가 오면 model.generate 를 다음 토큰 전에 중단"""
+
+    name = "cancelled"
+
+    def __init__(self, token: CancellationToken):
+        self.token = token
+        self.triggered = False
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        self.triggered = self.token.is_cancelled
+        return self.triggered
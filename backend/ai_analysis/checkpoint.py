@@ -0,0 +1,220 @@
+"""
+생성 체크포인트 모듈 - 완료된 섹션을 즉시 저장하여 중단된 문서 생성을 마지막 완료 섹션부터 재개합니다.
+
+작업 기록은 MongoDB generation_checkpoints 컬렉션에 저장되며, 진행 상황 조회에도 사용됩니다.
+실행 중인 작업은 유효 시간(lease)을 가지며, 섹션을 저장할 때마다 연장됩니다.
+"""
+
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_COLLECTION = "generation_checkpoints"
+
+
+class CheckpointConflict(Exception):
+    """같은 작업 ID 로 다른 내용의 요청이 전송됨"""
+
+
+class CheckpointInProgress(Exception):
+    """같은 작업 ID 의 생성이 다른 요청에서 실행 중 (유효 시간 이내)"""
+
+
+class CheckpointCompleted(Exception):
+    """같은 작업 ID 의 생성이 이미 완료됨 (저장된 문서 ID 포함)"""
+
+    def __init__(self, job_id: str, record: Dict[str, Any]):
+        super().__init__(f"작업 ID {job_id} 는 이미 완료되었습니다")
+        self.job_id = job_id
+        self.document_id = record.get("document_id")
+        self.sql_document_id = record.get("sql_document_id")
+
+
+class GenerationCheckpoint:
+    """문서 생성 작업 하나의 체크포인트 (상태: running, completed, failed, cancelled)"""
+
+    def __init__(self, collection: Any, record_id: str, job_id: str, sections: Optional[List[Dict[str, Any]]] = None,
+                 run_id: Optional[str] = None):
+        self.collection = collection
+        self.record_id = record_id
+        self.job_id = job_id
+        # 이 실행의 식별자 - 유효 시간이 지나 다른 요청이 이어받으면 이 실행의 기록은 반영되지 않음
+        self.run_id = run_id
+        self.lease = timedelta(seconds=DOCUMENT_GENERATION_CONFIG['checkpoint']['lease_seconds'])
+        self._sections = {s['name']: s for s in (sections or [])}
+        self._lock = threading.Lock()
+
+    def _filter(self) -> Dict[str, Any]:
+        return {"_id": self.record_id, "run_id": self.run_id}
+
+    @property
+    def resumed_sections(self) -> List[str]:
+        """이전 실행에서 완료된 섹션 이름"""
+        return list(self._sections)
+
+    def get_section(self, section_name: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """완료된 섹션 조회 (생성 조건을 나타내는 캐시 키가 같을 때만)"""
+        section = self._sections.get(section_name)
+        if section and section.get('cache_key') == cache_key:
+            return section
+        return None
+
+    def set_total_sections(self, total: int) -> None:
+        now = datetime.utcnow()
+        self.collection.update_one(
+            self._filter(),
+            {"$set": {"total_sections": total, "updated_at": now, "lease_expires_at": now + self.lease}}
+        )
+
+    def save_section(self, section: Dict[str, Any]) -> None:
+        """완료된 섹션 저장 (같은 이름의 이전 기록은 교체, 유효 시간 연장)"""
+        with self._lock:
+            self._sections[section['name']] = section
+            sections = list(self._sections.values())
+
+        now = datetime.utcnow()
+        try:
+            self.collection.update_one(
+                self._filter(),
+                {"$set": {
+                    "sections": sections,
+                    "completed_sections": [s['name'] for s in sections],
+                    "updated_at": now,
+                    "lease_expires_at": now + self.lease
+                }}
+            )
+        except Exception as e:
+            # 체크포인트 저장 실패는 생성 자체를 중단시키지 않음
+            logger.error(f"체크포인트 저장 중 오류 발생 ({self.job_id}): {str(e)}")
+
+    def finish(self, status: str, **fields: Any) -> None:
+        """작업 종료 상태 기록 (보관 기간 이후 자동 삭제)"""
+        now = datetime.utcnow()
+        fields.update({
+            "status": status,
+            "updated_at": now,
+            "finished_at": now,
+            "expires_at": now + timedelta(seconds=DOCUMENT_GENERATION_CONFIG['checkpoint']['ttl_seconds'])
+        })
+        result = self.collection.update_one(self._filter(), {"$set": fields, "$unset": {"lease_expires_at": ""}})
+        if result.matched_count == 0:
+            logger.warning(f"다른 요청이 이어받은 작업의 종료 상태는 기록하지 않습니다: {self.job_id} ({status})")
+
+
+class CheckpointStore:
+    """MongoDB 기반 생성 작업 체크포인트 저장소"""
+
+    def __init__(self, mongo_db: Database):
+        self.collection = mongo_db[CHECKPOINT_COLLECTION]
+
+    @staticmethod
+    def create_indexes(mongo_db: Database) -> None:
+        """사용자별 조회 및 만료(TTL) 인덱스 생성"""
+        collection = mongo_db[CHECKPOINT_COLLECTION]
+        collection.create_index([("user_id", ASCENDING), ("updated_at", ASCENDING)])
+        collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    @staticmethod
+    def _record_id(user_id: int, job_id: str) -> str:
+        return f"{user_id}:{job_id}"
+
+    def start(self, job_id: str, user_id: int, fingerprint: str, metadata: Optional[Dict[str, Any]] = None) -> GenerationCheckpoint:
+        """
+        작업 시작 또는 재개
+
+        - 같은 작업 ID 의 기록이 있으면 완료된 섹션을 불러와 재개
+        - 요청 내용이 다르면 CheckpointConflict
+        - 이미 완료된 작업이면 CheckpointCompleted (저장된 문서 ID 포함)
+        - 다른 요청이 유효 시간 내에 실행 중이면 CheckpointInProgress
+          (유효 시간이 지난 실행은 중단된 것으로 보고 이어받음)
+        """
+        record_id = self._record_id(user_id, job_id)
+        run_id = uuid.uuid4().hex
+        lease = timedelta(seconds=DOCUMENT_GENERATION_CONFIG['checkpoint']['lease_seconds'])
+        now = datetime.utcnow()
+
+        try:
+            self.collection.insert_one({
+                "_id": record_id,
+                "job_id": job_id,
+                "user_id": user_id,
+                "fingerprint": fingerprint,
+                "metadata": metadata or {},
+                "sections": [],
+                "completed_sections": [],
+                "status": "running",
+                "run_id": run_id,
+                "attempts": 1,
+                "created_at": now,
+                "updated_at": now,
+                "started_at": now,
+                "lease_expires_at": now + lease
+            })
+            return GenerationCheckpoint(self.collection, record_id, job_id, [], run_id)
+        except DuplicateKeyError:
+            pass
+
+        # 실패/취소된 작업 또는 유효 시간이 지난 실행 중 작업만 이어받음
+        record = self.collection.find_one_and_update(
+            {
+                "_id": record_id,
+                "fingerprint": fingerprint,
+                "$or": [
+                    {"status": {"$in": ["failed", "cancelled"]}},
+                    {"status": "running", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "run_id": run_id,
+                    "updated_at": now,
+                    "started_at": now,
+                    "lease_expires_at": now + lease
+                },
+                "$unset": {"expires_at": "", "error": ""},
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+
+        if record is None:
+            existing = self.collection.find_one({"_id": record_id}, {"sections": 0})
+            if existing is None:
+                # 확인하는 사이에 기록이 만료된 경우 다시 시도
+                return self.start(job_id, user_id, fingerprint, metadata)
+            if existing.get("fingerprint") != fingerprint:
+                raise CheckpointConflict(f"작업 ID {job_id} 는 다른 요청에 사용되었습니다")
+            if existing.get("status") == "completed":
+                raise CheckpointCompleted(job_id, existing)
+            raise CheckpointInProgress(f"작업 ID {job_id} 는 다른 요청에서 실행 중입니다")
+
+        sections = record.get("sections", [])
+        logger.info(f"생성 작업 재개: {job_id} (완료 섹션 {len(sections)}개, 시도 {record.get('attempts')}회)")
+
+        return GenerationCheckpoint(self.collection, record_id, job_id, sections, run_id)
+
+    def get_status(self, job_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """작업 진행 상황 조회"""
+        record = self.collection.find_one(
+            {"_id": self._record_id(user_id, job_id)},
+            {"sections": 0, "fingerprint": 0, "run_id": 0}
+        )
+        if not record:
+            return None
+
+        record.pop("_id", None)
+        total = record.get("total_sections")
+        completed = len(record.get("completed_sections", []))
+        record["progress"] = round(completed / total, 4) if total else 0.0
+        return record
@@ -0,0 +1,177 @@
+"""
+컨텍스트 압축 모듈 - 입찰 설명의 추출 요약을 캐싱하고 섹션 프롬프트 컨텍스트를 토큰 예산에 맞춥니다.
+
+긴 입찰 설명이 GPT-2 컨텍스트 창(1024 토큰)을 대부분 차지하면 생성 가능한 토큰이 줄어들므로,
+핵심 문장만 원래 순서대로 남긴 요약을 입찰 내용 해시별로 한 번만 계산해 재사용합니다.
+"""
+
+import re
+import math
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from transformers import PreTrainedTokenizer
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+from ai_analysis.generation_cache import LRUCache, canonical_hash
+
+logger = logging.getLogger(__name__)
+
+# 문장 경계 (마침표류 뒤 공백 또는 줄바꿈)
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+TERM_PATTERN = re.compile(r"\w{2,}")
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장 단위로 분리"""
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text or "") if s and s.strip()]
+
+
+def score_sentences(sentences: List[str]) -> List[float]:
+    """
+    문장 중요도 점수 (추출 요약용)
+
+    - 문서 전체에서 자주 등장하는 용어를 많이 포함할수록 높은 점수
+    - 긴 문장이 유리하지 않도록 용어 수의 제곱근으로 정규화
+    - 첫 문장(보통 사업 개요)에 가산점
+    """
+    sentence_terms = [[t.lower() for t in TERM_PATTERN.findall(s)] for s in sentences]
+    frequencies = Counter(t for terms in sentence_terms for t in set(terms))
+
+    scores = []
+    for index, terms in enumerate(sentence_terms):
+        if not terms:
+            scores.append(0.0)
+            continue
+        score = sum(frequencies[t] for t in set(terms)) / math.sqrt(len(terms))
+        if index == 0:
+            score *= 1.5
+        scores.append(score)
+
+    return scores
+
+
+class ContextCompressor:
+    """토큰 예산 기반 프롬프트 컨텍스트 구성기"""
+
+    def __init__(self, tokenizer: PreTrainedTokenizer, token_budget: Optional[int] = None,
+                 cache: Optional[LRUCache] = None):
+        config = DOCUMENT_GENERATION_CONFIG['context_compression']
+        self.tokenizer = tokenizer
+        self.token_budget = token_budget or config['token_budget']
+        self.description_tokens = config['description_tokens']
+        self.requirement_chars = config['requirement_chars']
+        self.cache = cache
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text)) if text else 0
+
+    def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        token_ids = self.tokenizer.encode(text)
+        if len(token_ids) <= max_tokens:
+            return text
+        return self.tokenizer.decode(token_ids[:max_tokens]).rstrip() + "..."
+
+    def summarize(self, text: str, max_tokens: int) -> str:
+        """토큰 예산 안에서 중요 문장을 원래 순서대로 추출 (내용 해시별 캐싱)"""
+        if not text or max_tokens <= 0:
+            return ""
+
+        cache_key = canonical_hash({"text": text, "max_tokens": max_tokens})
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if self.count_tokens(text) <= max_tokens:
+            summary = text.strip()
+        else:
+            sentences = split_sentences(text)
+            scores = score_sentences(sentences)
+            ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+
+            selected = []
+            used = 0
+            for index in ranked:
+                tokens = self.count_tokens(sentences[index]) + 1
+                if used + tokens > max_tokens:
+                    continue
+                selected.append(index)
+                used += tokens
+
+            if selected:
+                summary = " ".join(sentences[i] for i in sorted(selected))
+            else:
+                # 모든 문장이 예산보다 길면 가장 중요한 문장을 잘라서 사용
+                summary = self._truncate_to_tokens(sentences[ranked[0]], max_tokens) if sentences else ""
+
+        if self.cache is not None:
+            self.cache.set(cache_key, summary)
+
+        return summary
+
+    def build_context(self, header_lines: List[str], description: Optional[str] = None,
+                      requirements: Optional[Dict[str, Any]] = None,
+                      references: Optional[List[str]] = None) -> str:
+        """
+        토큰 예산에 맞춘 컨텍스트 구성
+
+        우선순위: 기본 정보(항상 포함) > 입찰 설명 요약 > 콘텐츠 요구사항 > 참고 자료
+        """
+        lines = list(header_lines)
+        used = self.count_tokens("\n".join(lines))
+
+        if description:
+            budget = min(self.description_tokens, self.token_budget - used - 8)
+            summary = self.summarize(description, budget)
+            if summary:
+                line = f"입찰 설명: {summary}"
+                lines.append(line)
+                used += self.count_tokens(line) + 1
+
+        def append_block(title: str, items: List[str]) -> None:
+            nonlocal used
+            block = []
+            block_tokens = self.count_tokens(title) + 1
+            for item in items:
+                line = f"- {item}"
+                tokens = self.count_tokens(line) + 1
+                if used + block_tokens + tokens > self.token_budget:
+                    continue
+                block.append(line)
+                block_tokens += tokens
+            if block:
+                lines.append(title)
+                lines.extend(block)
+                used += block_tokens
+
+        if requirements:
+            items = []
+            for key, value in requirements.items():
+                if key == "generator_type":
+                    continue
+                value = str(value)
+                if len(value) > self.requirement_chars:
+                    value = value[:self.requirement_chars].rstrip() + "..."
+                items.append(f"{key}: {value}")
+            append_block("콘텐츠 요구사항:", items)
+
+        if references:
+            append_block("참고 자료:", references)
+
+        return "\n".join(lines)
+
+
+_summary_cache: Optional[LRUCache] = None
+
+
+def get_summary_cache() -> LRUCache:
+    """입찰 설명 요약 캐시 반환"""
+    global _summary_cache
+
+    if _summary_cache is None:
+        config = DOCUMENT_GENERATION_CONFIG['context_compression']
+        _summary_cache = LRUCache("tender_summary", config['max_entries'], config['disk_dir'])
+
+    return _summary_cache
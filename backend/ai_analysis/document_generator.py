@@ -3,9 +3,11 @@ AI 문서 생성 모듈 - 입찰 문서 자동 생성 및 최적화 기능을 
 """
 
 import os
+import re
 import logging
 import json
 import time
+import threading
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
@@ -14,14 +16,92 @@ import numpy as np
 import pandas as pd
 import nltk
 import spacy
-from transformers import pipeline, GPT2LMHeadModel, GPT2Tokenizer
+from transformers import pipeline, GPT2Tokenizer, LogitsProcessorList, NoRepeatNGramLogitsProcessor
 
 # 내부 모듈
-from config.settings import MODEL_CONFIG, NLP_CONFIG
+from config.settings import MODEL_CONFIG, NLP_CONFIG, DOCUMENT_GENERATION_CONFIG
 from models.document import DocumentType, DocumentGenerationRequest
+from ai_analysis.template_repository import CompiledTemplate, get_template_repository
+from ai_analysis.generation_cache import LRUCache, canonical_hash, get_render_cache, get_section_cache
+from ai_analysis.model_backends import load_causal_lm, check_generation_quality, passes_quality_check
+from ai_analysis.retrieval import get_retrieval_index
+from ai_analysis.context_compressor import ContextCompressor, get_summary_cache
+from ai_analysis.speculative import SpeculativeDecoder, SpeculativeStats
+from ai_analysis.stopping_criteria import build_section_stopping_criteria, get_stop_reason, trim_generated_text
+from ai_analysis.cancellation import (
+    CancellationToken, CancellationStoppingCriteria, GenerationCancelled, raise_if_cancelled
+)
+from ai_analysis.checkpoint import GenerationCheckpoint
 
 logger = logging.getLogger(__name__)
 
+# 템플릿 엔진 정규식 (모듈 로드 시 한 번만 컴파일)
+CONDITIONAL_BLOCK_PATTERN = re.compile(r"{%\s*if\s+([^%]+)\s*%}(.*?){%\s*endif\s*%}", re.DOTALL)
+UNRESOLVED_PLACEHOLDER_PATTERN = re.compile(r"{{\s*[^}]+\s*}}")
+
+# 적합한 템플릿이 없을 때 사용하는 기본 템플릿
+DEFAULT_RENDER_TEMPLATE = CompiledTemplate(
+    "default",
+    {
+        "id": "default",
+        "title": "{{title}}",
+        "sections": [
+            {
+                "name": "개요",
+                "content": "본 문서는 {{title}}에 대한 {{document_type}} 문서입니다.\n\n{% if tender_title %}입찰 제목: {{tender_title}}{% endif %}\n\n{% if organization_name %}발주 기관: {{organization_name}}{% endif %}"
+            },
+            {
+                "name": "내용",
+                "content": "{% if content_requirements %}요구사항에 따른 내용이 여기에 들어갑니다.{% endif %}"
+            },
+            {
+                "name": "결론",
+                "content": "이상으로 {{title}}에 대한 내용을 마칩니다."
+            }
+        ]
+    },
+    "builtin",
+    "1"
+)
+
+GENERATION_ERROR_PREFIX = "[텍스트 생성 오류"
+
+# 섹션 생성 시 반복을 막는 n-gram 크기 (일반 생성과 추측 디코딩에 동일하게 적용)
+NO_REPEAT_NGRAM_SIZE = 3
+
+
+def _reuse_section_content(section_name: str, cache_key: str, request: DocumentGenerationRequest,
+                           previous_sections: Dict[str, Dict[str, Any]],
+                           section_cache: Optional[LRUCache],
+                           checkpoint: Optional[GenerationCheckpoint] = None) -> Tuple[Optional[str], str]:
+    """
+    재사용 가능한 섹션 내용 조회 (내용, 출처) - 없으면 (None, "generated")
+    
+    - 같은 작업의 이전 실행에서 완료된 섹션은 체크포인트에서 재개
+    - regenerate_sections 에 지정된 섹션은 항상 다시 생성
+    - regenerate_sections 가 지정되면 나머지 섹션은 기존 문서 내용을 그대로 사용
+    - 그 외에는 캐시 키가 같은 기존 문서 섹션 또는 섹션 캐시를 사용
+    """
+    if checkpoint:
+        completed = checkpoint.get_section(section_name, cache_key)
+        if completed is not None:
+            return completed['content'], "checkpoint"
+    
+    if request.regenerate_sections and section_name in request.regenerate_sections:
+        return None, "generated"
+    
+    previous = previous_sections.get(section_name)
+    if previous and (request.regenerate_sections or previous.get('cache_key') == cache_key):
+        return previous.get('content', ''), "base_document"
+    
+    if section_cache:
+        cached = section_cache.get(cache_key)
+        if cached is not None:
+            return cached['content'], "cache"
+    
+    return None, "generated"
+
+
 class BaseDocumentGenerator:
     """기본 문서 생성기 클래스"""
     
@@ -29,64 +109,121 @@ class BaseDocumentGenerator:
         self.model = None
         self.tokenizer = None
         self.is_initialized = False
+        # 동시 요청이 같은 인스턴스를 초기화할 때 모델을 한 번만 로드
+        self._init_lock = threading.Lock()
     
     def initialize(self) -> None:
         """모델 초기화"""
         raise NotImplementedError("자식 클래스에서 구현해야 합니다")
     
-    def generate_document(self, request: DocumentGenerationRequest) -> Dict[str, Any]:
-        """문서 생성"""
+    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None,
+                          base_document: Optional[Dict[str, Any]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          checkpoint: Optional[GenerationCheckpoint] = None) -> Dict[str, Any]:
+        """
+        문서 생성
+        
+        - base_document 가 있으면 변경되지 않은 섹션 재사용
+        - cancel_token 이 취소되면 GenerationCancelled
+        - checkpoint 가 있으면 완료된 섹션을 즉시 저장하고, 이전 실행에서 완료된 섹션부터 재개
+        """
         raise NotImplementedError("자식 클래스에서 구현해야 합니다")
 
 
 class TransformerDocumentGenerator(BaseDocumentGenerator):
     """Transformer 기반 문서 생성기"""
     
-    def __init__(self, model_name: str = "gpt2"):
+    def __init__(self, model_name: str = "gpt2", backend: Optional[str] = None):
         super().__init__()
         self.model_name = model_name
+        self.backend = backend or MODEL_CONFIG['transformer']['backend']
         self.max_length = 1024
-        self.document_templates = {}
-        self._load_templates()
+        self.template_repository = get_template_repository()
+        self.quality_report = None
+        self.draft_model = None
+        self.speculative_decoder = None
+        self.context_compressor = None
     
-    def _load_templates(self) -> None:
-        """문서 템플릿 로드"""
-        try:
-            template_dir = os.path.join(MODEL_CONFIG['transformer']['path'], 'templates')
-            if not os.path.exists(template_dir):
-                logger.warning(f"템플릿 디렉터리를 찾을 수 없습니다: {template_dir}")
+    def initialize(self) -> None:
+        """모델 초기화 (인스턴스당 한 번, 품질 검증도 이때만 실행)"""
+        with self._init_lock:
+            if self.is_initialized:
                 return
             
-            # 템플릿 디렉터리에서 모든 JSON 파일 로드
-            for filename in os.listdir(template_dir):
-                if filename.endswith('.json'):
-                    with open(os.path.join(template_dir, filename), 'r', encoding='utf-8') as f:
-                        template = json.load(f)
-                        template_type = template.get('document_type')
-                        if template_type:
-                            self.document_templates[template_type] = template
-                            logger.info(f"템플릿 로드: {template_type}")
-        
-        except Exception as e:
-            logger.error(f"템플릿 로드 중 오류 발생: {str(e)}")
+            logger.info(f"Transformer 문서 생성기 초기화 (모델: {self.model_name}, 백엔드: {self.backend})...")
+            
+            try:
+                self.tokenizer = GPT2Tokenizer.from_pretrained(self.model_name)
+                self.model = load_causal_lm(self.model_name, self.backend, MODEL_CONFIG['transformer']['onnx_dir'])
+                
+                if self.backend != "pytorch" and MODEL_CONFIG['transformer']['quality_check']:
+                    self._verify_backend_quality()
+                
+                self._initialize_speculative_decoder()
+                
+                if DOCUMENT_GENERATION_CONFIG['context_compression']['enabled']:
+                    self.context_compressor = ContextCompressor(self.tokenizer, cache=get_summary_cache())
+                
+                self.is_initialized = True
+                logger.info("Transformer 문서 생성기 초기화 완료")
+            
+            except Exception as e:
+                logger.error(f"Transformer 문서 생성기 초기화 실패: {str(e)}")
+                raise
     
-    def initialize(self) -> None:
-        """모델 초기화"""
-        logger.info(f"Transformer 문서 생성기 초기화 (모델: {self.model_name})...")
-        
-        try:
-            self.tokenizer = GPT2Tokenizer.from_pretrained(self.model_name)
-            self.model = GPT2LMHeadModel.from_pretrained(self.model_name)
-            self.is_initialized = True
-            logger.info("Transformer 문서 생성기 초기화 완료")
-        
-        except Exception as e:
-            logger.error(f"Transformer 문서 생성기 초기화 실패: {str(e)}")
-            raise
+    def _verify_backend_quality(self) -> None:
+        """FP32 모델 대비 출력 품질 검증 (기준 미달 시 FP32 로 대체)"""
+        config = MODEL_CONFIG['transformer']
+        reference_model = load_causal_lm(self.model_name, "pytorch")
+        
+        self.quality_report = check_generation_quality(reference_model, self.model, self.tokenizer)
+        self.quality_report['backend'] = self.backend
+        
+        if passes_quality_check(
+            self.quality_report,
+            config['quality_min_token_agreement'],
+            config['quality_max_perplexity_ratio']
+        ):
+            logger.info(f"'{self.backend}' 백엔드 품질 검증 통과: {self.quality_report}")
+            return
+        
+        logger.warning(f"'{self.backend}' 백엔드 품질 검증 실패, FP32 모델을 사용합니다: {self.quality_report}")
+        self.model = reference_model
+        self.backend = "pytorch"
+    
+    def _initialize_speculative_decoder(self) -> None:
+        """초안 모델 로드 및 추측 디코더 구성 (설정된 경우에만)"""
+        config = DOCUMENT_GENERATION_CONFIG['speculative']
+        draft_model_name = config['draft_model']
+        
+        if not draft_model_name:
+            return
+        
+        if self.backend == "onnx":
+            logger.warning("ONNX 백엔드에서는 추측 디코딩을 지원하지 않습니다.")
+            return
+        
+        # 초안 모델은 기준 모델과 같은 토크나이저(어휘)를 사용해야 함
+        self.draft_model = load_causal_lm(draft_model_name, self.backend)
+        self.speculative_decoder = SpeculativeDecoder(self.model, self.draft_model, config['num_draft_tokens'])
+        logger.info(f"추측 디코딩 활성화 (초안 모델: {draft_model_name}, 제안 토큰 수: {config['num_draft_tokens']})")
+    
+    @property
+    def model_version(self) -> str:
+        """섹션 캐시 키에 사용하는 모델 식별자"""
+        return f"{self.model_name}/{self.backend}"
+    
+    @property
+    def speculative_stats(self) -> Optional[Dict[str, Any]]:
+        """누적 추측 디코딩 통계 (비활성화 시 None)"""
+        if not self.speculative_decoder:
+            return None
+        return self.speculative_decoder.stats_snapshot()
     
     def _get_template_for_document_type(self, document_type: DocumentType) -> Dict[str, Any]:
         """문서 유형에 맞는 템플릿 조회"""
-        template = self.document_templates.get(document_type.value)
+        entry = self.template_repository.get_by_document_type(document_type.value, required_key='structure')
+        template = entry.template if entry else None
         
         if not template:
             logger.warning(f"'{document_type.value}' 유형에 대한 템플릿이 없습니다. 기본 템플릿을 사용합니다.")
@@ -112,7 +249,7 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
         return template
     
     def _prepare_context(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None) -> str:
-        """문서 생성을 위한 컨텍스트 준비"""
+        """문서 생성을 위한 컨텍스트 준비 (압축 활성화 시 토큰 예산에 맞춰 요약)"""
         context = [
             f"제목: {request.title}",
             f"문서 유형: {request.document_type.value}",
@@ -124,9 +261,23 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
                 f"발주 기관: {tender_data.get('organization_name', '정보 없음')}",
                 f"예산: {tender_data.get('estimated_value', '정보 없음')} {tender_data.get('currency', 'KRW')}"
             ])
-            
-            if tender_data.get('description'):
-                context.append(f"입찰 설명: {tender_data['description']}")
+        
+        # 과거 제안서 및 입찰 기록 중 관련 내용
+        references = self._retrieve_references(request, tender_data)
+        
+        if self.context_compressor:
+            compressed = self.context_compressor.build_context(
+                context,
+                description=tender_data.get('description') if tender_data else None,
+                requirements=request.content_requirements,
+                references=references
+            )
+            logger.info(f"컨텍스트 압축: {self.context_compressor.count_tokens(compressed)}토큰 "
+                        f"(예산: {self.context_compressor.token_budget})")
+            return compressed
+        
+        if tender_data and tender_data.get('description'):
+            context.append(f"입찰 설명: {tender_data['description']}")
         
         # 콘텐츠 요구사항이 있으면 추가
         if request.content_requirements:
@@ -134,11 +285,44 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
             for key, value in request.content_requirements.items():
                 context.append(f"- {key}: {value}")
         
+        # 과거 제안서 및 입찰 기록 중 관련 내용 추가
+        if references:
+            context.append("참고 자료:")
+            context.extend(f"- {snippet}" for snippet in references)
+        
         return "\n".join(context)
     
+    def _retrieve_references(self, request: DocumentGenerationRequest,
+                             tender_data: Optional[Dict[str, Any]] = None) -> List[str]:
+        """검색 인덱스에서 관련 스니펫 조회 (인덱스가 없으면 빈 목록)"""
+        index = get_retrieval_index()
+        if index is None:
+            return []
+        
+        config = DOCUMENT_GENERATION_CONFIG['retrieval']
+        query_parts = [request.title]
+        if tender_data:
+            query_parts.extend([tender_data.get('title', ''), (tender_data.get('description') or '')[:500]])
+        
+        try:
+            start_time = time.time()
+            hits = index.search("\n".join(p for p in query_parts if p), top_k=config['top_k'])
+            logger.info(f"참고 자료 검색: {len(hits)}건 ({(time.time() - start_time) * 1000:.1f}ms)")
+        except Exception as e:
+            logger.error(f"참고 자료 검색 중 오류 발생: {str(e)}")
+            return []
+        
+        return [hit['text'][:config['snippet_chars']] for hit in hits]
+    
+    def _max_new_tokens(self, prompt_length: int, max_tokens: int) -> int:
+        """모델 컨텍스트 창을 넘지 않는 생성 토큰 수"""
+        return max(0, min(max_tokens, self.max_length - prompt_length))
+    
     def _generate_text_for_section(self, section_name: str, section_desc: str, context: str, 
-                                  style_params: Dict[str, Any], max_tokens: int = 500) -> str:
-        """특정 섹션에 대한 텍스트 생성"""
+                                  style_params: Dict[str, Any], max_tokens: int = 500,
+                                  target_words: Optional[int] = None,
+                                  cancel_token: Optional[CancellationToken] = None) -> str:
+        """특정 섹션에 대한 텍스트 생성 (섹션 제목, 반복, 목표 단어 수 도달 시 조기 종료)"""
         if not self.is_initialized:
             self.initialize()
         
@@ -155,27 +339,58 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
         # 텍스트 생성
         try:
             inputs = self.tokenizer(prompt, return_tensors="pt")
-            outputs = self.model.generate(
-                inputs.input_ids,
-                max_length=min(self.max_length, len(inputs.input_ids[0]) + max_tokens),
-                num_return_sequences=1,
-                temperature=0.7,
-                top_p=0.9,
-                no_repeat_ngram_size=3
-            )
+            prompt_length = inputs.input_ids.shape[1]
+            stopping_criteria = build_section_stopping_criteria(self.tokenizer, prompt_length, target_words)
+            if cancel_token:
+                stopping_criteria.append(CancellationStoppingCriteria(cancel_token))
+            max_new_tokens = self._max_new_tokens(prompt_length, max_tokens)
+            
+            if self.speculative_decoder and section_name in DOCUMENT_GENERATION_CONFIG['speculative']['sections']:
+                # 장문 섹션은 초안 모델 기반 추측 디코딩 사용 (일반 생성과 같은 반복 방지 처리 후 그리디 검증)
+                outputs, stats = self.speculative_decoder.generate(
+                    inputs.input_ids,
+                    max_new_tokens=max_new_tokens,
+                    eos_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=stopping_criteria,
+                    logits_processor=LogitsProcessorList([NoRepeatNGramLogitsProcessor(NO_REPEAT_NGRAM_SIZE)])
+                )
+                logger.info(f"추측 디코딩: {section_name} (수락률: {stats.as_dict()['acceptance_rate']})")
+            else:
+                outputs = self.model.generate(
+                    inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
+                    max_new_tokens=max_new_tokens,
+                    num_return_sequences=1,
+                    temperature=0.7,
+                    top_p=0.9,
+                    no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
+                    stopping_criteria=stopping_criteria,
+                    pad_token_id=self.tokenizer.eos_token_id
+                )
+            
+            raise_if_cancelled(cancel_token)
             
-            generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            # 프롬프트 토큰을 제외하고 생성된 토큰만 디코딩
+            generated_text = self.tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True)
             
-            # 프롬프트 부분 제거하고 생성된 내용만 반환
-            result = generated_text[len(prompt):].strip()
-            return result
+            stop_reason = get_stop_reason(stopping_criteria)
+            if stop_reason:
+                logger.info(f"섹션 생성 조기 종료: {section_name} ({stop_reason}, {outputs.shape[1] - prompt_length}토큰)")
+            
+            return trim_generated_text(generated_text, target_words)
+        
+        except GenerationCancelled:
+            raise
         
         except Exception as e:
             logger.error(f"텍스트 생성 중 오류 발생: {str(e)}")
             return f"[텍스트 생성 오류: {str(e)}]"
     
-    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """문서 생성"""
+    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None,
+                          base_document: Optional[Dict[str, Any]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          checkpoint: Optional[GenerationCheckpoint] = None) -> Dict[str, Any]:
+        """문서 생성 (변경되지 않은 섹션은 기존 문서 또는 섹션 캐시에서 재사용)"""
         logger.info(f"문서 생성 시작: {request.title} (유형: {request.document_type.value})")
         
         if not self.is_initialized:
@@ -206,18 +421,36 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
             "generated_at": datetime.now().isoformat(),
             "parameters": {
                 "style": style_params,
-                "max_tokens": request.max_tokens
+                "max_tokens": request.max_tokens,
+                "target_length": request.target_length
             },
             "sections": []
         }
         
+        # 섹션별 목표 단어 수 (목표 길이를 섹션 수로 균등 배분)
+        section_target_words = None
+        if request.target_length and structure:
+            section_target_words = max(1, -(-request.target_length // len(structure)))
+        
+        # 섹션 재사용 준비
+        section_cache = get_section_cache()
+        context_hash = canonical_hash(context)
+        previous_sections = {s['name']: s for s in (base_document or {}).get('sections', [])}
+        
+        if checkpoint:
+            checkpoint.set_total_sections(len(structure))
+        
         # 섹션별 콘텐츠 생성
         for idx, section in enumerate(structure):
+            raise_if_cancelled(cancel_token)
+            
             section_name = section['name']
             section_desc = section.get('description', '')
             is_required = section.get('required', False)
             
-            logger.info(f"섹션 생성 중: {section_name} (필수: {is_required})")
+            # 섹션별 추가 요구사항
+            if request.section_requirements and request.section_requirements.get(section_name):
+                section_desc = f"{section_desc} - {request.section_requirements[section_name]}"
             
             # 섹션별 토큰 할당 (총 토큰을 각 섹션에 비례 배분)
             section_tokens = min(
@@ -225,17 +458,42 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
                 2000  # 섹션당 최대 토큰 수
             )
             
+            cache_key = canonical_hash({
+                "section": section_name,
+                "description": section_desc,
+                "context": context_hash,
+                "style": style_params,
+                "max_tokens": section_tokens,
+                "target_words": section_target_words,
+                "model": self.model_version
+            })
+            
             start_time = time.time()
+            speculative_snapshot = self.speculative_stats
             
-            # 섹션 내용 생성
-            content = self._generate_text_for_section(
-                section_name, 
-                section_desc, 
-                context, 
-                style_params,
-                section_tokens
+            content, content_source = _reuse_section_content(
+                section_name, cache_key, request, previous_sections, section_cache, checkpoint
             )
             
+            if content is None:
+                logger.info(f"섹션 생성 중: {section_name} (필수: {is_required})")
+                
+                # 섹션 내용 생성
+                content = self._generate_text_for_section(
+                    section_name, 
+                    section_desc, 
+                    context, 
+                    style_params,
+                    section_tokens,
+                    section_target_words,
+                    cancel_token
+                )
+                
+                if section_cache and not content.startswith(GENERATION_ERROR_PREFIX):
+                    section_cache.set(cache_key, {"content": content})
+            else:
+                logger.info(f"섹션 재사용: {section_name} ({content_source})")
+            
             # 섹션 정보 저장
             generated_document['sections'].append({
                 "name": section_name,
@@ -244,8 +502,18 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
                 "required": is_required,
                 "description": section_desc,
                 "is_ai_generated": True,
-                "generation_time": round(time.time() - start_time, 2)
+                "generation_time": round(time.time() - start_time, 2),
+                "cache_key": cache_key,
+                "content_source": content_source
             })
+            
+            if speculative_snapshot is not None:
+                section_stats = self.speculative_decoder.total_stats.since(speculative_snapshot)
+                if section_stats.rounds:
+                    generated_document['sections'][-1]['speculative_decoding'] = section_stats.as_dict()
+            
+            if checkpoint and content_source != "checkpoint":
+                checkpoint.save_section(generated_document['sections'][-1])
         
         # 추가 메타데이터
         content_length = sum(len(s['content']) for s in generated_document['sections'])
@@ -254,9 +522,24 @@ class TransformerDocumentGenerator(BaseDocumentGenerator):
             "total_sections": len(generated_document['sections']),
             "content_length": content_length,
             "content_words": len(' '.join([s['content'] for s in generated_document['sections']]).split()),
-            "generation_time_total": sum(s['generation_time'] for s in generated_document['sections'])
+            "generation_time_total": sum(s['generation_time'] for s in generated_document['sections']),
+            "regenerated_sections": [
+                s['name'] for s in generated_document['sections'] if s['content_source'] == "generated"
+            ],
+            "reused_sections": [
+                s['name'] for s in generated_document['sections'] if s['content_source'] != "generated"
+            ]
         }
         
+        if self.speculative_decoder:
+            document_stats = SpeculativeStats()
+            for s in generated_document['sections']:
+                if 'speculative_decoding' in s:
+                    document_stats.add(SpeculativeStats(**{
+                        field: s['speculative_decoding'][field] for field in SpeculativeStats.FIELDS
+                    }))
+            generated_document['metadata']['speculative_decoding'] = document_stats.as_dict()
+        
         logger.info(f"문서 생성 완료: {request.title} (섹션 수: {len(generated_document['sections'])})")
         
         return generated_document
@@ -268,43 +551,38 @@ class TemplateBasedGenerator(BaseDocumentGenerator):
     def __init__(self):
         super().__init__()
         self.nlp = None
-        self.templates_path = os.path.join(MODEL_CONFIG['transformer']['path'], 'templates')
-        self.templates = {}
+        self.template_repository = get_template_repository()
         self.is_initialized = False
     
     def initialize(self) -> None:
         """초기화"""
-        try:
-            # spaCy 모델 로드
-            self.nlp = spacy.load(NLP_CONFIG['spacy_model'])
+        with self._init_lock:
+            if self.is_initialized:
+                return
             
-            # 템플릿 로드
-            self._load_templates()
+            try:
+                # spaCy 모델 로드
+                self.nlp = spacy.load(NLP_CONFIG['spacy_model'])
+                
+                self.is_initialized = True
+                logger.info("템플릿 기반 문서 생성기 초기화 완료")
             
-            self.is_initialized = True
-            logger.info("템플릿 기반 문서 생성기 초기화 완료")
-        
-        except Exception as e:
-            logger.error(f"템플릿 기반 문서 생성기 초기화 실패: {str(e)}")
-            raise
+            except Exception as e:
+                logger.error(f"템플릿 기반 문서 생성기 초기화 실패: {str(e)}")
+                raise
     
-    def _load_templates(self) -> None:
-        """템플릿 로드"""
-        try:
-            if not os.path.exists(self.templates_path):
-                logger.warning(f"템플릿 디렉터리를 찾을 수 없습니다: {self.templates_path}")
-                return
-            
-            for filename in os.listdir(self.templates_path):
-                if filename.endswith('.json'):
-                    with open(os.path.join(self.templates_path, filename), 'r', encoding='utf-8') as f:
-                        template = json.load(f)
-                        template_id = template.get('id') or os.path.splitext(filename)[0]
-                        self.templates[template_id] = template
-                        logger.info(f"템플릿 로드: {template_id}")
-        
-        except Exception as e:
-            logger.error(f"템플릿 로드 중 오류 발생: {str(e)}")
+    @staticmethod
+    def _render_cache_key(entry: CompiledTemplate, request: DocumentGenerationRequest,
+                          data: Dict[str, Any]) -> str:
+        """렌더링 캐시 키 (템플릿 버전 + 템플릿이 참조하는 데이터의 정규화 해시)"""
+        return canonical_hash({
+            "template": [entry.source, entry.template_id, entry.version],
+            "data": {key: data[key] for key in sorted(entry.variables) if key in data},
+            "title": request.title,
+            "document_type": request.document_type.value,
+            "include_sections": request.include_sections,
+            "exclude_sections": request.exclude_sections
+        })
     
     def _fill_template(self, template_text: str, data: Dict[str, Any]) -> str:
         """템플릿 텍스트에 데이터 채우기"""
@@ -324,8 +602,6 @@ class TemplateBasedGenerator(BaseDocumentGenerator):
         
         # 조건부 섹션 처리 ({% if 조건 %} 내용 {% endif %})
         # 간단한 구현이므로 중첩된 조건문은 지원하지 않음
-        import re
-        pattern = r"{%\s*if\s+([^%]+)\s*%}(.*?){%\s*endif\s*%}"
         
         def process_condition(match):
             condition = match.group(1).strip()
@@ -336,55 +612,38 @@ class TemplateBasedGenerator(BaseDocumentGenerator):
                 return content
             return ""
         
-        result = re.sub(pattern, process_condition, result, flags=re.DOTALL)
+        result = CONDITIONAL_BLOCK_PATTERN.sub(process_condition, result)
         
         # 미처리된 플레이스홀더 제거
-        result = re.sub(r"{{\s*[^}]+\s*}}", "", result)
+        result = UNRESOLVED_PLACEHOLDER_PATTERN.sub("", result)
         
         return result
     
-    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """문서 생성"""
+    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None,
+                          base_document: Optional[Dict[str, Any]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          checkpoint: Optional[GenerationCheckpoint] = None) -> Dict[str, Any]:
+        """문서 생성 (템플릿 렌더링은 결정적이므로 base_document 없이 렌더링 캐시 사용)"""
         if not self.is_initialized:
             self.initialize()
         
+        raise_if_cancelled(cancel_token)
+        
         logger.info(f"템플릿 기반 문서 생성 시작: {request.title} (유형: {request.document_type.value})")
         
-        # 템플릿 선택
-        template_id = None
+        # 템플릿 선택 (템플릿 ID 우선, 없으면 문서 유형에 맞는 템플릿)
         if request.template_id:
-            template_id = str(request.template_id)
+            entry = self.template_repository.get(str(request.template_id))
         else:
-            # 문서 유형에 맞는 템플릿 찾기
-            for tid, template in self.templates.items():
-                if template.get('document_type') == request.document_type.value:
-                    template_id = tid
-                    break
+            entry = self.template_repository.get_by_document_type(
+                request.document_type.value, required_key='sections'
+            )
         
-        if not template_id or template_id not in self.templates:
+        if not entry:
             logger.warning(f"적합한 템플릿을 찾을 수 없습니다. 기본 템플릿을 사용합니다.")
-            # 기본 템플릿 구성
-            template = {
-                "id": "default",
-                "document_type": request.document_type.value,
-                "title": "{{title}}",
-                "sections": [
-                    {
-                        "name": "개요",
-                        "content": "본 문서는 {{title}}에 대한 {{document_type}} 문서입니다.\n\n{% if tender_title %}입찰 제목: {{tender_title}}{% endif %}\n\n{% if organization_name %}발주 기관: {{organization_name}}{% endif %}"
-                    },
-                    {
-                        "name": "내용",
-                        "content": "{% if content_requirements %}요구사항에 따른 내용이 여기에 들어갑니다.{% endif %}"
-                    },
-                    {
-                        "name": "결론",
-                        "content": "이상으로 {{title}}에 대한 내용을 마칩니다."
-                    }
-                ]
-            }
-        else:
-            template = self.templates[template_id]
+            entry = DEFAULT_RENDER_TEMPLATE
+        
+        template = entry.template
         
         # 데이터 준비
         data = {
@@ -409,6 +668,18 @@ class TemplateBasedGenerator(BaseDocumentGenerator):
         if request.content_requirements:
             data['content_requirements'] = request.content_requirements
         
+        # 렌더링 캐시 조회 (템플릿 버전과 데이터가 같으면 결과도 같음)
+        render_cache = get_render_cache()
+        cache_key = self._render_cache_key(entry, request, data) if render_cache else None
+        
+        if cache_key:
+            cached_document = render_cache.get(cache_key)
+            if cached_document is not None:
+                cached_document['generated_at'] = datetime.now().isoformat()
+                cached_document['metadata']['render_cache_hit'] = True
+                logger.info(f"템플릿 기반 문서 생성 완료 (캐시): {request.title}")
+                return cached_document
+        
         # 문서 생성
         generated_document = {
             "title": self._fill_template(template.get('title', request.title), data),
@@ -448,6 +719,9 @@ class TemplateBasedGenerator(BaseDocumentGenerator):
             "content_words": len(' '.join([s['content'] for s in generated_document['sections']]).split())
         }
         
+        if cache_key:
+            render_cache.set(cache_key, generated_document)
+        
         logger.info(f"템플릿 기반 문서 생성 완료: {request.title}")
         
         return generated_document
@@ -459,100 +733,226 @@ class HybridDocumentGenerator:
     템플릿으로 기본 구조를 생성하고 AI로 내용을 보강
     """
     
-    def __init__(self):
-        self.template_generator = TemplateBasedGenerator()
-        self.ai_generator = TransformerDocumentGenerator()
+    def __init__(self, template_generator: Optional[TemplateBasedGenerator] = None,
+                 ai_generator: Optional[TransformerDocumentGenerator] = None):
+        # 팩토리에서는 단독 생성기와 같은 인스턴스를 공유 (모델을 프로세스당 한 번만 로드)
+        self.template_generator = template_generator or TemplateBasedGenerator()
+        self.ai_generator = ai_generator or TransformerDocumentGenerator()
         self.is_initialized = False
     
     def initialize(self) -> None:
-        """초기화"""
+        """초기화 (하위 생성기는 각자 한 번만 초기화)"""
         if not self.is_initialized:
             self.template_generator.initialize()
             self.ai_generator.initialize()
             self.is_initialized = True
             logger.info("하이브리드 문서 생성기 초기화 완료")
     
-    def _enhance_section_with_ai(self, section: Dict[str, Any], context: str) -> Dict[str, Any]:
-        """AI를 사용하여 섹션 내용 보강"""
+    def _enhance_section_with_ai(self, section: Dict[str, Any], context: str,
+                                 target_words: Optional[int] = None,
+                                 requirement: Optional[str] = None,
+                                 cancel_token: Optional[CancellationToken] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        AI를 사용하여 섹션 내용 보강 -> (섹션, 보강 여부)
+        
+        - 내용이 충분하거나, 생성 결과가 더 짧거나, 오류가 발생하면 원본을 유지하고 False
+        """
         original_content = section['content']
         
         # 내용이 충분히 있는지 확인
         if len(original_content.split()) > 20:
             # 이미 충분한 내용이 있으면 그대로 반환
-            return section
+            return section, False
         
         # AI로 내용 생성
-        ai_prompt = f"{context}\n\n섹션: {section['name']}\n기존 내용: {original_content}\n\n위 내용을 보완하여 더 상세하고 설득력 있게 작성해주세요."
+        ai_prompt = f"{context}\n\n섹션: {section['name']}\n기존 내용: {original_content}\n"
+        if requirement:
+            ai_prompt += f"추가 요구사항: {requirement}\n"
+        ai_prompt += "\n위 내용을 보완하여 더 상세하고 설득력 있게 작성해주세요."
         
         try:
-            inputs = self.ai_generator.tokenizer(ai_prompt, return_tensors="pt")
+            tokenizer = self.ai_generator.tokenizer
+            inputs = tokenizer(ai_prompt, return_tensors="pt")
+            prompt_length = inputs.input_ids.shape[1]
+            stopping_criteria = build_section_stopping_criteria(tokenizer, prompt_length, target_words)
+            if cancel_token:
+                stopping_criteria.append(CancellationStoppingCriteria(cancel_token))
+            
             outputs = self.ai_generator.model.generate(
                 inputs.input_ids,
-                max_length=min(self.ai_generator.max_length, len(inputs.input_ids[0]) + 500),
+                attention_mask=inputs.attention_mask,
+                max_new_tokens=self.ai_generator._max_new_tokens(prompt_length, 500),
                 num_return_sequences=1,
                 temperature=0.8,
-                top_p=0.9
+                top_p=0.9,
+                stopping_criteria=stopping_criteria,
+                pad_token_id=tokenizer.eos_token_id
             )
             
-            enhanced_text = self.ai_generator.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            raise_if_cancelled(cancel_token)
             
-            # 프롬프트 부분 제거
-            enhanced_content = enhanced_text[len(ai_prompt):].strip()
+            # 프롬프트 토큰 제거
+            enhanced_content = trim_generated_text(
+                tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True),
+                target_words
+            )
             
             # 짧은 결과라면 원본 텍스트를 유지
             if len(enhanced_content.split()) < len(original_content.split()):
-                return section
+                return section, False
             
             # 보강된 내용 적용
             section['content'] = enhanced_content
             section['is_ai_enhanced'] = True
+            return section, True
+        
+        except GenerationCancelled:
+            raise
         
         except Exception as e:
             logger.error(f"AI 보강 중 오류 발생: {str(e)}")
         
-        return section
+        return section, False
     
-    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """하이브리드 방식으로 문서 생성"""
+    def generate_document(self, request: DocumentGenerationRequest, tender_data: Optional[Dict[str, Any]] = None,
+                          base_document: Optional[Dict[str, Any]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          checkpoint: Optional[GenerationCheckpoint] = None) -> Dict[str, Any]:
+        """하이브리드 방식으로 문서 생성 (변경되지 않은 섹션은 기존 문서 또는 섹션 캐시에서 재사용)"""
         if not self.is_initialized:
             self.initialize()
         
         logger.info(f"하이브리드 문서 생성 시작: {request.title}")
         
         # 1. 템플릿으로 기본 구조 생성
-        base_document = self.template_generator.generate_document(request, tender_data)
+        document = self.template_generator.generate_document(request, tender_data, cancel_token=cancel_token)
         
         # 컨텍스트 준비
         context = f"제목: {request.title}\n문서 유형: {request.document_type.value}\n"
         if tender_data:
             context += f"입찰 정보: {tender_data.get('title', '')}\n"
             context += f"발주 기관: {tender_data.get('organization_name', '')}\n"
-            context += f"설명: {tender_data.get('description', '')}\n"
+            description = tender_data.get('description', '')
+            compressor = self.ai_generator.context_compressor
+            if compressor and description:
+                description = compressor.summarize(description, compressor.description_tokens)
+            context += f"설명: {description}\n"
+        
+        # 섹션별 목표 단어 수
+        section_target_words = None
+        if request.target_length and document['sections']:
+            section_target_words = max(1, -(-request.target_length // len(document['sections'])))
+        
+        # 섹션 재사용 준비
+        section_cache = get_section_cache()
+        context_hash = canonical_hash(context)
+        previous_sections = {s['name']: s for s in (base_document or {}).get('sections', [])}
+        
+        if checkpoint:
+            checkpoint.set_total_sections(len(document['sections']))
         
         # 2. AI로 내용 보강
-        for i, section in enumerate(base_document['sections']):
-            logger.info(f"섹션 보강 중: {section['name']}")
-            base_document['sections'][i] = self._enhance_section_with_ai(section, context)
+        for i, section in enumerate(document['sections']):
+            raise_if_cancelled(cancel_token)
+            
+            requirement = (request.section_requirements or {}).get(section['name'])
+            cache_key = canonical_hash({
+                "section": section['name'],
+                "template_content": section['content'],
+                "requirement": requirement,
+                "context": context_hash,
+                "target_words": section_target_words,
+                "model": f"hybrid/{self.ai_generator.model_version}"
+            })
+            
+            content, content_source = _reuse_section_content(
+                section['name'], cache_key, request, previous_sections, section_cache, checkpoint
+            )
+            
+            if content is None:
+                logger.info(f"섹션 보강 중: {section['name']}")
+                section, enhanced = self._enhance_section_with_ai(
+                    section, context, section_target_words, requirement, cancel_token
+                )
+                
+                # 오류나 원본 유지 결과는 캐시하지 않음 (일시적 모델 오류가 이후 요청에 재사용되지 않도록)
+                if section_cache and enhanced:
+                    section_cache.set(cache_key, {"content": section['content']})
+            else:
+                logger.info(f"섹션 재사용: {section['name']} ({content_source})")
+                if content != section['content']:
+                    section['content'] = content
+                    section['is_ai_enhanced'] = True
+            
+            section['cache_key'] = cache_key
+            section['content_source'] = content_source
+            document['sections'][i] = section
+            
+            if checkpoint and content_source != "checkpoint":
+                checkpoint.save_section(section)
         
         # 메타데이터 업데이트
-        base_document['is_hybrid_generated'] = True
-        base_document['metadata']['content_length'] = sum(len(s['content']) for s in base_document['sections'])
-        base_document['metadata']['content_words'] = len(' '.join([s['content'] for s in base_document['sections']]).split())
+        document['is_hybrid_generated'] = True
+        document['metadata']['content_length'] = sum(len(s['content']) for s in document['sections'])
+        document['metadata']['content_words'] = len(' '.join([s['content'] for s in document['sections']]).split())
+        document['metadata']['regenerated_sections'] = [
+            s['name'] for s in document['sections'] if s['content_source'] == "generated"
+        ]
+        document['metadata']['reused_sections'] = [
+            s['name'] for s in document['sections'] if s['content_source'] != "generated"
+        ]
         
         logger.info(f"하이브리드 문서 생성 완료: {request.title}")
         
-        return base_document
+        return document
 
 
-# 팩토리 함수
-def get_document_generator(generator_type: str = "hybrid") -> BaseDocumentGenerator:
-    """문서 생성기 인스턴스 반환"""
+# 프로세스당 생성기 인스턴스 (유형 -> 생성기)
+_generators: Dict[str, Any] = {}
+_generators_lock = threading.Lock()
+
+
+def _build_generator(generator_type: str) -> Any:
+    """생성기 생성 (_generators_lock 보유 상태에서 호출, 하이브리드는 단독 생성기 인스턴스 공유)"""
     if generator_type == "transformer":
         return TransformerDocumentGenerator()
-    elif generator_type == "template":
+    if generator_type == "template":
         return TemplateBasedGenerator()
-    elif generator_type == "hybrid":
-        return HybridDocumentGenerator()
-    else:
+    
+    for dependency in ("template", "transformer"):
+        if dependency not in _generators:
+            _generators[dependency] = _build_generator(dependency)
+    return HybridDocumentGenerator(_generators["template"], _generators["transformer"])
+
+
+# 팩토리 함수
+def get_document_generator(generator_type: str = "hybrid") -> BaseDocumentGenerator:
+    """
+    문서 생성기 인스턴스 반환
+    
+    - 유형별로 프로세스당 하나의 인스턴스를 재사용 (모델 로드, 양자화, ONNX 변환, 품질 검증은 최초 초기화 시 한 번)
+    """
+    if generator_type not in ("transformer", "template", "hybrid"):
         logger.warning(f"알 수 없는 생성기 유형: {generator_type}, 기본값(하이브리드)을 사용합니다.")
-        return HybridDocumentGenerator()
+        generator_type = "hybrid"
+    
+    generator = _generators.get(generator_type)
+    if generator is None:
+        with _generators_lock:
+            generator = _generators.get(generator_type)
+            if generator is None:
+                generator = _generators[generator_type] = _build_generator(generator_type)
+    return generator
+
+
+def preload_document_generators(generator_types: List[str]) -> None:
+    """
+    시작 시 생성기 초기화 (첫 요청이 모델 로드/품질 검증 시간을 부담하지 않도록)
+    
+    - 실패해도 서버 시작은 계속하며, 해당 생성기는 첫 요청에서 다시 초기화 시도
+    """
+    for generator_type in generator_types:
+        try:
+            get_document_generator(generator_type).initialize()
+        except Exception as e:
+            logger.error(f"문서 생성기 사전 초기화 중 오류 발생 ({generator_type}): {str(e)}")
@@ -0,0 +1,155 @@
+"""
+문서 생성 캐시 모듈 - 결정적인 생성 결과를 메모리(LRU) 및 디스크에 캐싱합니다.
+"""
+
+import os
+import json
+import copy
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_hash(value: Any) -> str:
+    """키 순서와 무관한 JSON 직렬화 기반 SHA-256 해시"""
+    serialized = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """크기 제한 LRU 캐시 (선택적 디스크 계층 포함)"""
+
+    def __init__(self, name: str, max_entries: int = 1024, disk_dir: Optional[str] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"[{self.name}] 디스크 캐시 읽기 중 오류 발생: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 기록 후 교체 (다른 프로세스가 읽는 중에도 안전)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"[{self.name}] 디스크 캐시 쓰기 중 오류 발생: {str(e)}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (반환값은 복사본)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+
+        if self.disk_dir:
+            value = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store(key, value)
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (호출자의 객체와 분리된 복사본 저장)"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value)
+
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def clear(self) -> None:
+        """메모리 캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+_render_cache: Optional[LRUCache] = None
+
+
+def get_render_cache() -> Optional[LRUCache]:
+    """템플릿 렌더링 결과 캐시 반환 (비활성화 시 None)"""
+    global _render_cache
+
+    config = DOCUMENT_GENERATION_CONFIG['render_cache']
+    if not config['enabled']:
+        return None
+
+    if _render_cache is None:
+        _render_cache = LRUCache("render", config['max_entries'], config['disk_dir'])
+
+    return _render_cache
+
+
+_section_cache: Optional[LRUCache] = None
+
+
+def get_section_cache() -> Optional[LRUCache]:
+    """섹션 단위 생성 결과 캐시 반환 (비활성화 시 None)"""
+    global _section_cache
+
+    config = DOCUMENT_GENERATION_CONFIG['section_cache']
+    if not config['enabled']:
+        return None
+
+    if _section_cache is None:
+        _section_cache = LRUCache("section", config['max_entries'], config['disk_dir'])
+
+    return _section_cache
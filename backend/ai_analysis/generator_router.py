@@ -0,0 +1,161 @@
+"""
+생성기 라우팅 모듈 - 요청의 지연 시간 목표와 생성기별 실시간 지연 통계로 생성기를 선택합니다.
+
+생성기가 포화 상태(동시 실행 한도 도달)이거나 목표를 만족할 수 없으면 템플릿 렌더링으로 대체합니다.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+GENERATOR_TYPES = ("template", "hybrid", "transformer")
+FALLBACK_GENERATOR = "template"
+
+
+class GeneratorLatencyStats:
+    """생성기 하나의 최근 지연 시간 및 동시 실행 수"""
+
+    def __init__(self, name: str, max_concurrency: int, default_latency_ms: float, window: int = 50,
+                 min_samples: int = 5, percentile: float = 90.0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.default_latency_ms = default_latency_ms
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.samples: "deque[float]" = deque(maxlen=window)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, latency_ms: float, success: bool = True) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if success:
+                self.completed += 1
+                self.samples.append(latency_ms)
+            else:
+                self.failed += 1
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.max_concurrency
+
+    def estimate_ms(self) -> float:
+        """
+        예상 지연 시간 (ms)
+
+        - 표본이 충분하면 최근 지연 시간의 백분위수, 부족하면 기본값과 표본 중 큰 값
+        - 같은 생성기의 동시 실행 수만큼 CPU 를 나눠 쓰므로 실행 중인 요청 수에 비례해 가중
+        """
+        with self._lock:
+            samples = sorted(self.samples)
+            in_flight = self.in_flight
+
+        if len(samples) >= self.min_samples:
+            index = min(len(samples) - 1, int(round(self.percentile / 100.0 * (len(samples) - 1))))
+            base = samples[index]
+        else:
+            base = max([self.default_latency_ms] + samples)
+
+        return base * (1 + in_flight / max(self.max_concurrency, 1))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self.samples)
+            result = {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "completed": self.completed,
+                "failed": self.failed,
+                "samples": len(samples),
+                "mean_latency_ms": round(sum(samples) / len(samples), 1) if samples else None
+            }
+        result["estimated_latency_ms"] = round(self.estimate_ms(), 1)
+        return result
+
+
+class GeneratorRouter:
+    """지연 시간 목표 기반 생성기 선택기"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or DOCUMENT_GENERATION_CONFIG['routing']
+        self.preference = [g for g in config['preference'] if g in GENERATOR_TYPES]
+        if FALLBACK_GENERATOR not in self.preference:
+            self.preference.append(FALLBACK_GENERATOR)
+
+        self.stats = {
+            name: GeneratorLatencyStats(
+                name,
+                config['max_concurrency'].get(name, 1),
+                config['default_latency_ms'].get(name, 1000.0),
+                config['window'],
+                config['min_samples'],
+                config['percentile']
+            )
+            for name in GENERATOR_TYPES
+        }
+
+    def route(self, latency_slo_ms: Optional[float] = None,
+              requested_type: Optional[str] = None) -> Tuple[str, str]:
+        """
+        생성기 선택 -> (생성기 유형, 선택 사유)
+
+        - 유형을 직접 지정한 경우 포화 상태가 아니면 그대로 사용
+        - 목표가 있으면 선호 순서대로 예상 지연 시간이 목표 이내인 첫 생성기 선택
+        - 목표가 없으면 포화되지 않은 첫 생성기 선택
+        - 선택할 수 있는 생성기가 없으면 템플릿 렌더링
+        """
+        if requested_type in self.stats:
+            if not self.stats[requested_type].saturated or requested_type == FALLBACK_GENERATOR:
+                return requested_type, "requested"
+            logger.warning(f"요청한 생성기({requested_type})가 포화 상태여서 템플릿 렌더링으로 대체합니다.")
+            return FALLBACK_GENERATOR, "saturated"
+
+        for name in self.preference:
+            stats = self.stats[name]
+            if stats.saturated:
+                continue
+            if latency_slo_ms is None:
+                return name, "preferred"
+            if stats.estimate_ms() <= latency_slo_ms:
+                return name, "within_slo"
+
+        reason = "saturated" if latency_slo_ms is None else "slo_fallback"
+        logger.info(f"생성기 라우팅 대체: {FALLBACK_GENERATOR} (사유: {reason}, 목표: {latency_slo_ms}ms)")
+        return FALLBACK_GENERATOR, reason
+
+    @contextmanager
+    def track(self, generator_type: str) -> Iterator[None]:
+        """생성기 실행 구간의 동시 실행 수 및 지연 시간 기록"""
+        stats = self.stats[generator_type]
+        stats.start()
+        start_time = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            stats.finish((time.perf_counter() - start_time) * 1000, success)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
+
+
+generator_router = GeneratorRouter()
+
+
+def get_generator_router() -> GeneratorRouter:
+    """전역 생성기 라우터 반환"""
+    return generator_router
@@ -0,0 +1,174 @@
+"""
+모델 백엔드 모듈 - CPU 추론용 GPT-2 모델 로드(FP32, int8 동적 양자화, ONNX Runtime) 및 품질 검증
+"""
+
+import os
+import math
+import shutil
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import torch
+from transformers import GPT2LMHeadModel, PreTrainedTokenizer
+from transformers.pytorch_utils import Conv1D
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("pytorch", "int8", "onnx")
+
+# 품질 검증용 고정 프롬프트
+QUALITY_PROBE_PROMPTS = [
+    "제목: 공공기관 정보시스템 고도화 사업\n문서 유형: proposal\n\n개요 섹션 내용 (문서의 주요 내용과 목적 개요):\n",
+    "입찰 정보: 클라우드 기반 데이터 분석 플랫폼 구축\n발주 기관: 행정안전부\n\n기술적 접근 섹션 내용 (기술적 접근 방법 및 방법론):\n",
+    "Title: Cybersecurity modernization for a federal agency\n\nProposal summary:\n",
+]
+
+
+def _replace_conv1d_with_linear(module: torch.nn.Module) -> int:
+    """GPT-2 의 Conv1D 레이어를 동일한 nn.Linear 로 교체 (동적 양자화 대상이 되도록)"""
+    replaced = 0
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data.clone()
+            setattr(module, name, linear)
+            replaced += 1
+        else:
+            replaced += _replace_conv1d_with_linear(child)
+
+    return replaced
+
+
+def load_pytorch_model(model_name: str) -> GPT2LMHeadModel:
+    """FP32 PyTorch 모델 로드"""
+    model = GPT2LMHeadModel.from_pretrained(model_name)
+    model.eval()
+    return model
+
+
+def load_int8_model(model_name: str) -> torch.nn.Module:
+    """선형 레이어를 int8 로 동적 양자화한 모델 로드"""
+    model = load_pytorch_model(model_name)
+
+    replaced = _replace_conv1d_with_linear(model.transformer)
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+
+    logger.info(f"int8 동적 양자화 완료: {model_name} (Conv1D 변환 {replaced}개)")
+    return quantized
+
+
+def _onnx_export_path(model_name: str, export_dir: str) -> str:
+    return os.path.join(export_dir, model_name.replace("/", "__"))
+
+
+def load_onnx_model(model_name: str, export_dir: Optional[str] = None) -> Any:
+    """
+    ONNX Runtime 모델 로드 (optimum 필요)
+
+    - export_dir 에 변환 결과가 있으면 그대로 로드하고, 없으면 변환 후 저장 (이후 프로세스는 재사용)
+    - 변환 결과는 임시 디렉터리에 저장 후 이름 변경으로 반영하므로 동시에 시작한 프로세스가 불완전한 결과를 읽지 않음
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForCausalLM
+    except ImportError as e:
+        raise ImportError("ONNX 백엔드를 사용하려면 optimum[onnxruntime] 패키지가 필요합니다") from e
+
+    if not export_dir:
+        return ORTModelForCausalLM.from_pretrained(model_name, export=True)
+
+    export_path = _onnx_export_path(model_name, export_dir)
+    if os.path.isdir(export_path):
+        model = ORTModelForCausalLM.from_pretrained(export_path)
+        logger.info(f"ONNX Runtime 모델 로드 완료: {export_path}")
+        return model
+
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+
+    os.makedirs(export_dir, exist_ok=True)
+    staging_path = tempfile.mkdtemp(prefix=".export-", dir=export_dir)
+    try:
+        model.save_pretrained(staging_path)
+        os.rename(staging_path, export_path)
+        logger.info(f"ONNX 변환 결과 저장: {export_path}")
+    except OSError:
+        # 다른 프로세스가 먼저 저장한 경우 (변환한 모델은 그대로 사용)
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+    return model
+
+
+def load_causal_lm(model_name: str, backend: str = "pytorch", export_dir: Optional[str] = None) -> Any:
+    """설정된 백엔드로 언어 모델 로드 (ONNX 는 export_dir 에 변환 결과 저장/재사용)"""
+    if backend == "int8":
+        return load_int8_model(model_name)
+    if backend == "onnx":
+        return load_onnx_model(model_name, export_dir)
+    if backend != "pytorch":
+        logger.warning(f"알 수 없는 추론 백엔드: {backend}, 기본값(pytorch)을 사용합니다.")
+    return load_pytorch_model(model_name)
+
+
+def _sequence_nll(model: Any, input_ids: torch.LongTensor, prompt_length: int) -> float:
+    """프롬프트 이후 토큰의 평균 음의 로그우도"""
+    with torch.no_grad():
+        logits = model(input_ids=input_ids, attention_mask=torch.ones_like(input_ids)).logits
+
+    log_probs = torch.log_softmax(logits[0, prompt_length - 1:-1].float(), dim=-1)
+    targets = input_ids[0, prompt_length:]
+    return float(-log_probs.gather(1, targets.unsqueeze(1)).mean())
+
+
+def check_generation_quality(reference_model: Any, candidate_model: Any, tokenizer: PreTrainedTokenizer,
+                             prompts: Optional[List[str]] = None, max_new_tokens: int = 32) -> Dict[str, Any]:
+    """
+    후보 백엔드의 출력 품질을 FP32 기준 모델과 비교
+
+    - token_agreement: 그리디 디코딩 결과가 기준 모델과 일치하는 토큰 비율
+    - perplexity_ratio: 기준 모델의 생성 결과에 대한 후보/기준 퍼플렉서티 비율
+    """
+    prompts = prompts or QUALITY_PROBE_PROMPTS
+    agreements = []
+    ratios = []
+
+    for prompt in prompts:
+        inputs = tokenizer(prompt, return_tensors="pt")
+        prompt_length = inputs.input_ids.shape[1]
+        generate_kwargs = {
+            "attention_mask": inputs.attention_mask,
+            "max_new_tokens": max_new_tokens,
+            "do_sample": False,
+            "pad_token_id": tokenizer.eos_token_id
+        }
+
+        reference_ids = reference_model.generate(inputs.input_ids, **generate_kwargs)
+        candidate_ids = candidate_model.generate(inputs.input_ids, **generate_kwargs)
+
+        reference_tokens = reference_ids[0, prompt_length:].tolist()
+        candidate_tokens = candidate_ids[0, prompt_length:].tolist()
+        compared = max(len(reference_tokens), 1)
+        matched = sum(1 for a, b in zip(reference_tokens, candidate_tokens) if a == b)
+        agreements.append(matched / compared)
+
+        if len(reference_tokens) > 0:
+            reference_nll = _sequence_nll(reference_model, reference_ids, prompt_length)
+            candidate_nll = _sequence_nll(candidate_model, reference_ids, prompt_length)
+            ratios.append(math.exp(candidate_nll - reference_nll))
+
+    return {
+        "prompts": len(prompts),
+        "token_agreement": round(sum(agreements) / len(agreements), 4) if agreements else 0.0,
+        "perplexity_ratio": round(sum(ratios) / len(ratios), 4) if ratios else 1.0
+    }
+
+
+def passes_quality_check(report: Dict[str, Any], min_token_agreement: float, max_perplexity_ratio: float) -> bool:
+    """품질 검증 결과가 허용 범위 안에 있는지 확인"""
+    return (
+        report['token_agreement'] >= min_token_agreement
+        and report['perplexity_ratio'] <= max_perplexity_ratio
+    )
@@ -0,0 +1,255 @@
+"""
+유사 문서 탐지 모듈 - MinHash 서명과 LSH 밴드 인덱스로 생성/업로드 문서의 근접 중복을 탐지합니다.
+
+전체 문서와의 쌍별 비교 대신 LSH 밴드 값이 하나 이상 일치하는 후보만 조회하므로
+저장된 문서 수가 많아도 조회 비용이 후보 수에 비례합니다.
+"""
+
+import re
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from pymongo import ASCENDING, UpdateOne
+from pymongo.database import Database
+
+from config.settings import NEAR_DUPLICATE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_COLLECTION = "document_signatures"
+
+# 메르센 소수 2^61 - 1 (범용 해시 계열 h(x) = (a * x + b) mod p)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# 한 번에 처리하는 shingle 수 (메모리 사용량 제한)
+_SHINGLE_CHUNK = 4096
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """공백과 대소문자 차이를 제거한 비교용 텍스트"""
+    return _WHITESPACE_PATTERN.sub(" ", text or "").strip().lower()
+
+
+class MinHasher:
+    """문자 n-gram(shingle) 집합의 MinHash 서명 계산기"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        """정규화된 텍스트의 shingle 을 32비트 해시 배열로 변환"""
+        text = normalize_text(text)
+        size = self.shingle_size
+
+        if len(text) <= size:
+            shingles = {text} if text else set()
+        else:
+            shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+
+        return np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """텍스트의 MinHash 서명 (길이 num_perm)"""
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = self._shingle_hashes(text)
+
+        for start in range(0, len(hashes), _SHINGLE_CHUNK):
+            chunk = hashes[start:start + _SHINGLE_CHUNK]
+            permuted = np.bitwise_and(
+                (np.outer(chunk, self._a) + self._b) % _MERSENNE_PRIME,
+                _MAX_HASH
+            )
+            signature = np.minimum(signature, permuted.min(axis=0))
+
+        return signature
+
+
+def estimate_jaccard(signature_a: Iterable[int], signature_b: Iterable[int]) -> float:
+    """두 MinHash 서명의 일치 비율로 자카드 유사도 추정"""
+    a = np.asarray(signature_a, dtype=np.uint64)
+    b = np.asarray(signature_b, dtype=np.uint64)
+    if a.shape != b.shape or a.size == 0:
+        return 0.0
+    return float(np.count_nonzero(a == b)) / a.size
+
+
+def lsh_bands(signature: np.ndarray, bands: int) -> List[str]:
+    """서명을 밴드로 나누어 밴드별 해시 키 생성 ("밴드번호:해시")"""
+    rows = len(signature) // bands
+    keys = []
+
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signature[band * rows:(band + 1) * rows])
+        digest = hashlib.blake2b(chunk.tobytes(), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    MongoDB 기반 LSH 인덱스
+
+    - document_signatures 컬렉션에 문서별 MinHash 서명과 LSH 밴드 키 저장
+    - lsh_bands 멀티키 인덱스로 밴드 값이 일치하는 후보만 조회한 뒤 서명으로 유사도 추정
+    - request_lsh_bands 는 생성 요청 내용의 서명으로, 생성 전 중복 요청 확인에 사용
+    """
+
+    def __init__(self, mongo_db: Database, num_perm: Optional[int] = None, bands: Optional[int] = None,
+                 shingle_size: Optional[int] = None):
+        self.collection = mongo_db[SIGNATURE_COLLECTION]
+        self.num_perm = num_perm or NEAR_DUPLICATE_CONFIG['num_perm']
+        self.bands = bands or NEAR_DUPLICATE_CONFIG['bands']
+        self.hasher = MinHasher(self.num_perm, shingle_size or NEAR_DUPLICATE_CONFIG['shingle_size'])
+
+        if self.num_perm % self.bands != 0:
+            raise ValueError(f"MinHash 순열 수({self.num_perm})는 밴드 수({self.bands})로 나누어떨어져야 합니다")
+
+    @staticmethod
+    def create_indexes(mongo_db: Database) -> None:
+        """서명 컬렉션 인덱스 생성"""
+        collection = mongo_db[SIGNATURE_COLLECTION]
+        collection.create_index([("document_id", ASCENDING)], unique=True)
+        collection.create_index("lsh_bands")
+        collection.create_index("request_lsh_bands")
+
+    def _signature_fields(self, text: str, prefix: str = "") -> Dict[str, Any]:
+        signature = self.hasher.signature(text)
+        return {
+            f"{prefix}minhash": [int(v) for v in signature],
+            f"{prefix}lsh_bands": lsh_bands(signature, self.bands)
+        }
+
+    def _upsert(self, document_id: int, text: str, mongo_id: Optional[str] = None, source: str = "generated",
+                request_text: Optional[str] = None, creator_id: Optional[int] = None) -> UpdateOne:
+        record = {
+            "document_id": document_id,
+            "mongo_id": mongo_id,
+            "source": source,
+            "creator_id": creator_id,
+            "num_perm": self.num_perm,
+            "updated_at": datetime.utcnow()
+        }
+        record.update(self._signature_fields(text))
+        if request_text:
+            record.update(self._signature_fields(request_text, prefix="request_"))
+
+        return UpdateOne(
+            {"document_id": document_id},
+            {"$set": record, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def add(self, document_id: int, text: str, mongo_id: Optional[str] = None, source: str = "generated",
+            request_text: Optional[str] = None, creator_id: Optional[int] = None) -> None:
+        """문서 서명 저장 (같은 문서 ID 는 덮어씀)"""
+        self.collection.bulk_write([self._upsert(document_id, text, mongo_id, source, request_text, creator_id)])
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> None:
+        """여러 문서 서명을 한 번의 bulk_write 로 저장 (항목은 add 의 키워드 인자)"""
+        if entries:
+            self.collection.bulk_write([self._upsert(**entry) for entry in entries], ordered=False)
+
+    def remove(self, document_id: int) -> None:
+        """문서 서명 삭제"""
+        self.collection.delete_one({"document_id": document_id})
+
+    def get_signature(self, document_id: int) -> Optional[Dict[str, Any]]:
+        """저장된 문서 서명 조회"""
+        return self.collection.find_one({"document_id": document_id}, {"minhash": 1, "lsh_bands": 1})
+
+    def _query(self, minhash: List[int], bands: List[str], field: str, threshold: float, limit: int,
+               exclude_document_id: Optional[int]) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {f"{field}lsh_bands": {"$in": bands}, "num_perm": self.num_perm}
+        if exclude_document_id is not None:
+            query["document_id"] = {"$ne": exclude_document_id}
+
+        candidates = self.collection.find(
+            query,
+            {"document_id": 1, "mongo_id": 1, "source": 1, "creator_id": 1, f"{field}minhash": 1}
+        ).limit(NEAR_DUPLICATE_CONFIG['max_candidates'])
+
+        matches = []
+        for candidate in candidates:
+            similarity = estimate_jaccard(minhash, candidate.get(f"{field}minhash", []))
+            if similarity >= threshold:
+                matches.append({
+                    "document_id": candidate["document_id"],
+                    "mongo_id": candidate.get("mongo_id"),
+                    "source": candidate.get("source"),
+                    "creator_id": candidate.get("creator_id"),
+                    "similarity": round(similarity, 4)
+                })
+
+        matches.sort(key=lambda m: m["similarity"], reverse=True)
+        return matches[:limit]
+
+    def find_similar(self, text: str, threshold: Optional[float] = None, limit: int = 10,
+                     exclude_document_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """텍스트와 유사한 저장 문서 조회"""
+        fields = self._signature_fields(text)
+        return self._query(
+            fields["minhash"], fields["lsh_bands"], "",
+            threshold if threshold is not None else NEAR_DUPLICATE_CONFIG['threshold'],
+            limit, exclude_document_id
+        )
+
+    def find_similar_to_document(self, document_id: int, threshold: Optional[float] = None,
+                                 limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """저장된 문서와 유사한 다른 문서 조회 (서명이 없으면 None)"""
+        record = self.get_signature(document_id)
+        if not record:
+            return None
+
+        return self._query(
+            record["minhash"], record["lsh_bands"], "",
+            threshold if threshold is not None else NEAR_DUPLICATE_CONFIG['threshold'],
+            limit, document_id
+        )
+
+    def find_similar_requests(self, request_text: str, threshold: Optional[float] = None,
+                              limit: int = 5) -> List[Dict[str, Any]]:
+        """생성 요청 내용이 유사한 기존 생성 문서 조회"""
+        fields = self._signature_fields(request_text, prefix="request_")
+        return self._query(
+            fields["request_minhash"], fields["request_lsh_bands"], "request_",
+            threshold if threshold is not None else NEAR_DUPLICATE_CONFIG['reuse_threshold'],
+            limit, None
+        )
+
+
+def build_request_text(request: Any, tender_data: Optional[Dict[str, Any]] = None) -> str:
+    """생성 요청의 입력 내용을 서명 계산용 텍스트로 직렬화"""
+    parts = [
+        f"유형: {request.document_type.value}",
+        f"제목: {request.title}"
+    ]
+
+    if tender_data:
+        parts.append(f"입찰: {tender_data.get('title', '')}")
+        parts.append(f"발주 기관: {tender_data.get('organization_name', '')}")
+        parts.append(str(tender_data.get('description', '')))
+
+    for key, value in sorted((request.content_requirements or {}).items()):
+        if key != "generator_type":
+            parts.append(f"{key}: {value}")
+
+    for key, value in sorted((request.section_requirements or {}).items()):
+        parts.append(f"{key}: {value}")
+
+    return "\n".join(parts)
@@ -0,0 +1,401 @@
+"""
+검색 인덱스 모듈 - 과거 제안서 섹션과 입찰 기록을 임베딩하여 문서 생성 컨텍스트로 제공합니다.
+
+- 임베딩 행렬은 디스크(.npy)에 저장하고 메모리 맵으로 로드
+- 기본은 정확한 top-k 검색(내적), 대규모 코퍼스는 faiss IVF/HNSW 선택 가능
+- 재구축은 새 버전 디렉터리에 기록한 뒤 CURRENT 포인터를 원자적으로 교체하므로,
+  기존 파일을 메모리 맵으로 열고 있는 프로세스는 영향을 받지 않고 다음 확인 시 새 버전을 로드
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_FILE = "embeddings.npy"
+SNIPPETS_FILE = "snippets.json"
+META_FILE = "index_meta.json"
+ANN_FILE = "ann.faiss"
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+class SentenceEmbedder:
+    """CPU 문장 임베딩 (sentence-transformers, 지연 로드)"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+                logger.info(f"임베딩 모델 로드: {self.model_name}")
+        return self._model
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """정규화된 float32 임베딩 행렬"""
+        model = self._load()
+        embeddings = model.encode(
+            texts, batch_size=batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
+
+
+def collect_past_bid_snippets(past_bids_path: str, max_chars: int = 500) -> List[Dict[str, Any]]:
+    """과거 입찰 기록(lessonsLearned, bidStrategy)에서 검색 스니펫 추출"""
+    if not os.path.exists(past_bids_path):
+        logger.warning(f"과거 입찰 데이터를 찾을 수 없습니다: {past_bids_path}")
+        return []
+
+    with open(past_bids_path, 'r', encoding='utf-8') as f:
+        past_bids = json.load(f).get('pastBids', [])
+
+    snippets = []
+    for bid in past_bids:
+        header = f"{bid.get('opportunityTitle', '')} ({bid.get('agency', '')}, {bid.get('outcome', '')})"
+
+        for idx, lesson in enumerate(bid.get('lessonsLearned', [])):
+            snippets.append({
+                "id": f"bid:{bid.get('id')}:lesson:{idx}",
+                "source": "past_bid_lesson",
+                "text": _truncate(f"{header} - 교훈: {lesson}", max_chars),
+                "metadata": {"bid_id": bid.get('id'), "outcome": bid.get('outcome')}
+            })
+
+        strategy = bid.get('bidStrategy')
+        if strategy:
+            parts = [
+                f"가격 전략: {strategy.get('pricingStrategy', '')}",
+                f"기술 강조점: {strategy.get('technicalEmphasis', '')}",
+                f"실적: {', '.join(strategy.get('pastPerformanceHighlights', []))}",
+                f"차별화 요소: {', '.join(strategy.get('differentiators', []))}"
+            ]
+            snippets.append({
+                "id": f"bid:{bid.get('id')}:strategy",
+                "source": "past_bid_strategy",
+                "text": _truncate(f"{header} - 입찰 전략: " + "; ".join(parts), max_chars),
+                "metadata": {"bid_id": bid.get('id'), "outcome": bid.get('outcome')}
+            })
+
+    return snippets
+
+
+def collect_document_snippets(mongo_db: Any, max_chars: int = 500, min_chars: int = 40) -> List[Dict[str, Any]]:
+    """MongoDB 문서의 섹션별 내용에서 검색 스니펫 추출"""
+    snippets = []
+    cursor = mongo_db.documents.find({}, {"title": 1, "document_type": 1, "sections.name": 1, "sections.content": 1})
+
+    for document in cursor:
+        for idx, section in enumerate(document.get('sections', [])):
+            content = (section.get('content') or "").strip()
+            if len(content) < min_chars:
+                continue
+
+            snippets.append({
+                "id": f"doc:{document['_id']}:{idx}",
+                "source": "document_section",
+                "text": _truncate(f"{document.get('title', '')} / {section.get('name', '')}: {content}", max_chars),
+                "metadata": {
+                    "mongo_id": str(document['_id']),
+                    "section": section.get('name'),
+                    "document_type": document.get('document_type')
+                }
+            })
+
+    return snippets
+
+
+class RetrievalIndex:
+    """디스크 기반 임베딩 검색 인덱스"""
+
+    def __init__(self, index_dir: str, embedder: SentenceEmbedder):
+        self.index_dir = index_dir
+        self.embedder = embedder
+        self.embeddings: Optional[np.ndarray] = None
+        self.snippets: List[Dict[str, Any]] = []
+        self.meta: Dict[str, Any] = {}
+        self.ann_index = None
+        self.version: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.snippets)
+
+    def _resolve_mode(self, mode: str, count: int) -> str:
+        config = DOCUMENT_GENERATION_CONFIG['retrieval']
+        if mode == "auto":
+            mode = "ivf" if count >= config['ann_threshold'] else "exact"
+
+        if mode in ("ivf", "hnsw"):
+            try:
+                import faiss  # noqa: F401
+            except ImportError:
+                logger.warning(f"faiss 가 설치되어 있지 않아 '{mode}' 대신 정확 검색을 사용합니다.")
+                return "exact"
+        return mode
+
+    def _build_ann(self, embeddings: np.ndarray, mode: str) -> Any:
+        import faiss
+
+        config = DOCUMENT_GENERATION_CONFIG['retrieval']
+        dim = embeddings.shape[1]
+
+        if mode == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, config['hnsw_m'], faiss.METRIC_INNER_PRODUCT)
+        else:
+            nlist = max(1, min(config['ivf_nlist'], len(embeddings) // 39))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            index.nprobe = config['ivf_nprobe']
+
+        index.add(embeddings)
+        return index
+
+    @property
+    def versions_dir(self) -> str:
+        return os.path.join(self.index_dir, VERSIONS_DIR)
+
+    def current_version(self) -> Optional[str]:
+        """CURRENT 포인터가 가리키는 버전 (없으면 None)"""
+        try:
+            with open(os.path.join(self.index_dir, CURRENT_FILE), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _version_path(self, version: Optional[str]) -> str:
+        # 포인터가 없으면 버전 디렉터리 도입 이전의 인덱스 (index_dir 에 직접 저장)
+        return os.path.join(self.versions_dir, version) if version else self.index_dir
+
+    def _publish(self, version: str) -> None:
+        """CURRENT 포인터를 새 버전으로 원자적 교체"""
+        pointer_path = os.path.join(self.index_dir, CURRENT_FILE)
+        staging_path = f"{pointer_path}.{uuid.uuid4().hex}"
+        with open(staging_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(staging_path, pointer_path)
+
+    def _prune_versions(self, keep: int) -> None:
+        """오래된 버전 삭제 (최근 keep 개와 현재 버전 유지)"""
+        current = self.current_version()
+        versions = sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.versions_dir, name))
+        )
+        for name in versions[:-keep] if keep > 0 else versions:
+            if name != current:
+                # 메모리 맵으로 열려 있는 파일도 삭제(unlink)는 안전 (잘라내기와 달리 기존 매핑 유지)
+                shutil.rmtree(os.path.join(self.versions_dir, name), ignore_errors=True)
+
+    def build(self, snippets: List[Dict[str, Any]], mode: str = "auto") -> Dict[str, Any]:
+        """
+        스니펫 임베딩 후 새 버전 디렉터리에 인덱스 파일 저장
+
+        - 기존 버전 파일은 수정하지 않으며, 모든 파일을 기록한 뒤 CURRENT 포인터 교체로 반영
+        """
+        start_time = time.time()
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+        mode = self._resolve_mode(mode, len(snippets))
+        embeddings = (
+            self.embedder.encode([s['text'] for s in snippets])
+            if snippets else np.zeros((0, 0), dtype=np.float32)
+        )
+
+        version = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        staging_dir = os.path.join(self.versions_dir, f".{version}")
+        os.makedirs(staging_dir)
+
+        try:
+            np.save(os.path.join(staging_dir, EMBEDDINGS_FILE), embeddings)
+            with open(os.path.join(staging_dir, SNIPPETS_FILE), 'w', encoding='utf-8') as f:
+                json.dump(snippets, f, ensure_ascii=False)
+
+            if mode != "exact" and len(snippets) > 0:
+                import faiss
+                faiss.write_index(self._build_ann(embeddings, mode), os.path.join(staging_dir, ANN_FILE))
+
+            self.meta = {
+                "embedding_model": self.embedder.model_name,
+                "dimension": int(embeddings.shape[1]) if embeddings.size else 0,
+                "count": len(snippets),
+                "mode": mode,
+                "sources": {
+                    source: sum(1 for s in snippets if s['source'] == source)
+                    for source in sorted({s['source'] for s in snippets})
+                },
+                "version": version,
+                "built_at": datetime.utcnow().isoformat(),
+                "build_seconds": round(time.time() - start_time, 2)
+            }
+            with open(os.path.join(staging_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+            os.rename(staging_dir, self._version_path(version))
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self._publish(version)
+        logger.info(f"검색 인덱스 구축 완료: {self.meta['count']}개 스니펫 ({mode}, 버전 {version})")
+
+        self.load()
+        self._prune_versions(DOCUMENT_GENERATION_CONFIG['retrieval']['keep_versions'])
+        return self.meta
+
+    def load(self) -> bool:
+        """현재 버전의 인덱스 파일 로드 (임베딩 행렬은 메모리 맵)"""
+        version = self.current_version()
+        version_path = self._version_path(version)
+        meta_path = os.path.join(version_path, META_FILE)
+        if not os.path.exists(meta_path):
+            return False
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if meta.get('embedding_model') != self.embedder.model_name:
+            logger.warning(
+                f"검색 인덱스의 임베딩 모델({meta.get('embedding_model')})이 "
+                f"설정({self.embedder.model_name})과 다릅니다. 인덱스를 다시 구축해야 합니다."
+            )
+            return False
+
+        with open(os.path.join(version_path, SNIPPETS_FILE), 'r', encoding='utf-8') as f:
+            snippets = json.load(f)
+        embeddings = np.load(os.path.join(version_path, EMBEDDINGS_FILE), mmap_mode='r')
+
+        ann_index = None
+        ann_path = os.path.join(version_path, ANN_FILE)
+        if meta.get('mode') in ("ivf", "hnsw") and os.path.exists(ann_path):
+            import faiss
+            ann_index = faiss.read_index(ann_path)
+            if hasattr(ann_index, 'nprobe'):
+                ann_index.nprobe = DOCUMENT_GENERATION_CONFIG['retrieval']['ivf_nprobe']
+
+        self.meta, self.snippets, self.embeddings, self.ann_index = meta, snippets, embeddings, ann_index
+        self.version = version
+
+        logger.info(f"검색 인덱스 로드: {self.size}개 스니펫 ({self.meta.get('mode')}, 버전 {version or '-'})")
+        return True
+
+    def search(self, query: str, top_k: int = 3, sources: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """질의와 가장 유사한 스니펫 top-k"""
+        if not self.size or not query.strip():
+            return []
+
+        query_vector = self.embedder.encode([query])[0]
+        allowed = set(sources) if sources else None
+        # 출처 필터가 있으면 후보를 넉넉히 가져온 뒤 거름
+        candidates = min(self.size, top_k * 4 if allowed else top_k)
+
+        if self.ann_index is not None:
+            scores, indices = self.ann_index.search(query_vector.reshape(1, -1), candidates)
+            ranked = [(int(i), float(s)) for i, s in zip(indices[0], scores[0]) if i >= 0]
+        else:
+            scores = np.asarray(self.embeddings @ query_vector)
+            if candidates < self.size:
+                top = np.argpartition(-scores, candidates - 1)[:candidates]
+            else:
+                top = np.arange(self.size)
+            top = top[np.argsort(-scores[top])]
+            ranked = [(int(i), float(scores[i])) for i in top]
+
+        results = []
+        for idx, score in ranked:
+            snippet = self.snippets[idx]
+            if allowed and snippet['source'] not in allowed:
+                continue
+            results.append({**snippet, "score": round(score, 4)})
+            if len(results) >= top_k:
+                break
+
+        return results
+
+
+_retrieval_index: Optional[RetrievalIndex] = None
+_embedder: Optional[SentenceEmbedder] = None
+_retrieval_lock = threading.Lock()
+_last_version_check = 0.0
+
+
+def _new_index() -> RetrievalIndex:
+    """설정 기반 인덱스 생성 (임베딩 모델은 프로세스 내에서 공유)"""
+    global _embedder
+
+    config = DOCUMENT_GENERATION_CONFIG['retrieval']
+    if _embedder is None or _embedder.model_name != config['embedding_model']:
+        _embedder = SentenceEmbedder(config['embedding_model'])
+    return RetrievalIndex(config['index_dir'], _embedder)
+
+
+def get_retrieval_index() -> Optional[RetrievalIndex]:
+    """
+    전역 검색 인덱스 반환 (비활성화되었거나 구축되지 않았으면 None)
+
+    - reload_interval 마다 CURRENT 포인터를 확인하여 다른 프로세스가 재구축한 버전으로 교체
+    """
+    global _retrieval_index, _last_version_check
+
+    config = DOCUMENT_GENERATION_CONFIG['retrieval']
+    if not config['enabled']:
+        return None
+
+    with _retrieval_lock:
+        now = time.monotonic()
+        if _retrieval_index is not None and now - _last_version_check < config['reload_interval']:
+            return _retrieval_index
+        _last_version_check = now
+
+        index = _new_index()
+        if _retrieval_index is not None and _retrieval_index.version == index.current_version():
+            return _retrieval_index
+
+        try:
+            if index.load():
+                # 기존 인덱스 객체는 수정하지 않고 교체 (검색 중인 요청은 이전 버전으로 완료)
+                _retrieval_index = index
+        except Exception as e:
+            logger.error(f"검색 인덱스 로드 중 오류 발생: {str(e)}")
+
+    return _retrieval_index
+
+
+def rebuild_retrieval_index(mongo_db: Any, mode: Optional[str] = None) -> Dict[str, Any]:
+    """과거 문서와 입찰 기록으로 검색 인덱스를 다시 구축하고 전역 인덱스 교체"""
+    global _retrieval_index
+
+    config = DOCUMENT_GENERATION_CONFIG['retrieval']
+    snippets = collect_past_bid_snippets(config['past_bids_path']) + collect_document_snippets(mongo_db)
+
+    index = _new_index()
+    meta = index.build(snippets, mode or config['index_mode'])
+
+    with _retrieval_lock:
+        _retrieval_index = index
+
+    return meta
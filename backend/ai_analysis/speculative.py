@@ -0,0 +1,213 @@
+"""
+추측 디코딩(Speculative Decoding) 모듈 - 작은 초안 모델이 여러 토큰을 제안하고
+기준 모델이 한 번의 순전파로 검증하여 CPU 생성 지연 시간을 줄입니다.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import torch
+from transformers import LogitsProcessorList, StoppingCriteriaList
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeStats:
+    """초안 토큰 제안/수락 통계"""
+
+    FIELDS = ("rounds", "proposed_tokens", "accepted_tokens", "generated_tokens", "target_forward_passes")
+
+    def __init__(self, **values: int):
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field, 0))
+
+    def add(self, other: "SpeculativeStats") -> None:
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def since(self, snapshot: Dict[str, Any]) -> "SpeculativeStats":
+        """스냅샷 이후 증가분"""
+        return SpeculativeStats(**{field: getattr(self, field) - snapshot.get(field, 0) for field in self.FIELDS})
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = {field: getattr(self, field) for field in self.FIELDS}
+        result["rejected_tokens"] = self.proposed_tokens - self.accepted_tokens
+        result["acceptance_rate"] = (
+            round(self.accepted_tokens / self.proposed_tokens, 4) if self.proposed_tokens else 0.0
+        )
+        result["tokens_per_target_pass"] = (
+            round(self.generated_tokens / self.target_forward_passes, 3) if self.target_forward_passes else 0.0
+        )
+        return result
+
+
+def _crop_past(past_key_values: Any, length: int) -> Any:
+    """KV 캐시를 앞에서부터 length 토큰까지만 유지"""
+    if past_key_values is None:
+        return None
+    return tuple(
+        tuple(tensor[:, :, :length, :] for tensor in layer)
+        for layer in past_key_values
+    )
+
+
+def _warp_probs(logits: torch.FloatTensor, temperature: float, top_p: float) -> torch.FloatTensor:
+    """온도 및 top-p 를 적용한 확률 분포"""
+    probs = torch.softmax(logits.float() / max(temperature, 1e-5), dim=-1)
+
+    if top_p < 1.0:
+        sorted_probs, sorted_indices = torch.sort(probs, descending=True, dim=-1)
+        cumulative = torch.cumsum(sorted_probs, dim=-1)
+        sorted_probs[(cumulative - sorted_probs) > top_p] = 0.0
+        probs = torch.zeros_like(probs).scatter(-1, sorted_indices, sorted_probs)
+        probs = probs / probs.sum(dim=-1, keepdim=True)
+
+    return probs
+
+
+class SpeculativeDecoder:
+    """
+    초안 모델 기반 추측 디코딩
+
+    - 그리디 모드: 기준 모델의 그리디 디코딩과 동일한 결과
+    - 샘플링 모드: 수락 확률 min(1, p/q) 와 잔여 분포 재샘플링으로 기준 모델 분포 유지
+    - logits_processor (예: no_repeat_ngram_size) 는 각 위치의 앞선 토큰 기준으로 초안/기준 분포 모두에 적용하며,
+      검증은 처리된 기준 분포로 하므로 같은 처리기를 쓴 model.generate 와 결과가 같음
+    """
+
+    def __init__(self, target_model: Any, draft_model: Any, num_draft_tokens: int = 4):
+        self.target_model = target_model
+        self.draft_model = draft_model
+        self.num_draft_tokens = num_draft_tokens
+        self.total_stats = SpeculativeStats()
+        self._stats_lock = threading.Lock()
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return self.total_stats.as_dict()
+
+    @staticmethod
+    def _process(logits_processor: Optional[LogitsProcessorList], prefix_ids: torch.LongTensor,
+                 logits: torch.FloatTensor) -> torch.FloatTensor:
+        """prefix_ids 다음 위치의 로짓에 처리기 적용 (처리기가 제자리 수정하므로 복사본 사용)"""
+        if not logits_processor:
+            return logits
+        return logits_processor(prefix_ids, logits.clone())
+
+    def _select(self, probs: torch.FloatTensor, do_sample: bool) -> torch.LongTensor:
+        if do_sample:
+            return torch.multinomial(probs, num_samples=1).squeeze(-1)
+        return torch.argmax(probs, dim=-1)
+
+    @torch.no_grad()
+    def generate(self, input_ids: torch.LongTensor, max_new_tokens: int,
+                 eos_token_id: Optional[int] = None, do_sample: bool = False,
+                 temperature: float = 1.0, top_p: float = 1.0,
+                 stopping_criteria: Optional[StoppingCriteriaList] = None,
+                 logits_processor: Optional[LogitsProcessorList] = None) -> Tuple[torch.LongTensor, SpeculativeStats]:
+        """텍스트 생성 (배치 크기 1)"""
+        stats = SpeculativeStats()
+        ids = input_ids
+        prompt_length = input_ids.shape[1]
+
+        target_past, target_cache_length = None, 0
+        draft_past, draft_cache_length = None, 0
+
+        while ids.shape[1] - prompt_length < max_new_tokens:
+            remaining = max_new_tokens - (ids.shape[1] - prompt_length)
+            num_draft = min(self.num_draft_tokens, remaining)
+
+            # 1. 초안 모델이 num_draft 개 토큰 제안
+            draft_tokens = []
+            draft_probs = []
+            draft_input = ids[:, draft_cache_length:]
+
+            for j in range(num_draft):
+                draft_out = self.draft_model(input_ids=draft_input, past_key_values=draft_past, use_cache=True)
+                draft_past = draft_out.past_key_values
+                draft_prefix = torch.cat([ids] + [t.view(1, 1) for t in draft_tokens], dim=1) if j else ids
+                q = _warp_probs(
+                    self._process(logits_processor, draft_prefix, draft_out.logits[:, -1, :]), temperature, top_p
+                )
+                token = self._select(q, do_sample)
+                draft_tokens.append(token)
+                draft_probs.append(q)
+                draft_input = token.view(1, 1)
+
+            # 초안 캐시는 마지막 제안 토큰을 제외한 위치까지 유효
+            draft_cache_length = ids.shape[1] + num_draft - 1
+
+            # 2. 기준 모델이 한 번의 순전파로 모든 제안 토큰 검증
+            proposal = torch.stack(draft_tokens, dim=1)
+            target_input = torch.cat([ids[:, target_cache_length:], proposal], dim=1)
+            target_out = self.target_model(input_ids=target_input, past_key_values=target_past, use_cache=True)
+            target_past = target_out.past_key_values
+            stats.target_forward_passes += 1
+
+            # 마지막 기존 토큰 ~ 마지막 제안 토큰 위치의 분포 (num_draft + 1 개)
+            target_logits = target_out.logits[:, -(num_draft + 1):, :]
+
+            accepted = 0
+            next_token = None
+            for i in range(num_draft):
+                target_prefix = torch.cat([ids, proposal[:, :i]], dim=1)
+                p = _warp_probs(
+                    self._process(logits_processor, target_prefix, target_logits[:, i, :]), temperature, top_p
+                )
+                token = draft_tokens[i]
+
+                if do_sample:
+                    q = draft_probs[i]
+                    p_token = p[0, token].item()
+                    q_token = max(q[0, token].item(), 1e-10)
+                    if torch.rand(1).item() < min(1.0, p_token / q_token):
+                        accepted += 1
+                        continue
+                    residual = torch.clamp(p - q, min=0.0)
+                    residual_sum = residual.sum()
+                    next_token = self._select(residual / residual_sum if residual_sum > 0 else p, True)
+                else:
+                    target_token = torch.argmax(p, dim=-1)
+                    if target_token.item() == token.item():
+                        accepted += 1
+                        continue
+                    next_token = target_token
+                break
+
+            if next_token is None:
+                # 모든 제안이 수락되면 기준 모델의 다음 토큰을 추가로 얻음
+                p = _warp_probs(
+                    self._process(logits_processor, torch.cat([ids, proposal], dim=1), target_logits[:, num_draft, :]),
+                    temperature, top_p
+                )
+                next_token = self._select(p, do_sample)
+
+            new_tokens = torch.cat([proposal[:, :accepted], next_token.view(1, 1)], dim=1)
+            new_tokens = new_tokens[:, :remaining]
+            ids = torch.cat([ids, new_tokens], dim=1)
+
+            stats.rounds += 1
+            stats.proposed_tokens += num_draft
+            stats.accepted_tokens += accepted
+            stats.generated_tokens += new_tokens.shape[1]
+
+            # 3. 수락된 위치까지만 KV 캐시 유지
+            target_cache_length = ids.shape[1] - 1
+            target_past = _crop_past(target_past, target_cache_length)
+            draft_cache_length = min(draft_cache_length, ids.shape[1] - 1)
+            draft_past = _crop_past(draft_past, draft_cache_length)
+
+            # 종료 토큰 및 중단 조건 확인
+            if eos_token_id is not None and (new_tokens == eos_token_id).any():
+                eos_index = (ids[0, prompt_length:] == eos_token_id).nonzero()[0].item()
+                ids = ids[:, :prompt_length + eos_index + 1]
+                break
+
+            if stopping_criteria and stopping_criteria(ids, None):
+                break
+
+        with self._stats_lock:
+            self.total_stats.add(stats)
+
+        return ids, stats
@@ -0,0 +1,177 @@
+"""
+생성 중단 조건 모듈 - 섹션 단위 텍스트 생성의 조기 종료 조건을 구현합니다.
+
+- 다음 섹션 제목이 생성되기 시작하면 중단
+- 같은 토큰 패턴이 반복되면 중단
+- 목표 단어 수에 도달하면 중단
+"""
+
+import re
+import logging
+from typing import List, Optional
+
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList, PreTrainedTokenizer
+
+from config.settings import DOCUMENT_GENERATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 새 섹션의 시작으로 간주하는 패턴 (줄 단위)
+SECTION_HEADING_PATTERN = re.compile(
+    r"\n\s*(?:"
+    r"#{1,6}\s+\S"                           # 마크다운 제목
+    r"|\d+(?:\.\d+)*[.)]\s+\S[^\n]{0,40}\n"  # 번호 제목 (1. 개요)
+    r"|[^\n]{1,40}\s섹션 내용"                # 프롬프트 형식의 섹션 제목
+    r"|\[톤:"                                # 프롬프트 스타일 지정 반복
+    r"|(?:제목|문서 유형|입찰 정보|발주 기관|콘텐츠 요구사항)\s*:"  # 컨텍스트 반복
+    r")"
+)
+
+SENTENCE_END_PATTERN = re.compile(r"[.!?。](?=\s|$)")
+
+
+class SectionStoppingCriteria(StoppingCriteria):
+    """프롬프트 이후 생성된 토큰만 검사하는 중단 조건의 기본 클래스"""
+
+    name = "base"
+
+    def __init__(self, prompt_length: int):
+        self.prompt_length = prompt_length
+        self.triggered = False
+
+    def _generated_ids(self, input_ids: torch.LongTensor) -> torch.LongTensor:
+        return input_ids[0, self.prompt_length:]
+
+    def should_stop(self, generated_ids: torch.LongTensor) -> bool:
+        raise NotImplementedError("자식 클래스에서 구현해야 합니다")
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        if self.triggered:
+            return True
+
+        generated_ids = self._generated_ids(input_ids)
+        if len(generated_ids) == 0:
+            return False
+
+        self.triggered = self.should_stop(generated_ids)
+        return self.triggered
+
+
+class SectionHeadingStoppingCriteria(SectionStoppingCriteria):
+    """다음 섹션 제목이 나타나면 중단"""
+
+    name = "section_heading"
+
+    def __init__(self, tokenizer: PreTrainedTokenizer, prompt_length: int,
+                 pattern: re.Pattern = SECTION_HEADING_PATTERN, tail_tokens: int = 32):
+        super().__init__(prompt_length)
+        self.tokenizer = tokenizer
+        self.pattern = pattern
+        self.tail_tokens = tail_tokens
+
+    def should_stop(self, generated_ids: torch.LongTensor) -> bool:
+        # 줄바꿈 이후에만 제목이 생길 수 있으므로 최근 토큰만 디코딩
+        tail = self.tokenizer.decode(generated_ids[-self.tail_tokens:], skip_special_tokens=True)
+        return "\n" in tail and self.pattern.search(tail) is not None
+
+
+class RepetitionStoppingCriteria(SectionStoppingCriteria):
+    """반복 생성(동일 n-gram 재등장 또는 낮은 토큰 다양성) 감지 시 중단"""
+
+    name = "repetition"
+
+    def __init__(self, prompt_length: int, ngram_size: int = 6, window: int = 64,
+                 min_diversity: float = 0.2):
+        super().__init__(prompt_length)
+        self.ngram_size = ngram_size
+        self.window = window
+        self.min_diversity = min_diversity
+
+    def should_stop(self, generated_ids: torch.LongTensor) -> bool:
+        tokens = generated_ids.tolist()
+
+        # 마지막 n-gram 이 이전에 등장했는지 확인
+        n = self.ngram_size
+        if len(tokens) >= 2 * n:
+            last_ngram = tokens[-n:]
+            for i in range(len(tokens) - 2 * n + 1):
+                if tokens[i:i + n] == last_ngram:
+                    return True
+
+        # 최근 구간의 고유 토큰 비율 확인
+        if len(tokens) >= self.window:
+            recent = tokens[-self.window:]
+            if len(set(recent)) / self.window < self.min_diversity:
+                return True
+
+        return False
+
+
+class WordBudgetStoppingCriteria(SectionStoppingCriteria):
+    """목표 단어 수에 도달하면 중단"""
+
+    name = "word_budget"
+
+    def __init__(self, tokenizer: PreTrainedTokenizer, prompt_length: int, target_words: int,
+                 check_interval: int = 4):
+        super().__init__(prompt_length)
+        self.tokenizer = tokenizer
+        self.target_words = target_words
+        self.check_interval = check_interval
+
+    def should_stop(self, generated_ids: torch.LongTensor) -> bool:
+        # 디코딩 비용을 줄이기 위해 일정 토큰마다 확인
+        if len(generated_ids) % self.check_interval != 0:
+            return False
+
+        text = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
+        return len(text.split()) >= self.target_words
+
+
+def build_section_stopping_criteria(tokenizer: PreTrainedTokenizer, prompt_length: int,
+                                    target_words: Optional[int] = None) -> StoppingCriteriaList:
+    """섹션 생성용 중단 조건 목록 생성"""
+    config = DOCUMENT_GENERATION_CONFIG['stopping']
+
+    criteria: List[StoppingCriteria] = [
+        SectionHeadingStoppingCriteria(tokenizer, prompt_length),
+        RepetitionStoppingCriteria(
+            prompt_length,
+            ngram_size=config['repetition_ngram_size'],
+            window=config['diversity_window'],
+            min_diversity=config['min_diversity']
+        )
+    ]
+
+    if target_words:
+        criteria.append(WordBudgetStoppingCriteria(
+            tokenizer, prompt_length, target_words, check_interval=config['check_interval']
+        ))
+
+    return StoppingCriteriaList(criteria)
+
+
+def get_stop_reason(criteria: StoppingCriteriaList) -> Optional[str]:
+    """발동된 중단 조건 이름 (없으면 None)"""
+    for criterion in criteria:
+        if getattr(criterion, 'triggered', False):
+            return criterion.name
+    return None
+
+
+def trim_generated_text(text: str, target_words: Optional[int] = None) -> str:
+    """생성 텍스트 후처리 - 다음 섹션 제목 이후 내용과 목표 단어 수 초과분 제거"""
+    match = SECTION_HEADING_PATTERN.search(text)
+    if match:
+        text = text[:match.start()]
+
+    if target_words:
+        words = list(re.finditer(r"\S+", text))
+        if len(words) > target_words:
+            # 목표 단어 수 이후 첫 문장 종료 지점까지만 유지
+            cut = words[target_words - 1].end()
+            sentence_end = SENTENCE_END_PATTERN.search(text, cut)
+            text = text[:sentence_end.end()] if sentence_end else text[:cut]
+
+    return text.strip()
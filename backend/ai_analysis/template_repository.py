@@ -0,0 +1,313 @@
+"""
+템플릿 저장소 모듈 - 파일 템플릿과 DB 템플릿(DocumentTemplate)을 통합하여 캐싱합니다.
+
+- 템플릿 디렉터리는 file_refresh_interval 마다 확인하고, JSON 파일의 수정 시각(mtime)이 바뀌면 다시 파싱합니다.
+- DocumentTemplate 행은 커밋 시점의 SQLAlchemy 이벤트와 주기적인 변경 확인으로 무효화합니다.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from config.settings import MODEL_CONFIG, DOCUMENT_GENERATION_CONFIG
+from models.document import DocumentTemplate
+
+logger = logging.getLogger(__name__)
+
+# 템플릿 변수 패턴 ({{변수명}}, {% if 변수명 %})
+PLACEHOLDER_PATTERN = re.compile(r"{{\s*([^}]+?)\s*}}")
+CONDITION_PATTERN = re.compile(r"{%\s*if\s+([^%]+?)\s*%}")
+
+# 세션 info 에 DB 템플릿 변경 여부를 기록하는 키
+_SESSION_DIRTY_KEY = "template_repository_dirty"
+
+
+class CompiledTemplate:
+    """파싱 및 분석이 끝난 템플릿"""
+
+    def __init__(self, template_id: str, template: Dict[str, Any], source: str, version: str):
+        self.template_id = template_id
+        self.template = template
+        self.source = source  # "file" 또는 "db"
+        self.version = version
+        self.document_type = template.get('document_type')
+        self.variables = self._collect_variables(template)
+
+    @staticmethod
+    def _collect_variables(template: Dict[str, Any]) -> FrozenSet[str]:
+        """템플릿 전체에서 참조되는 데이터 키 수집"""
+        variables = set()
+        stack: List[Any] = [template]
+
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                variables.update(PLACEHOLDER_PATTERN.findall(value))
+                variables.update(CONDITION_PATTERN.findall(value))
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+
+        return frozenset(variables)
+
+    def __repr__(self):
+        return f"<CompiledTemplate {self.source}:{self.template_id} v{self.version}>"
+
+
+class TemplateRepository:
+    """파일 및 DB 템플릿 통합 저장소 (인메모리 캐시)"""
+
+    def __init__(self, templates_path: Optional[str] = None,
+                 session_factory: Optional[Callable[[], Session]] = None,
+                 db_refresh_interval: Optional[float] = None, use_db: bool = True,
+                 file_refresh_interval: Optional[float] = None):
+        config = DOCUMENT_GENERATION_CONFIG['template_repository']
+
+        self.templates_path = templates_path or os.path.join(MODEL_CONFIG['transformer']['path'], 'templates')
+        self.db_refresh_interval = (
+            db_refresh_interval if db_refresh_interval is not None else config['db_refresh_interval']
+        )
+        self.file_refresh_interval = (
+            file_refresh_interval if file_refresh_interval is not None else config['file_refresh_interval']
+        )
+        self._session_factory = session_factory
+        self.use_db = use_db
+        self._lock = threading.RLock()
+
+        # 파일 템플릿 캐시: 파일 경로 -> (mtime_ns, CompiledTemplate)
+        self._file_entries: Dict[str, Tuple[int, CompiledTemplate]] = {}
+        self._files_loaded = False
+        self._files_checked_at = 0.0
+
+        # DB 템플릿 캐시
+        self._db_entries: Dict[str, CompiledTemplate] = {}
+        self._db_rows: List[Dict[str, Any]] = []
+        self._db_stamp: Optional[Tuple[Any, Any]] = None
+        self._db_loaded = False
+        self._db_dirty = True
+        self._db_checked_at = 0.0
+
+    # ------------------------------------------------------------------
+    # 파일 템플릿
+    # ------------------------------------------------------------------
+    def _refresh_files(self) -> None:
+        """템플릿 디렉터리를 확인하고 변경된 파일만 다시 파싱 (file_refresh_interval 마다)"""
+        now = time.monotonic()
+        if self._files_loaded and now - self._files_checked_at < self.file_refresh_interval:
+            return
+        self._files_checked_at = now
+        self._files_loaded = True
+
+        if not os.path.isdir(self.templates_path):
+            if self._file_entries:
+                logger.warning(f"템플릿 디렉터리를 찾을 수 없습니다: {self.templates_path}")
+                self._file_entries = {}
+            return
+
+        current = {}
+        try:
+            with os.scandir(self.templates_path) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith('.json'):
+                        current[entry.path] = entry.stat().st_mtime_ns
+        except OSError as e:
+            logger.error(f"템플릿 디렉터리 조회 중 오류 발생: {str(e)}")
+            return
+
+        # 삭제된 파일 제거
+        for path in list(self._file_entries):
+            if path not in current:
+                logger.info(f"템플릿 제거: {path}")
+                del self._file_entries[path]
+
+        # 추가 또는 수정된 파일 파싱
+        for path, mtime_ns in current.items():
+            cached = self._file_entries.get(path)
+            if cached and cached[0] == mtime_ns:
+                continue
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    template = json.load(f)
+            except Exception as e:
+                logger.error(f"템플릿 로드 중 오류 발생 ({path}): {str(e)}")
+                self._file_entries.pop(path, None)
+                continue
+
+            template_id = str(template.get('id') or os.path.splitext(os.path.basename(path))[0])
+            self._file_entries[path] = (
+                mtime_ns,
+                CompiledTemplate(template_id, template, "file", str(mtime_ns))
+            )
+            logger.info(f"템플릿 로드: {template_id} ({os.path.basename(path)})")
+
+    # ------------------------------------------------------------------
+    # DB 템플릿
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row_to_summary(row: DocumentTemplate) -> Dict[str, Any]:
+        """API 응답용 템플릿 정보"""
+        return {
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "template_type": row.template_type,
+            "content_structure": row.content_structure,
+            "required_fields": row.required_fields,
+            "usage_count": row.usage_count,
+            "creator_id": row.creator_id
+        }
+
+    @staticmethod
+    def _row_to_template(row: DocumentTemplate) -> CompiledTemplate:
+        """DocumentTemplate 행을 생성기 템플릿 형식으로 변환"""
+        template = dict(row.content_structure or {})
+        template.update({
+            "id": str(row.id),
+            "name": row.name,
+            "description": row.description,
+            "document_type": row.template_type,
+        })
+
+        version_source = json.dumps(
+            [row.content_structure, row.template_type, row.updated_at.isoformat() if row.updated_at else None],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        version = hashlib.sha256(version_source.encode('utf-8')).hexdigest()[:16]
+
+        return CompiledTemplate(str(row.id), template, "db", version)
+
+    @staticmethod
+    def _db_change_stamp(db: Session) -> Tuple[Any, Any]:
+        """DB 템플릿 변경 확인용 값 (행 수, 최종 수정 시각)"""
+        return db.query(func.count(DocumentTemplate.id), func.max(DocumentTemplate.updated_at)).one()
+
+    def _refresh_db(self, db: Optional[Session] = None) -> None:
+        """필요한 경우에만 DB 템플릿 다시 로드"""
+        if not self.use_db:
+            return
+
+        now = time.monotonic()
+        if self._db_loaded and not self._db_dirty and now - self._db_checked_at < self.db_refresh_interval:
+            return
+
+        own_session = db is None
+        if own_session:
+            if self._session_factory is None:
+                from db.session import SessionLocal
+                self._session_factory = SessionLocal
+            db = self._session_factory()
+
+        try:
+            stamp = tuple(self._db_change_stamp(db))
+            self._db_checked_at = now
+
+            if self._db_loaded and not self._db_dirty and stamp == self._db_stamp:
+                return
+
+            rows = db.query(DocumentTemplate).order_by(DocumentTemplate.id).all()
+
+            self._db_rows = [self._row_to_summary(row) for row in rows]
+            self._db_entries = {
+                str(row.id): self._row_to_template(row)
+                for row in rows if not row.is_deleted
+            }
+            self._db_stamp = stamp
+            self._db_loaded = True
+            self._db_dirty = False
+
+            logger.info(f"DB 템플릿 로드: {len(self._db_entries)}개")
+
+        except Exception as e:
+            logger.error(f"DB 템플릿 로드 중 오류 발생: {str(e)}")
+
+        finally:
+            if own_session:
+                db.close()
+
+    def invalidate(self) -> None:
+        """DB 템플릿 캐시 무효화 (다음 조회 시 다시 로드)"""
+        with self._lock:
+            self._db_dirty = True
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _all_templates(self, db: Optional[Session] = None) -> List[CompiledTemplate]:
+        """파일 템플릿(파일명 순) 다음 DB 템플릿(ID 순) 목록"""
+        with self._lock:
+            self._refresh_files()
+            self._refresh_db(db)
+            file_templates = [entry for _, (_, entry) in sorted(self._file_entries.items())]
+            return file_templates + list(self._db_entries.values())
+
+    def get(self, template_id: str, db: Optional[Session] = None) -> Optional[CompiledTemplate]:
+        """템플릿 ID로 조회 (DB 템플릿은 행 ID 문자열)"""
+        template_id = str(template_id)
+        for entry in self._all_templates(db):
+            if entry.template_id == template_id:
+                return entry
+        return None
+
+    def get_by_document_type(self, document_type: str, required_key: Optional[str] = None,
+                             db: Optional[Session] = None) -> Optional[CompiledTemplate]:
+        """문서 유형에 맞는 첫 번째 템플릿 조회 (required_key 가 있으면 해당 키를 가진 템플릿만)"""
+        for entry in self._all_templates(db):
+            if entry.document_type != document_type:
+                continue
+            if required_key and required_key not in entry.template:
+                continue
+            return entry
+        return None
+
+    def list_db_templates(self, db: Optional[Session] = None,
+                          template_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """DocumentTemplate 목록 (API 응답 형식)"""
+        with self._lock:
+            self._refresh_db(db)
+            rows = self._db_rows
+
+        if template_type:
+            rows = [row for row in rows if row['template_type'] == template_type]
+
+        return [dict(row) for row in rows]
+
+
+# 전역 템플릿 저장소
+template_repository = TemplateRepository()
+
+
+def get_template_repository() -> TemplateRepository:
+    """전역 템플릿 저장소 반환"""
+    return template_repository
+
+
+# DocumentTemplate 변경 감지 - 플러시 시점에 표시하고 커밋이 끝나면 무효화
+def _mark_session_dirty(session: Session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(obj, '__tablename__', None) == "document_templates":
+            session.info[_SESSION_DIRTY_KEY] = True
+            return
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_DIRTY_KEY, False):
+        template_repository.invalidate()
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_DIRTY_KEY, None)
+
+
+event.listen(Session, "after_flush", _mark_session_dirty)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+event.listen(Session, "after_rollback", _discard_after_rollback)
@@ -2,35 +2,131 @@
 문서 관련 라우터 - 문서 생성, 조회, 수정, 삭제 등의 API 엔드포인트
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 
-from fastapi import APIRouter, Body, Depends, File, HTTPException, Path, Query, UploadFile, status
-from fastapi.responses import FileResponse
+from bson import ObjectId
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Path, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import desc
 from pymongo.database import Database
 
-from db.session import get_db, get_mongo_db, BlockchainStorage
+from db.session import get_db, get_mongo_db, to_mongo_id, BlockchainStorage
 from models.user import User
 from models.document import (
     Document, DocumentSection, DocumentTemplate, DocumentType,
-    DocumentCreate, DocumentUpdate, DocumentGenerationRequest
+    DocumentCreate, DocumentUpdate, DocumentGenerationRequest, DocumentBulkGenerationRequest, UploadSessionCreate,
+    CONTENT_PREVIEW_CHARS, build_document_summary
+)
+from models.tender import Tender
+from core.security import get_current_active_user, get_current_superuser
+from core.idempotency import IdempotencyStore, request_fingerprint
+from core.pagination import NEXT_CURSOR_HEADER, paginate_by_created, paginate_ranked, paginate_rows_by_id
+from core.search_index import get_search_index
+from core.blob_storage import get_blob_storage
+from core.file_response import build_file_response
+from core.upload_sessions import UploadSessionStore
+from core.archive import ArchiveError, extract_archive
+from core.extraction import ExtractionQueue, get_extraction_worker, is_extractable
+from ai_analysis.document_generator import TemplateBasedGenerator, get_document_generator
+from ai_analysis.template_repository import get_template_repository
+from ai_analysis.retrieval import get_retrieval_index, rebuild_retrieval_index
+from ai_analysis.near_duplicate import NearDuplicateIndex, build_request_text
+from ai_analysis.generator_router import get_generator_router
+from ai_analysis.cancellation import CancellationToken, GenerationCancelled
+from ai_analysis.checkpoint import CheckpointCompleted, CheckpointConflict, CheckpointInProgress, CheckpointStore
+from config.settings import (
+    ALLOWED_UPLOAD_EXTENSIONS, MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE, RESUMABLE_UPLOAD_CONFIG, ARCHIVE_UPLOAD_CONFIG,
+    NEAR_DUPLICATE_CONFIG, DOCUMENT_GENERATION_CONFIG, SEARCH_CONFIG, EXTRACTION_CONFIG
 )
-from core.security import get_current_active_user
-from ai_analysis.document_generator import get_document_generator
-from config.settings import UPLOAD_DIR, ALLOWED_UPLOAD_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 클라이언트가 응답을 기다리지 않고 연결을 끊은 경우 (nginx 관례)
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+def _finish_checkpoint(checkpoint: Any, job_status: str, **fields: Any) -> None:
+    """생성 작업 종료 상태 기록 (실패해도 응답에는 영향 없음)"""
+    try:
+        checkpoint.finish(job_status, **fields)
+    except Exception as e:
+        logger.error(f"체크포인트 상태 기록 중 오류 발생: {str(e)}")
+
+
+async def _cancel_on_disconnect(http_request: Request, cancel_token: CancellationToken) -> None:
+    """클라이언트 연결이 끊어지면 생성 취소"""
+    interval = DOCUMENT_GENERATION_CONFIG['cancellation']['disconnect_poll_interval']
+    while not cancel_token.is_cancelled:
+        if await http_request.is_disconnected():
+            cancel_token.cancel("client_disconnected")
+            return
+        await asyncio.sleep(interval)
+
+
+def _visible_duplicates(db: Session, matches: List[Dict[str, Any]], current_user: User) -> List[Dict[str, Any]]:
+    """유사 문서 후보 중 삭제되지 않았고 사용자가 접근 가능한 문서만 반환"""
+    if not matches:
+        return []
+    
+    query = db.query(Document).filter(
+        Document.id.in_([m["document_id"] for m in matches]),
+        Document.is_deleted == False
+    )
+    if not current_user.is_superuser:
+        query = query.filter(Document.creator_id == current_user.id)
+    
+    documents = {d.id: d for d in query.all()}
+    
+    visible = []
+    for match in matches:
+        document = documents.get(match["document_id"])
+        if document:
+            visible.append({**match, "title": document.title, "document_type": document.document_type})
+    
+    return visible
+
+
+def _index_document(document_id: int, title: Optional[str], content: Optional[str],
+                    tags: Optional[List[str]] = None, description: Optional[str] = None) -> None:
+    """검색 인덱스에 문서 반영 (실패해도 요청은 계속 처리, 토큰화 비용이 크므로 비동기 경로에서는 스레드 풀에서 호출)"""
+    search_index = get_search_index()
+    if not search_index:
+        return
+    try:
+        search_index.add_document(document_id, title, content, tags, description)
+    except Exception as e:
+        logger.error(f"검색 인덱스 갱신 중 오류 발생: {str(e)}")
+
+
+def _enqueue_extraction(mongo_db: Database, documents: List[Dict[str, Any]]) -> None:
+    """업로드 문서 텍스트 추출 작업 추가 (항목: document_id, file_path, file_format, 실패해도 요청은 계속 처리)"""
+    if not EXTRACTION_CONFIG['enabled']:
+        return
+    try:
+        if ExtractionQueue(mongo_db).enqueue_many(documents):
+            get_extraction_worker().notify()
+    except Exception as e:
+        logger.error(f"텍스트 추출 작업 추가 중 오류 발생: {str(e)}")
+
 
 @router.post("/generate", response_model=Dict[str, Any])
 async def generate_document(
     request: DocumentGenerationRequest,
+    http_request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     mongo_db: Database = Depends(get_mongo_db),
     current_user: User = Depends(get_current_active_user)
@@ -40,7 +136,62 @@ async def generate_document(
     
     - 문서 유형, 제목 및 기타 파라미터 필요
     - 입찰 ID가 제공된 경우 입찰 데이터 활용
+    - 생성 중 클라이언트 연결이 끊어지면 생성을 중단하고 저장하지 않음
+    - Idempotency-Key 헤더가 있으면 같은 키로 재시도된 요청에 저장된 결과 반환
+      (재시도를 위해 결과를 저장하므로 연결이 끊어져도 생성을 계속함)
+    - 완료된 섹션은 작업 ID(job_id, 없으면 Idempotency-Key)별로 저장되어 중단 후 재요청 시 재개
     """
+    if not idempotency_key:
+        return await _generate_document(request, http_request, db, mongo_db, current_user)
+    
+    fingerprint = request_fingerprint(current_user.id, "documents/generate", request.dict())
+    result, replayed = await IdempotencyStore(mongo_db).run(
+        idempotency_key, current_user.id, "documents/generate", fingerprint,
+        lambda: _generate_document(
+            request, http_request, db, mongo_db, current_user,
+            cancel_on_disconnect=False, job_id=request.job_id or idempotency_key
+        )
+    )
+    
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+def _completed_job_response(mongo_db: Database, job_id: str, completed: CheckpointCompleted) -> Dict[str, Any]:
+    """이미 완료된 생성 작업의 응답 (저장된 문서 기준)"""
+    response = {
+        "message": "이미 완료된 생성 작업입니다.",
+        "job_id": job_id,
+        "document_id": completed.document_id,
+        "sql_document_id": completed.sql_document_id,
+        "job_completed": True
+    }
+    
+    mongo_doc = mongo_db.documents.find_one({"_id": to_mongo_id(completed.document_id)}) if completed.document_id else None
+    if mongo_doc:
+        response.update({
+            "title": mongo_doc.get("title"),
+            "document_type": mongo_doc.get("document_type"),
+            "generator_type": mongo_doc.get("generation_parameters", {}).get("generator_type"),
+            "sections_count": len(mongo_doc.get("sections", [])),
+            "content_length": len(mongo_doc.get("content", "")),
+            "document": {"sections": mongo_doc.get("sections", []), "metadata": mongo_doc.get("metadata", {})}
+        })
+    
+    return response
+
+
+async def _generate_document(
+    request: DocumentGenerationRequest,
+    http_request: Request,
+    db: Session,
+    mongo_db: Database,
+    current_user: User,
+    cancel_on_disconnect: bool = True,
+    job_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """문서 생성 처리 (generate_document 참조)"""
     logger.info(f"문서 생성 요청: {request.title} (유형: {request.document_type.value})")
     
     # 입찰 데이터 조회 (있는 경우)
@@ -61,18 +212,105 @@ async def generate_document(
         else:
             tender_data = tender
     
-    # 문서 생성기 초기화
-    generator_type = "hybrid"  # 기본값: 하이브리드 모드
+    # 부분 재생성용 기존 문서 조회
+    base_document = None
+    if request.base_document_id:
+        base_document = mongo_db.documents.find_one({"_id": to_mongo_id(request.base_document_id)})
+        
+        if not base_document:
+            logger.warning(f"기존 문서 {request.base_document_id}을 찾을 수 없습니다.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="재생성할 기존 문서를 찾을 수 없습니다."
+            )
+        
+        if base_document.get("creator_id") != current_user.id and not current_user.is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="이 문서를 재생성할 권한이 없습니다."
+            )
+    
+    # 생성 전 유사 요청 확인 (요청 내용이 거의 같은 기존 문서가 있으면 재사용 제안)
+    request_text = build_request_text(request, tender_data)
+    if request.reuse_near_duplicate and not base_document:
+        try:
+            matches = NearDuplicateIndex(mongo_db).find_similar_requests(request_text)
+            existing = _visible_duplicates(db, matches, current_user)
+        except Exception as e:
+            logger.error(f"유사 문서 확인 중 오류 발생: {str(e)}")
+            existing = []
+        
+        if existing:
+            best = existing[0]
+            logger.info(f"유사 문서 재사용 제안: 문서 ID {best['document_id']} (유사도: {best['similarity']})")
+            return {
+                "message": "요청 내용이 거의 같은 기존 문서가 있어 새로 생성하지 않았습니다.",
+                "near_duplicate": True,
+                "document_id": best["mongo_id"],
+                "sql_document_id": best["document_id"],
+                "title": best["title"],
+                "similarity": best["similarity"],
+                "candidates": existing
+            }
     
+    # 문서 생성기 선택 (지연 시간 목표 및 생성기별 지연 통계 기반, 포화 시 템플릿으로 대체)
+    requested_type = None
     if request.content_requirements and "generator_type" in request.content_requirements:
-        generator_type = request.content_requirements.get("generator_type")
+        requested_type = request.content_requirements.get("generator_type")
+    
+    generator_router = get_generator_router()
+    generator_type, routing_reason = generator_router.route(request.latency_slo_ms, requested_type)
+    logger.info(f"생성기 선택: {generator_type} (사유: {routing_reason}, 목표: {request.latency_slo_ms}ms)")
     
     document_generator = get_document_generator(generator_type)
     
+    # 섹션 단위 체크포인트 (템플릿 렌더링은 즉시 끝나므로 제외)
+    job_id = job_id or request.job_id or uuid.uuid4().hex
+    checkpoint = None
+    if DOCUMENT_GENERATION_CONFIG['checkpoint']['enabled'] and generator_type != "template":
+        try:
+            checkpoint = CheckpointStore(mongo_db).start(
+                job_id,
+                current_user.id,
+                request_fingerprint(current_user.id, "documents/generate", request.dict(exclude={"job_id"})),
+                {"title": request.title, "document_type": request.document_type.value, "generator_type": generator_type}
+            )
+        except CheckpointConflict as e:
+            logger.warning(str(e))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="이 작업 ID 는 다른 내용의 요청에 이미 사용되었습니다."
+            )
+        except CheckpointInProgress as e:
+            logger.warning(str(e))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="같은 작업 ID 의 문서 생성이 진행 중입니다. 잠시 후 다시 시도하세요."
+            )
+        except CheckpointCompleted as e:
+            # 이미 완료된 작업은 다시 생성하지 않고 저장된 문서 반환
+            logger.info(f"완료된 생성 작업 재요청: {job_id} (문서 ID: {e.document_id})")
+            return _completed_job_response(mongo_db, job_id, e)
+    
     try:
-        # 문서 생성
+        # 문서 생성 (이벤트 루프를 막지 않도록 스레드 풀에서 실행, 연결 종료 시 취소)
         start_time = datetime.utcnow()
-        generated_document = document_generator.generate_document(request, tender_data)
+        cancel_token = CancellationToken()
+        disconnect_watcher = None
+        if cancel_on_disconnect:
+            disconnect_watcher = asyncio.create_task(_cancel_on_disconnect(http_request, cancel_token))
+        try:
+            with generator_router.track(generator_type):
+                generated_document = await run_in_threadpool(
+                    document_generator.generate_document, request, tender_data, base_document,
+                    cancel_token, checkpoint
+                )
+        finally:
+            if disconnect_watcher:
+                disconnect_watcher.cancel()
+        
+        # 생성 완료 직후 연결이 끊어진 경우에도 저장하지 않음
+        cancel_token.raise_if_cancelled()
         generation_time = (datetime.utcnow() - start_time).total_seconds()
         
         logger.info(f"문서 생성 완료: {request.title} (시간: {generation_time:.2f}초)")
@@ -89,10 +327,15 @@ async def generate_document(
             "is_ai_generated": True,
             "generation_parameters": {
                 "generator_type": generator_type,
+                "routing_reason": routing_reason,
+                "latency_slo_ms": request.latency_slo_ms,
                 "style_parameters": request.style_parameters,
-                "max_tokens": request.max_tokens
+                "max_tokens": request.max_tokens,
+                "regenerate_sections": request.regenerate_sections,
+                "section_requirements": request.section_requirements
             },
             "tender_id": request.tender_id,
+            "base_document_id": request.base_document_id,
             "content": "\n\n".join([s["content"] for s in generated_document["sections"]]),
             "sections": generated_document["sections"],
             "created_at": datetime.utcnow(),
@@ -111,6 +354,9 @@ async def generate_document(
             creator_id=current_user.id,
             is_ai_generated=True,
             generation_parameters={"mongodb_id": str(document_id)},
+            summary=build_document_summary(
+                mongo_doc["content"], len(mongo_doc["sections"]), mongo_doc["metadata"]
+            ),
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
@@ -151,31 +397,377 @@ async def generate_document(
         except Exception as e:
             logger.error(f"블록체인 저장 중 오류 발생: {str(e)}")
         
+        await run_in_threadpool(_index_document, db_document.id, request.title, mongo_doc["content"], description=mongo_doc.get("description"))
+        
+        # 유사 문서 탐지용 MinHash 서명 저장
+        try:
+            await run_in_threadpool(
+                NearDuplicateIndex(mongo_db).add,
+                db_document.id,
+                mongo_doc["content"],
+                mongo_id=str(document_id),
+                source="generated",
+                request_text=request_text,
+                creator_id=current_user.id
+            )
+        except Exception as e:
+            logger.error(f"문서 서명 저장 중 오류 발생: {str(e)}")
+        
+        if checkpoint:
+            _finish_checkpoint(checkpoint, "completed", document_id=str(document_id), sql_document_id=db_document.id)
+        
         # 응답 반환
         return {
             "message": "문서가 성공적으로 생성되었습니다.",
+            "job_id": job_id,
             "document_id": str(document_id),
             "sql_document_id": db_document.id,
             "title": request.title,
             "document_type": request.document_type.value,
+            "generator_type": generator_type,
+            "routing_reason": routing_reason,
             "generation_time": generation_time,
             "sections_count": len(generated_document["sections"]),
             "content_length": len(mongo_doc["content"]),
             "document": generated_document
         }
     
+    except GenerationCancelled as e:
+        logger.info(f"문서 생성 취소: {request.title} ({e.reason})")
+        if checkpoint:
+            _finish_checkpoint(checkpoint, "cancelled", error=e.reason)
+        raise HTTPException(
+            status_code=HTTP_499_CLIENT_CLOSED_REQUEST,
+            detail="클라이언트 연결이 끊어져 문서 생성이 취소되었습니다."
+        )
+    
     except Exception as e:
         logger.error(f"문서 생성 중 오류 발생: {str(e)}")
+        if checkpoint:
+            _finish_checkpoint(checkpoint, "failed", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"문서 생성 중 오류가 발생했습니다: {str(e)}"
         )
 
 
+def _fetch_tenders(db: Session, mongo_db: Database, tender_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """입찰 데이터를 MongoDB $in 조회 한 번, 없는 ID 는 SQL IN 조회 한 번으로 가져옴"""
+    tenders = {tender["_id"]: tender for tender in mongo_db.tenders.find({"_id": {"$in": tender_ids}})}
+    
+    missing_ids = [tender_id for tender_id in tender_ids if tender_id not in tenders]
+    if missing_ids:
+        for tender in db.query(Tender).filter(Tender.id.in_(missing_ids)).all():
+            tenders[tender.id] = tender.to_dict()
+    
+    return tenders
+
+
+def _render_for_tender(generator: TemplateBasedGenerator, request: DocumentBulkGenerationRequest,
+                       tender_id: int, tender_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """입찰 하나에 대한 템플릿 렌더링 (오류는 결과 항목으로 반환)"""
+    if tender_data is None:
+        return {"tender_id": tender_id, "status": "error", "error": "입찰 데이터를 찾을 수 없습니다."}
+    
+    tender_title = str(tender_data.get('title', ''))
+    title = (request.title or "{{tender_title}}").replace("{{tender_title}}", tender_title)
+    
+    generation_request = DocumentGenerationRequest(
+        title=title,
+        document_type=request.document_type,
+        template_id=request.template_id,
+        tender_id=tender_id,
+        content_requirements=request.content_requirements,
+        include_sections=request.include_sections,
+        exclude_sections=request.exclude_sections
+    )
+    
+    try:
+        document = generator.generate_document(generation_request, tender_data)
+    except Exception as e:
+        logger.error(f"일괄 렌더링 중 오류 발생 (입찰 ID {tender_id}): {str(e)}")
+        return {"tender_id": tender_id, "status": "error", "error": str(e)}
+    
+    return {"tender_id": tender_id, "status": "rendered", "title": title, "document": document}
+
+
+def _revoke_blockchain_hashes(blockchain_hashes: List[str]) -> None:
+    """저장이 취소된 문서의 블록체인 해시 삭제 (실패는 로그만 남김)"""
+    try:
+        BlockchainStorage.revoke_document_hashes(blockchain_hashes)
+    except Exception as e:
+        logger.error(f"블록체인 해시 취소 중 오류 발생: {str(e)}")
+
+
+def _compensate_rendered_batch(db: Session, mongo_db: Database, document_ids: List[int],
+                               mongo_ids: List[ObjectId], blockchain_hashes: List[str]) -> None:
+    """
+    MongoDB 저장에 실패한 배치의 보상 처리
+    
+    - 일부만 저장되었을 수 있는 MongoDB 문서, 이미 커밋된 SQL 행, 블록체인 해시를 삭제
+    """
+    try:
+        mongo_db.documents.delete_many({"_id": {"$in": mongo_ids}})
+    except Exception as e:
+        logger.error(f"MongoDB 문서 보상 삭제 중 오류 발생: {str(e)}")
+    
+    try:
+        db.query(Document).filter(Document.id.in_(document_ids)).delete(synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"문서 보상 삭제 중 오류 발생 (문서 ID: {document_ids}): {str(e)}")
+    
+    _revoke_blockchain_hashes(blockchain_hashes)
+
+
+def _persist_rendered_batch(db: Session, mongo_db: Database, current_user: User,
+                            request: DocumentBulkGenerationRequest,
+                            rendered: List[Dict[str, Any]]) -> None:
+    """
+    렌더링 결과 일괄 저장
+    
+    - SQL: add_all 후 flush 로 ID 확보, 배치당 커밋 한 번
+    - 블록체인 해시: insert_many 한 번
+    - MongoDB: 해시까지 채운 문서를 insert_many 한 번
+    """
+    from core.security import BlockchainSecurity
+    
+    if not rendered:
+        return
+    
+    now = datetime.utcnow()
+    description = f"AI 생성 문서: {request.document_type.value}"
+    mongo_docs = []
+    db_documents = []
+    
+    for item in rendered:
+        sections = item["document"]["sections"]
+        mongo_id = ObjectId()
+        
+        mongo_docs.append({
+            "_id": mongo_id,
+            "title": item["title"],
+            "description": description,
+            "document_type": request.document_type.value,
+            "creator_id": current_user.id,
+            "is_ai_generated": True,
+            "generation_parameters": {
+                "generator_type": "template",
+                "bulk": True,
+                "template_id": request.template_id
+            },
+            "tender_id": item["tender_id"],
+            "content": "\n\n".join([s["content"] for s in sections]),
+            "sections": sections,
+            "created_at": now,
+            "updated_at": now,
+            "metadata": item["document"].get("metadata", {})
+        })
+        
+        db_documents.append(Document(
+            title=item["title"],
+            description=description,
+            document_type=request.document_type.value,
+            creator_id=current_user.id,
+            is_ai_generated=True,
+            generation_parameters={"mongodb_id": str(mongo_id)},
+            summary=build_document_summary(
+                mongo_docs[-1]["content"], len(sections), mongo_docs[-1]["metadata"]
+            ),
+            created_at=now,
+            updated_at=now
+        ))
+    
+    blockchain_hashes = []
+    try:
+        db.add_all(db_documents)
+        db.flush()
+        document_ids = [db_document.id for db_document in db_documents]
+        
+        blockchain_hashes = BlockchainStorage.store_document_hashes([
+            {
+                "document_id": document_id,
+                "document_hash": BlockchainSecurity.hash_document(mongo_doc["content"]),
+                "metadata": {
+                    "document_type": request.document_type.value,
+                    "creator_id": current_user.id,
+                    "timestamp": now.isoformat()
+                }
+            }
+            for document_id, mongo_doc in zip(document_ids, mongo_docs)
+        ])
+        
+        for db_document, mongo_doc, blockchain_hash in zip(db_documents, mongo_docs, blockchain_hashes):
+            db_document.blockchain_hash = blockchain_hash
+            mongo_doc["blockchain_hash"] = blockchain_hash
+        
+        db.commit()
+    
+    except Exception:
+        db.rollback()
+        _revoke_blockchain_hashes(blockchain_hashes)
+        raise
+    
+    # SQL 커밋 이후 MongoDB 저장 (실패하면 SQL 행과 해시를 삭제하여 보상)
+    try:
+        mongo_db.documents.insert_many(mongo_docs, ordered=False)
+    except Exception:
+        _compensate_rendered_batch(db, mongo_db, document_ids, [mongo_doc["_id"] for mongo_doc in mongo_docs],
+                                   blockchain_hashes)
+        raise
+    
+    # 커밋으로 만료된 ORM 속성을 다시 읽지 않도록 저장해 둔 값 사용
+    for item, document_id, mongo_doc in zip(rendered, document_ids, mongo_docs):
+        item["status"] = "created"
+        item["document_id"] = str(mongo_doc["_id"])
+        item["sql_document_id"] = document_id
+        _index_document(document_id, mongo_doc["title"], mongo_doc["content"], description=description)
+    
+    # 유사 문서 탐지용 서명 저장
+    try:
+        NearDuplicateIndex(mongo_db).add_many([
+            {
+                "document_id": document_id,
+                "text": mongo_doc["content"],
+                "mongo_id": str(mongo_doc["_id"]),
+                "source": "generated",
+                "creator_id": current_user.id
+            }
+            for document_id, mongo_doc in zip(document_ids, mongo_docs)
+        ])
+    except Exception as e:
+        logger.error(f"문서 서명 일괄 저장 중 오류 발생: {str(e)}")
+
+
+@router.post("/generate/bulk")
+async def generate_documents_bulk(
+    request: DocumentBulkGenerationRequest,
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> StreamingResponse:
+    """
+    템플릿 하나를 여러 입찰에 일괄 렌더링 (메일 머지)
+    
+    - 입찰 데이터는 한 번의 조회로 가져옴
+    - 작업자 풀에서 렌더링하고 배치 단위로 일괄 저장
+    - 결과는 입찰별 한 줄씩 NDJSON 으로 스트리밍
+    """
+    config = DOCUMENT_GENERATION_CONFIG['bulk']
+    
+    if len(request.tender_ids) > config['max_tenders']:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 처리할 수 있는 입찰 수는 최대 {config['max_tenders']}개입니다."
+        )
+    
+    tenders = await run_in_threadpool(_fetch_tenders, db, mongo_db, request.tender_ids)
+    
+    generator = get_document_generator("template")
+    await run_in_threadpool(generator.initialize)
+    
+    logger.info(f"일괄 렌더링 요청: {len(request.tender_ids)}개 입찰 (조회된 입찰: {len(tenders)}개)")
+    
+    async def stream_results() -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        start_time = datetime.utcnow()
+        counts = {"created": 0, "error": 0}
+        
+        with ThreadPoolExecutor(max_workers=config['workers']) as executor:
+            for batch_start in range(0, len(request.tender_ids), config['batch_size']):
+                batch_ids = request.tender_ids[batch_start:batch_start + config['batch_size']]
+                
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(
+                        executor, _render_for_tender, generator, request, tender_id, tenders.get(tender_id)
+                    )
+                    for tender_id in batch_ids
+                ])
+                
+                rendered = [item for item in results if item["status"] == "rendered"]
+                try:
+                    await run_in_threadpool(_persist_rendered_batch, db, mongo_db, current_user, request, rendered)
+                except Exception as e:
+                    logger.error(f"일괄 저장 중 오류 발생: {str(e)}")
+                    for item in rendered:
+                        item["status"] = "error"
+                        item["error"] = f"저장 중 오류가 발생했습니다: {str(e)}"
+                
+                for item in results:
+                    counts["created" if item["status"] == "created" else "error"] += 1
+                    yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        
+        elapsed = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(f"일괄 렌더링 완료: 생성 {counts['created']}개, 오류 {counts['error']}개 (시간: {elapsed:.2f}초)")
+        
+        yield json.dumps({"status": "completed", **counts, "generation_time": elapsed}, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.get("/generate/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_generation_job(
+    job_id: str = Path(..., description="생성 작업 ID"),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    문서 생성 작업 진행 상황 조회
+    
+    - 완료된 섹션 목록, 진행률, 상태(running, completed, failed, cancelled)
+    """
+    job = CheckpointStore(mongo_db).get_status(job_id, current_user.id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="생성 작업을 찾을 수 없습니다."
+        )
+    
+    return job
+
+
+@router.get("/generate/routing", response_model=Dict[str, Any])
+async def get_generator_routing_stats(
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    생성기별 지연 시간 및 동시 실행 통계 조회
+    
+    - 생성기 라우팅에 사용되는 실시간 통계
+    """
+    return get_generator_router().snapshot()
+
+
+def _fetch_mongo_summaries(mongo_db: Database, mongo_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    MongoDB 문서 요약 정보 일괄 조회 (문자열 ID -> 요약)
+    
+    - 섹션 수, 본문 길이, 미리보기만 서버에서 계산하여 전송
+    """
+    if not mongo_ids:
+        return {}
+    
+    pipeline = [
+        {"$match": {"_id": {"$in": [to_mongo_id(mongo_id) for mongo_id in mongo_ids]}}},
+        {"$project": {
+            "sections_count": {"$size": {"$ifNull": ["$sections", []]}},
+            "content_length": {"$strLenCP": {"$ifNull": ["$content", ""]}},
+            "content_preview": {"$substrCP": [{"$ifNull": ["$content", ""]}, 0, CONTENT_PREVIEW_CHARS]},
+            "metadata": 1
+        }}
+    ]
+    
+    return {str(summary["_id"]): summary for summary in mongo_db.documents.aggregate(pipeline)}
+
+
 @router.get("", response_model=List[Dict[str, Any]])
 async def get_documents(
-    skip: int = Query(0, description="건너뛸 문서 수"),
-    limit: int = Query(100, description="반환할 최대 문서 수"),
+    response: Response,
+    skip: int = Query(0, description="건너뛸 문서 수 (cursor 사용 권장)"),
+    limit: int = Query(100, ge=1, le=1000, description="반환할 최대 문서 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 X-Next-Cursor 헤더)"),
     document_type: Optional[str] = Query(None, description="문서 유형 필터"),
     is_ai_generated: Optional[bool] = Query(None, description="AI 생성 문서만 필터링"),
     search_query: Optional[str] = Query(None, description="문서 제목 및 내용 검색"),
@@ -187,8 +779,8 @@ async def get_documents(
     """
     문서 목록 조회
     
-    - 필터링 및 페이징 지원
-    - 검색 기능 지원
+    - 필터링 및 페이징 지원 (최신순 커서 페이지네이션, 다음 페이지 커서는 X-Next-Cursor 헤더)
+    - 검색 기능 지원 (검색 인덱스 사용 시 관련도 순이며, 점수 상위 SEARCH_MAX_RESULTS 건(기본 1000)까지만 조회 가능)
     """
     # 기본 쿼리 설정
     query = db.query(Document).filter(Document.is_deleted == False)
@@ -204,13 +796,40 @@ async def get_documents(
         # 여기서는 간단한 로직만 구현 (실제로는 더 복잡할 수 있음)
         query = query.filter(Document.metadata.contains({"tender_id": tender_id}))
     
-    if search_query:
-        # 제목 검색 (SQL)
-        query = query.filter(Document.title.ilike(f"%{search_query}%"))
+    search_index = get_search_index() if search_query else None
     
-    # 정렬 및 페이징
-    query = query.order_by(desc(Document.created_at))
-    sql_documents = query.offset(skip).limit(limit).all()
+    if search_query and search_index:
+        # 제목/설명/본문/태그 역색인 검색 (BM25 점수 순, 상위 SEARCH_CONFIG['max_results'] 건까지 (점수, id) 키셋 페이징)
+        await run_in_threadpool(search_index.sync, db, mongo_db)
+        scores = dict(search_index.search(search_query, SEARCH_CONFIG['max_results']))
+        if not scores:
+            return []
+        
+        sql_documents = sorted(
+            query.filter(Document.id.in_(list(scores))).all(),
+            key=lambda doc: (-scores[doc.id], -doc.id)
+        )
+        sql_documents, next_cursor = paginate_ranked(sql_documents, scores, limit, cursor, offset=skip)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        if search_query:
+            # 검색 인덱스 비활성화 시 제목/본문 부분 일치 (pg_trgm 인덱스 사용)
+            pattern = f"%{search_query}%"
+            query = query.filter(or_(Document.title.ilike(pattern), Document.content.ilike(pattern)))
+        
+        # 정렬 및 페이징 ((created_at, id) 키셋)
+        sql_documents, next_cursor = paginate_by_created(query, Document, limit, cursor, offset=skip)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    # 저장된 요약이 없는 (요약 도입 이전) AI 생성 문서만 MongoDB 에서 한 번의 $in 조회로 계산
+    mongo_ids = [
+        doc.generation_parameters["mongodb_id"] for doc in sql_documents
+        if doc.summary is None and doc.is_ai_generated and doc.generation_parameters
+        and "mongodb_id" in doc.generation_parameters
+    ]
+    mongo_summaries = _fetch_mongo_summaries(mongo_db, mongo_ids)
     
     # 결과 목록
     documents = []
@@ -228,19 +847,29 @@ async def get_documents(
             "blockchain_hash": doc.blockchain_hash
         }
         
-        # MongoDB에 더 자세한 정보가 있는지 확인
         if doc.is_ai_generated and doc.generation_parameters and "mongodb_id" in doc.generation_parameters:
-            mongo_id = doc.generation_parameters["mongodb_id"]
-            mongo_doc = mongo_db.documents.find_one({"_id": mongo_id})
-            
-            if mongo_doc:
-                # 추가 정보 포함
-                document_data.update({
-                    "mongo_id": str(mongo_id),
-                    "sections_count": len(mongo_doc.get("sections", [])),
-                    "content_preview": mongo_doc.get("content", "")[:200] + ("..." if len(mongo_doc.get("content", "")) > 200 else ""),
-                    "metadata": mongo_doc.get("metadata", {})
-                })
+            document_data["mongo_id"] = str(doc.generation_parameters["mongodb_id"])
+        
+        summary = doc.summary
+        if summary is None and "mongo_id" in document_data:
+            summary = mongo_summaries.get(document_data["mongo_id"])
+            if summary:
+                summary = {
+                    "sections_count": summary["sections_count"],
+                    "content_length": summary["content_length"],
+                    "content_preview": summary["content_preview"] + ("..." if summary["content_length"] > CONTENT_PREVIEW_CHARS else ""),
+                    "metadata": summary.get("metadata", {})
+                }
+        
+        if summary:
+            # 요약 정보 포함
+            document_data.update({
+                "sections_count": summary.get("sections_count", 0),
+                "content_length": summary.get("content_length", 0),
+                "content_words": summary.get("content_words"),
+                "content_preview": summary.get("content_preview", ""),
+                "metadata": summary.get("metadata", {})
+            })
         
         documents.append(document_data)
     
@@ -248,82 +877,375 @@ async def get_documents(
     return documents
 
 
-@router.get("/{document_id}", response_model=Dict[str, Any])
-async def get_document(
-    document_id: int = Path(..., description="문서 ID"),
-    db: Session = Depends(get_db),
-    mongo_db: Database = Depends(get_mongo_db),
+@router.get("/retrieval/search", response_model=List[Dict[str, Any]])
+async def search_retrieval_index(
+    query: str = Query(..., description="검색 질의"),
+    top_k: int = Query(5, ge=1, le=50, description="반환할 최대 결과 수"),
     current_user: User = Depends(get_current_active_user)
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     """
-    특정 문서 조회
+    과거 제안서 및 입찰 기록 검색
     
-    - 문서 ID로 문서 조회
-    - 문서가 MongoDB에 저장된 경우 상세 정보 포함
+    - 문서 생성 시 컨텍스트로 사용되는 검색 인덱스 조회
+    - 인덱스/임베딩 모델 로드와 질의 임베딩은 스레드 풀에서 실행
     """
-    # SQL DB에서 문서 조회
-    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    index = await run_in_threadpool(get_retrieval_index)
     
-    if not document:
-        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+    if index is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다."
+            detail="검색 인덱스가 구축되지 않았습니다."
         )
     
-    # 기본 문서 데이터
-    document_data = {
-        "id": document.id,
-        "title": document.title,
-        "description": document.description,
-        "document_type": document.document_type,
-        "creator_id": document.creator_id,
-        "created_at": document.created_at,
-        "updated_at": document.updated_at,
-        "is_ai_generated": document.is_ai_generated,
-        "file_path": document.file_path,
-        "file_size": document.file_size,
-        "file_format": document.file_format,
-        "blockchain_hash": document.blockchain_hash
-    }
+    results = await run_in_threadpool(index.search, query, top_k=top_k)
     
-    # MongoDB에 더 자세한 정보가 있는지 확인
-    if document.is_ai_generated and document.generation_parameters and "mongodb_id" in document.generation_parameters:
-        mongo_id = document.generation_parameters["mongodb_id"]
-        mongo_doc = mongo_db.documents.find_one({"_id": mongo_id})
-        
-        if mongo_doc:
-            # MongoDB 데이터 추가
-            document_data.update({
-                "mongo_id": str(mongo_id),
-                "content": mongo_doc.get("content", ""),
-                "sections": mongo_doc.get("sections", []),
-                "metadata": mongo_doc.get("metadata", {}),
-                "generation_parameters": mongo_doc.get("generation_parameters", {})
-            })
+    logger.info(f"검색 인덱스 조회: {len(results)}개 결과")
+    return results
+
+
+@router.post("/retrieval/rebuild", response_model=Dict[str, Any])
+async def rebuild_retrieval(
+    mode: Optional[str] = Query(None, description="인덱스 모드 (exact, ivf, hnsw, auto)"),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_superuser)
+) -> Dict[str, Any]:
+    """
+    검색 인덱스 재구축 (관리자 전용)
     
-    # 블록체인 검증 (해시가 있는 경우)
-    if document.blockchain_hash:
-        try:
-            # 문서 내용 (MongoDB에서 가져온 경우)
-            if "content" in document_data:
-                from core.security import BlockchainSecurity
-                document_content = document_data["content"]
-                document_hash = BlockchainSecurity.hash_document(document_content)
-                
-                # 블록체인 검증
-                is_valid = BlockchainStorage.verify_document_hash(document.id, document_hash)
-                
-                document_data["blockchain_verification"] = {
-                    "verified": is_valid,
-                    "hash": document_hash,
-                    "blockchain_hash": document.blockchain_hash
-                }
-        
-        except Exception as e:
-            logger.error(f"블록체인 검증 중 오류 발생: {str(e)}")
-            document_data["blockchain_verification"] = {
-                "verified": False,
+    - MongoDB 문서 섹션과 과거 입찰 기록으로 임베딩 인덱스 구축
+    """
+    try:
+        meta = await run_in_threadpool(rebuild_retrieval_index, mongo_db, mode)
+    except Exception as e:
+        logger.error(f"검색 인덱스 구축 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"검색 인덱스 구축 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    logger.info(f"검색 인덱스 재구축: {meta['count']}개 스니펫")
+    
+    return {
+        "message": "검색 인덱스가 재구축되었습니다.",
+        "index": meta
+    }
+
+
+@router.get("/extraction/stats", response_model=Dict[str, Any])
+async def get_extraction_stats(
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_superuser)
+) -> Dict[str, Any]:
+    """
+    텍스트 추출 큐 현황 (관리자 전용)
+    
+    - 상태별 작업 수와 완료 작업의 평균 대기/추출/전체 처리 시간
+    """
+    stats = await run_in_threadpool(ExtractionQueue(mongo_db).stats)
+    stats["worker_running"] = get_extraction_worker().running
+    return stats
+
+
+@router.post("/duplicates/check", response_model=List[Dict[str, Any]])
+async def check_near_duplicates(
+    text: str = Body(..., embed=True, description="비교할 문서 내용"),
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0, description="유사도 기준 (자카드 추정치)"),
+    limit: int = Query(10, ge=1, le=100, description="반환할 최대 결과 수"),
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[Dict[str, Any]]:
+    """
+    텍스트와 거의 같은 저장 문서 조회
+    
+    - MinHash/LSH 인덱스로 후보만 비교 (전체 문서와 쌍별 비교하지 않음)
+    """
+    matches = await run_in_threadpool(NearDuplicateIndex(mongo_db).find_similar, text, threshold, limit)
+    result = _visible_duplicates(db, matches, current_user)
+    
+    logger.info(f"유사 문서 확인: {len(result)}개 결과")
+    return result
+
+
+@router.get("/templates", response_model=List[Dict[str, Any]])
+async def get_document_templates(
+    response: Response,
+    document_type: Optional[str] = Query(None, description="문서 유형별 필터링"),
+    skip: int = Query(0, description="건너뛸 템플릿 수 (cursor 사용 권장)"),
+    limit: int = Query(100, ge=1, le=1000, description="반환할 최대 템플릿 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 X-Next-Cursor 헤더)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[Dict[str, Any]]:
+    """
+    문서 템플릿 목록 조회
+    
+    - 문서 유형별 필터링 지원
+    - ID 순 커서 페이지네이션 (다음 페이지 커서는 X-Next-Cursor 헤더)
+    """
+    # 템플릿 저장소 캐시에서 조회 (DocumentTemplate 변경 시 자동 무효화)
+    templates = get_template_repository().list_db_templates(db, template_type=document_type)
+    
+    result, next_cursor = paginate_rows_by_id(templates, limit, cursor, offset=skip)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    logger.info(f"템플릿 목록 조회: {len(result)}개 결과")
+    return result
+
+
+@router.post("/templates", response_model=Dict[str, Any])
+async def create_document_template(
+    name: str = Body(...),
+    description: str = Body(None),
+    template_type: str = Body(...),
+    content_structure: Dict[str, Any] = Body(...),
+    required_fields: Optional[Dict[str, Any]] = Body(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    문서 템플릿 생성
+    
+    - 템플릿 이름, 유형, 구조 필요
+    """
+    # 템플릿 중복 확인
+    existing_template = db.query(DocumentTemplate).filter(
+        DocumentTemplate.name == name,
+        DocumentTemplate.template_type == template_type
+    ).first()
+    
+    if existing_template:
+        logger.warning(f"템플릿 생성 실패: 템플릿 이름 중복 ({name})")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="같은 이름과 유형의 템플릿이 이미 존재합니다."
+        )
+    
+    # 템플릿 생성
+    db_template = DocumentTemplate(
+        name=name,
+        description=description,
+        template_type=template_type,
+        content_structure=content_structure,
+        required_fields=required_fields,
+        usage_count=0,
+        creator_id=current_user.id
+    )
+    
+    db.add(db_template)
+    db.commit()
+    db.refresh(db_template)
+    
+    logger.info(f"템플릿 생성: ID {db_template.id}, 이름: {name}")
+    
+    return {
+        "message": "템플릿이 성공적으로 생성되었습니다.",
+        "template_id": db_template.id,
+        "name": db_template.name
+    }
+
+
+@router.get("/{document_id}/duplicates", response_model=List[Dict[str, Any]])
+async def get_near_duplicates(
+    document_id: int = Path(..., description="문서 ID"),
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0, description="유사도 기준 (자카드 추정치)"),
+    limit: int = Query(10, ge=1, le=100, description="반환할 최대 결과 수"),
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[Dict[str, Any]]:
+    """
+    문서와 거의 같은 다른 문서 조회
+    
+    - 생성/업로드 시 저장된 MinHash 서명 사용
+    """
+    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    
+    if not document:
+        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다."
+        )
+    
+    if document.creator_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="이 문서에 접근할 권한이 없습니다."
+        )
+    
+    matches = NearDuplicateIndex(mongo_db).find_similar_to_document(document_id, threshold, limit)
+    
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이 문서의 유사도 서명이 없습니다."
+        )
+    
+    result = _visible_duplicates(db, matches, current_user)
+    
+    logger.info(f"유사 문서 조회: 문서 ID {document_id}, {len(result)}개 결과")
+    return result
+
+
+def _get_extraction_document(db: Session, document_id: int, current_user: User) -> Document:
+    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    
+    if not document:
+        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다."
+        )
+    
+    if document.creator_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="이 문서에 접근할 권한이 없습니다."
+        )
+    
+    return document
+
+
+@router.get("/{document_id}/extraction", response_model=Dict[str, Any])
+async def get_extraction_status(
+    document_id: int = Path(..., description="문서 ID"),
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    업로드 문서의 텍스트 추출 상태 조회
+    
+    - 상태(queued, running, completed, failed), 시도 횟수, 단계별 처리 시간, 오류
+    """
+    _get_extraction_document(db, document_id, current_user)
+    
+    job = ExtractionQueue(mongo_db).get(document_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이 문서의 텍스트 추출 작업이 없습니다."
+        )
+    return job
+
+
+@router.post("/{document_id}/extraction", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def retry_extraction(
+    document_id: int = Path(..., description="문서 ID"),
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    업로드 문서의 텍스트 추출 다시 요청
+    
+    - 완료/실패한 작업도 다시 대기 상태로 추가 (처리 중인 작업은 409)
+    """
+    document = _get_extraction_document(db, document_id, current_user)
+    
+    if not document.file_path or not is_extractable(document.file_format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="텍스트를 추출할 수 없는 문서입니다."
+        )
+    
+    queue = ExtractionQueue(mongo_db)
+    job = queue.get(document_id)
+    if job and job["status"] == "running":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="텍스트 추출이 이미 진행 중입니다."
+        )
+    
+    queue.enqueue(document_id, document.file_path, document.file_format, force=True)
+    get_extraction_worker().notify()
+    
+    logger.info(f"텍스트 추출 재요청: 문서 ID {document_id}")
+    return {
+        "message": "텍스트 추출이 요청되었습니다.",
+        "document_id": document_id,
+        "status": "queued"
+    }
+
+
+@router.get("/{document_id}", response_model=Dict[str, Any])
+async def get_document(
+    document_id: int = Path(..., description="문서 ID"),
+    db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    특정 문서 조회
+    
+    - 문서 ID로 문서 조회
+    - 문서가 MongoDB에 저장된 경우 상세 정보 포함
+    """
+    # SQL DB에서 문서 조회
+    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    
+    if not document:
+        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다."
+        )
+    
+    # 기본 문서 데이터
+    document_data = {
+        "id": document.id,
+        "title": document.title,
+        "description": document.description,
+        "document_type": document.document_type,
+        "creator_id": document.creator_id,
+        "created_at": document.created_at,
+        "updated_at": document.updated_at,
+        "is_ai_generated": document.is_ai_generated,
+        "file_path": document.file_path,
+        "file_size": document.file_size,
+        "file_format": document.file_format,
+        "blockchain_hash": document.blockchain_hash
+    }
+    
+    # MongoDB에 더 자세한 정보가 있는지 확인
+    if document.is_ai_generated and document.generation_parameters and "mongodb_id" in document.generation_parameters:
+        mongo_id = document.generation_parameters["mongodb_id"]
+        mongo_doc = mongo_db.documents.find_one({"_id": mongo_id})
+        
+        if mongo_doc:
+            # MongoDB 데이터 추가
+            document_data.update({
+                "mongo_id": str(mongo_id),
+                "content": mongo_doc.get("content", ""),
+                "sections": mongo_doc.get("sections", []),
+                "metadata": mongo_doc.get("metadata", {}),
+                "generation_parameters": mongo_doc.get("generation_parameters", {})
+            })
+    
+    # 블록체인 검증 (해시가 있는 경우)
+    if document.blockchain_hash:
+        try:
+            # 문서 내용 (MongoDB에서 가져온 경우)
+            if "content" in document_data:
+                from core.security import BlockchainSecurity
+                document_content = document_data["content"]
+                document_hash = BlockchainSecurity.hash_document(document_content)
+                
+                # 블록체인 검증
+                is_valid = BlockchainStorage.verify_document_hash(document.id, document_hash)
+                
+                document_data["blockchain_verification"] = {
+                    "verified": is_valid,
+                    "hash": document_hash,
+                    "blockchain_hash": document.blockchain_hash
+                }
+        
+        except Exception as e:
+            logger.error(f"블록체인 검증 중 오류 발생: {str(e)}")
+            document_data["blockchain_verification"] = {
+                "verified": False,
                 "error": str(e)
             }
     
@@ -357,6 +1279,7 @@ async def create_document(
         generation_parameters=document.generation_parameters,
         version=document.version,
         previous_version_id=document.previous_version_id,
+        summary=build_document_summary(document.content),
         creator_id=current_user.id,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
@@ -366,6 +1289,8 @@ async def create_document(
     db.commit()
     db.refresh(db_document)
     
+    await run_in_threadpool(_index_document, db_document.id, db_document.title, db_document.content, db_document.tags, db_document.description)
+    
     logger.info(f"문서 생성: ID {db_document.id}, 제목: {document.title}")
     
     return {
@@ -428,6 +1353,11 @@ async def update_document(
     
     if document.content is not None:
         db_document.content = document.content
+        # 목록 조회용 요약 재계산 (섹션 수와 생성 메타데이터는 유지)
+        previous_summary = db_document.summary or {}
+        db_document.summary = build_document_summary(
+            document.content, previous_summary.get("sections_count", 0), previous_summary.get("metadata")
+        )
     
     if document.tags is not None:
         db_document.tags = document.tags
@@ -461,6 +1391,16 @@ async def update_document(
         
         mongo_db.documents.update_one({"_id": mongo_id}, {"$set": update_data})
     
+    # 검색 인덱스 갱신 (AI 생성 문서 본문은 MongoDB 에 있음)
+    content = db_document.content
+    if content is None and db_document.is_ai_generated and db_document.generation_parameters \
+            and "mongodb_id" in db_document.generation_parameters:
+        mongo_doc = mongo_db.documents.find_one(
+            {"_id": to_mongo_id(db_document.generation_parameters["mongodb_id"])}, {"content": 1}
+        )
+        content = mongo_doc.get("content") if mongo_doc else None
+    await run_in_threadpool(_index_document, db_document.id, db_document.title, content, db_document.tags, db_document.description)
+    
     logger.info(f"문서 수정: ID {document_id}")
     
     return {
@@ -501,8 +1441,14 @@ async def delete_document(
             detail="이 문서를 삭제할 권한이 없습니다."
         )
     
-    # 파일이 있는 경우 파일 삭제 (영구 삭제 시에만)
-    if permanent and db_document.file_path and os.path.exists(db_document.file_path):
+    # 콘텐츠 주소 저장소 파일은 참조 수만 감소 (마지막 참조면 커밋 후 다시 확인하여 파일 삭제)
+    content_hash = db_document.content_hash
+    unreferenced_blob = False
+    if permanent and content_hash:
+        unreferenced_blob = get_blob_storage().release(db, content_hash)
+    
+    # 이전 방식으로 저장된 파일이 있는 경우 파일 삭제 (영구 삭제 시에만)
+    elif permanent and db_document.file_path and os.path.exists(db_document.file_path):
         try:
             os.remove(db_document.file_path)
             logger.info(f"문서 파일 삭제: {db_document.file_path}")
@@ -519,6 +1465,13 @@ async def delete_document(
         except Exception as e:
             logger.error(f"MongoDB 문서 삭제 중 오류 발생: {str(e)}")
     
+    # 유사 문서 탐지용 서명 삭제 (영구 삭제 시에만)
+    if permanent:
+        try:
+            NearDuplicateIndex(mongo_db).remove(document_id)
+        except Exception as e:
+            logger.error(f"문서 서명 삭제 중 오류 발생: {str(e)}")
+    
     # SQL DB 문서 삭제 또는 플래그 설정
     if permanent:
         db.delete(db_document)
@@ -530,6 +1483,13 @@ async def delete_document(
     
     db.commit()
     
+    if unreferenced_blob and get_blob_storage().collect(db, content_hash):
+        logger.info(f"참조가 없는 문서 파일 삭제: {content_hash}")
+    
+    search_index = get_search_index()
+    if search_index:
+        search_index.remove_document(document_id)
+    
     return {
         "message": f"문서가 {'영구적으로 ' if permanent else ''}삭제되었습니다.",
         "document_id": document_id
@@ -538,11 +1498,14 @@ async def delete_document(
 
 @router.post("/upload", response_model=Dict[str, Any])
 async def upload_document(
+    response: Response,
     file: UploadFile = File(...),
     title: Optional[str] = Query(None, description="문서 제목 (없으면 파일명 사용)"),
     document_type: Optional[str] = Query(None, description="문서 유형"),
     description: Optional[str] = Query(None, description="문서 설명"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Dict[str, Any]:
     """
@@ -550,9 +1513,107 @@ async def upload_document(
     
     - 파일 업로드 후 문서 생성
     - 허용된 파일 형식만 업로드 가능
+    - ZIP 압축 파일(RFP 패키지)은 구성 파일마다 문서 생성
+    - Idempotency-Key 헤더가 있으면 같은 키로 재시도된 요청에 저장된 결과 반환
+      (요청 지문은 파일명, 파일 크기, 문서 정보 기준이며, 저장된 결과를 반환하기 전에
+      파일 내용의 SHA-256 이 저장된 content_hash 와 다르면 422)
     """
-    # 파일 확장자 확인
-    filename = file.filename
+    if not idempotency_key:
+        return await _upload_document(file, title, document_type, description, db, mongo_db, current_user)
+    
+    fingerprint = request_fingerprint(current_user.id, "documents/upload", {
+        "filename": file.filename,
+        "file_size": await run_in_threadpool(_upload_file_size, file),
+        "title": title,
+        "document_type": document_type,
+        "description": description
+    })
+    result, replayed = await IdempotencyStore(mongo_db).run(
+        idempotency_key, current_user.id, "documents/upload", fingerprint,
+        lambda: _upload_document(file, title, document_type, description, db, mongo_db, current_user)
+    )
+    
+    if replayed:
+        stored_hash = result.get("content_hash")
+        if stored_hash and stored_hash != await _hash_upload(file):
+            logger.warning(f"멱등성 키 재사용 거부: 파일 내용 불일치 ({file.filename})")
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="같은 Idempotency-Key 로 다른 내용의 파일이 전송되었습니다."
+            )
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+def _upload_file_size(file: UploadFile) -> int:
+    """업로드 파일 크기 (임시 파일 끝으로 이동하여 확인 후 처음으로 되돌림)"""
+    size = getattr(file, "size", None)
+    if size is not None:
+        return size
+    
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+async def _hash_upload(file: UploadFile) -> str:
+    """업로드 파일 내용의 SHA-256 (저장하지 않고 청크 단위로 계산)"""
+    digest = hashlib.sha256()
+    await file.seek(0)
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _stream_upload_to_file(file: UploadFile, file_path: str,
+                                 keep_contents: bool = False) -> Tuple[int, str, Optional[bytes]]:
+    """
+    업로드 파일을 청크 단위로 저장하며 원본 바이트의 SHA-256 계산 -> (크기, 해시, 본문)
+    
+    - 받은 크기가 MAX_UPLOAD_SIZE 를 넘으면 즉시 중단하고 413 (저장 중이던 파일 삭제)
+    - keep_contents 가 True 이면 본문 바이트도 반환 (텍스트 형식 파일의 요약/색인용)
+    """
+    digest = hashlib.sha256()
+    kept: Optional[List[bytes]] = [] if keep_contents else None
+    file_size = 0
+    temp_path = f"{file_path}.part"
+    
+    try:
+        with open(temp_path, "wb") as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                file_size += len(chunk)
+                if file_size > MAX_UPLOAD_SIZE:
+                    logger.warning(f"업로드 실패: 파일 크기 제한 초과 ({file.filename})")
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"파일 크기가 제한({MAX_UPLOAD_SIZE // (1024 * 1024)}MB)을 초과했습니다."
+                    )
+                
+                digest.update(chunk)
+                await run_in_threadpool(f.write, chunk)
+                if kept is not None:
+                    kept.append(chunk)
+        
+        os.replace(temp_path, file_path)
+    
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    return file_size, digest.hexdigest(), b"".join(kept) if kept is not None else None
+
+
+def _check_upload_extension(filename: str) -> str:
+    """허용된 업로드 파일 형식인지 확인 -> 소문자 확장자"""
     extension = os.path.splitext(filename)[1].lower()
     
     if extension not in ALLOWED_UPLOAD_EXTENSIONS:
@@ -562,23 +1623,45 @@ async def upload_document(
             detail=f"허용되지 않은 파일 형식입니다. 허용된 형식: {', '.join(ALLOWED_UPLOAD_EXTENSIONS)}"
         )
     
-    # 업로드 디렉터리 확인 및 생성
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    user_upload_dir = os.path.join(UPLOAD_DIR, f"user_{current_user.id}")
-    os.makedirs(user_upload_dir, exist_ok=True)
+    return extension
+
+
+def _upload_document_type(extension: str, document_type: Optional[str]) -> str:
+    """지정된 문서 유형 또는 파일 형식에 따라 추정한 문서 유형"""
+    if document_type:
+        return document_type
+    if extension in [".pdf", ".doc", ".docx"]:
+        return "PROPOSAL"
+    if extension in [".xls", ".xlsx", ".csv"]:
+        return "COST_ESTIMATE"
+    return "OTHER"
+
+
+async def _upload_document(
+    file: UploadFile,
+    title: Optional[str],
+    document_type: Optional[str],
+    description: Optional[str],
+    db: Session,
+    mongo_db: Database,
+    current_user: User
+) -> Dict[str, Any]:
+    """문서 파일 업로드 처리 (upload_document 참조)"""
+    # 파일 확장자 확인
+    filename = file.filename
+    extension = _check_upload_extension(filename)
     
-    # 중복 방지를 위한 고유 파일명 생성
-    unique_filename = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{filename}"
-    file_path = os.path.join(user_upload_dir, unique_filename)
+    blob_storage = get_blob_storage()
+    staging_path = blob_storage.staging_path()
+    is_text_file = extension in NEAR_DUPLICATE_CONFIG['text_extensions']
     
-    # 파일 저장
+    # 임시 경로에 저장 (청크 단위 스트리밍, 해시는 저장하면서 계산)
     try:
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        
-        file_size = len(contents)
-        logger.info(f"파일 업로드 성공: {file_path} (크기: {file_size}바이트)")
+        file_size, content_hash, contents = await _stream_upload_to_file(file, staging_path, keep_contents=is_text_file)
+        logger.info(f"파일 업로드 성공: {filename} (크기: {file_size}바이트, SHA-256: {content_hash})")
+    
+    except HTTPException:
+        raise
     
     except Exception as e:
         logger.error(f"파일 저장 중 오류 발생: {str(e)}")
@@ -587,48 +1670,87 @@ async def upload_document(
             detail="파일 저장 중 오류가 발생했습니다."
         )
     
-    # 문서 생성
-    doc_title = title or os.path.splitext(filename)[0]
-    doc_type = document_type or "OTHER"
+    # 텍스트 형식 파일은 본문 요약/서명/검색 색인에 사용
+    text_content = contents.decode("utf-8", errors="ignore") if is_text_file else None
     
-    # 파일 형식에 따른 문서 유형 추정
-    if not document_type:
-        if extension in [".pdf", ".doc", ".docx"]:
-            doc_type = "PROPOSAL"
-        elif extension in [".xls", ".xlsx", ".csv"]:
-            doc_type = "COST_ESTIMATE"
-    
-    db_document = Document(
-        title=doc_title,
-        description=description or f"업로드된 파일: {filename}",
-        document_type=doc_type,
-        file_path=file_path,
-        file_size=file_size,
-        file_format=extension[1:],  # 앞의 점(.) 제외
-        creator_id=current_user.id,
-        is_ai_generated=False,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+    return await _finalize_upload(
+        db, mongo_db, current_user, staging_path, filename, file_size, content_hash, text_content,
+        title, document_type, description
     )
+
+
+async def _finalize_upload(
+    db: Session,
+    mongo_db: Database,
+    current_user: User,
+    staging_path: str,
+    filename: str,
+    file_size: int,
+    content_hash: str,
+    text_content: Optional[str],
+    title: Optional[str],
+    document_type: Optional[str],
+    description: Optional[str]
+) -> Dict[str, Any]:
+    """
+    저장이 끝난 업로드 파일로 문서 생성 (단일 요청 업로드와 이어받기 업로드 공통)
     
-    db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
+    - 임시 파일을 콘텐츠 주소 저장소에 반영하고 Document 행 생성
+    - 블록체인 해시, 유사 문서 서명, 검색 색인 저장 후 텍스트 추출 작업 추가
+    - 압축 파일은 구성 파일마다 문서 생성 (_ingest_archive 참조)
+    """
+    blob_storage = get_blob_storage()
+    extension = os.path.splitext(filename)[1].lower()
     
-    logger.info(f"문서 생성: ID {db_document.id}, 제목: {doc_title}")
+    if extension in ARCHIVE_UPLOAD_CONFIG['extensions']:
+        return await _ingest_archive(
+            db, mongo_db, current_user, staging_path, filename, content_hash, title, document_type, description
+        )
+    
+    # 문서 생성
+    doc_title = title or os.path.splitext(filename)[0]
+    doc_type = _upload_document_type(extension, document_type)
     
-    # 블록체인에 해시 저장 (추후 검증용)
+    # 콘텐츠 주소 저장소에 반영 (같은 내용이 이미 있으면 참조 수만 증가) 후 문서와 함께 커밋
     try:
-        from core.security import BlockchainSecurity
-        with open(file_path, "rb") as f:
-            file_content = f.read()
+        file_path, deduplicated = blob_storage.store(db, staging_path, content_hash, file_size)
         
-        document_hash = BlockchainSecurity.hash_document(str(file_content))
+        db_document = Document(
+            title=doc_title,
+            description=description or f"업로드된 파일: {filename}",
+            document_type=doc_type,
+            file_path=file_path,
+            file_size=file_size,
+            file_format=extension[1:],  # 앞의 점(.) 제외
+            content_hash=content_hash,
+            summary=build_document_summary(text_content),
+            creator_id=current_user.id,
+            is_ai_generated=False,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
         
-        # 블록체인에 저장
+        db.add(db_document)
+        db.commit()
+        db.refresh(db_document)
+    
+    except Exception as e:
+        # 저장소로 옮긴 파일은 잠금이 풀리기 전에 삭제, 옮기기 전이면 임시 파일 삭제
+        blob_storage.rollback(db)
+        blob_storage.discard(staging_path)
+        logger.error(f"업로드 문서 저장 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="파일 저장 중 오류가 발생했습니다."
+        )
+    
+    logger.info(f"문서 생성: ID {db_document.id}, 제목: {doc_title}" + (" (중복 파일 재사용)" if deduplicated else ""))
+    
+    # 블록체인에 해시 저장 (추후 검증용, 업로드 중 계산한 원본 바이트 해시 사용)
+    try:
         blockchain_hash = BlockchainStorage.store_document_hash(
             db_document.id, 
-            document_hash,
+            content_hash,
             {
                 "document_type": doc_type,
                 "creator_id": current_user.id,
@@ -646,142 +1768,451 @@ async def upload_document(
     except Exception as e:
         logger.error(f"블록체인 저장 중 오류 발생: {str(e)}")
     
+    # 텍스트 형식 파일은 유사 문서 탐지용 MinHash 서명 저장 (서명 계산은 스레드 풀에서)
+    if text_content is not None:
+        try:
+            await run_in_threadpool(
+                NearDuplicateIndex(mongo_db).add,
+                db_document.id,
+                text_content,
+                source="upload",
+                creator_id=current_user.id
+            )
+        except Exception as e:
+            logger.error(f"문서 서명 저장 중 오류 발생: {str(e)}")
+    
+    await run_in_threadpool(_index_document, db_document.id, db_document.title, text_content, description=db_document.description)
+    
+    # 본문/섹션 추출은 백그라운드 작업자가 처리
+    _enqueue_extraction(mongo_db, [
+        {"document_id": db_document.id, "file_path": file_path, "file_format": db_document.file_format}
+    ])
+    
     return {
         "message": "파일 업로드 및 문서 생성이 완료되었습니다.",
         "document_id": db_document.id,
         "title": db_document.title,
-        "file_name": unique_filename,
+        "file_name": filename,
+        "deduplicated": deduplicated,
         "file_size": file_size,
-        "file_format": extension[1:]
+        "file_format": extension[1:],
+        "content_hash": content_hash
     }
 
 
-@router.get("/download/{document_id}", response_class=FileResponse)
-async def download_document(
-    document_id: int = Path(..., description="문서 ID"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-) -> FileResponse:
+async def _ingest_archive(
+    db: Session,
+    mongo_db: Database,
+    current_user: User,
+    staging_path: str,
+    filename: str,
+    content_hash: str,
+    title: Optional[str],
+    document_type: Optional[str],
+    description: Optional[str]
+) -> Dict[str, Any]:
     """
-    문서 파일 다운로드
+    압축 파일(RFP 패키지)의 구성 파일마다 문서 생성
     
-    - 업로드된 문서 파일만 다운로드 가능
+    - 구성 파일은 작업자 풀에서 병렬로 해제/해시 계산 후 콘텐츠 주소 저장소에 저장
+    - Document 행은 하나의 SQL 트랜잭션, 블록체인 해시는 한 번의 insert_many 로 저장
+    - 구성 파일 본문은 메모리에 올리지 않으며, 본문/요약/검색 색인/유사 문서 서명은 추출 작업자가 처리
+    - 압축 파일 자체는 저장하지 않음
     """
-    # 문서 조회
-    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    blob_storage = get_blob_storage()
+    package_title = title or os.path.splitext(filename)[0]
     
-    if not document:
-        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+    try:
+        members, skipped = await run_in_threadpool(
+            extract_archive, staging_path, blob_storage.staging_path
+        )
+    except ArchiveError as e:
+        logger.warning(f"압축 파일 처리 실패: {filename} ({str(e)})")
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서를 찾을 수 없습니다."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"압축 파일을 처리할 수 없습니다: {str(e)}"
         )
+    finally:
+        blob_storage.discard(staging_path)
     
-    # 파일 경로 확인
-    if not document.file_path or not os.path.exists(document.file_path):
-        logger.warning(f"문서 ID {document_id}의 파일을 찾을 수 없습니다.")
+    if not members:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="압축 파일에 업로드 가능한 파일이 없습니다."
+        )
+    
+    now = datetime.utcnow()
+    db_documents = []
+    deduplicated = []
+    
+    try:
+        for member in members:
+            file_path, is_duplicate = blob_storage.store(
+                db, member["staging_path"], member["content_hash"], member["file_size"]
+            )
+            deduplicated.append(is_duplicate)
+            db_documents.append(Document(
+                title=f"{package_title} - {os.path.splitext(member['filename'])[0]}",
+                description=description or f"{filename} 압축 파일의 {member['name']}",
+                document_type=_upload_document_type(member["extension"], document_type),
+                file_path=file_path,
+                file_size=member["file_size"],
+                file_format=member["extension"][1:],
+                content_hash=member["content_hash"],
+                tags=[package_title],
+                creator_id=current_user.id,
+                is_ai_generated=False,
+                created_at=now,
+                updated_at=now
+            ))
+        
+        db.add_all(db_documents)
+        db.flush()
+        
+        # 커밋 후 행마다 다시 조회하지 않도록 응답/후속 저장에 필요한 값을 미리 보관
+        created = [
+            {
+                "document_id": db_document.id,
+                "title": db_document.title,
+                "description": db_document.description,
+                "document_type": db_document.document_type,
+                "file_format": db_document.file_format,
+                "file_path": db_document.file_path,
+                "tags": db_document.tags
+            }
+            for db_document in db_documents
+        ]
+        db.commit()
+    
+    except Exception as e:
+        blob_storage.rollback(db)
+        for member in members:
+            blob_storage.discard(member["staging_path"])
+        logger.error(f"압축 파일 문서 저장 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="파일 저장 중 오류가 발생했습니다."
+        )
+    
+    logger.info(f"압축 파일 문서 생성: {filename} (문서 {len(created)}개, 중복 파일 {sum(deduplicated)}개)")
+    
+    # 블록체인에 해시 일괄 저장
+    try:
+        blockchain_hashes = BlockchainStorage.store_document_hashes([
+            {
+                "document_id": document["document_id"],
+                "document_hash": member["content_hash"],
+                "metadata": {
+                    "document_type": document["document_type"],
+                    "creator_id": current_user.id,
+                    "filename": member["name"],
+                    "package": filename,
+                    "timestamp": now.isoformat()
+                }
+            }
+            for document, member in zip(created, members)
+        ])
+        for db_document, blockchain_hash in zip(db_documents, blockchain_hashes):
+            db_document.blockchain_hash = blockchain_hash
+        db.commit()
+    
+    except Exception as e:
+        db.rollback()
+        logger.error(f"블록체인 저장 중 오류 발생: {str(e)}")
+    
+    # 제목/설명/태그만 먼저 색인 (본문은 추출 작업자가 추출 후 색인)
+    for document in created:
+        await run_in_threadpool(_index_document, document["document_id"], document["title"], None, document["tags"], document["description"])
+    
+    _enqueue_extraction(mongo_db, created)
+    
+    return {
+        "message": f"압축 파일에서 문서 {len(created)}개가 생성되었습니다.",
+        "package": filename,
+        "content_hash": content_hash,
+        "documents": [
+            {
+                "document_id": document["document_id"],
+                "title": document["title"],
+                "file_name": member["name"],
+                "deduplicated": is_duplicate,
+                "file_size": member["file_size"],
+                "file_format": document["file_format"],
+                "content_hash": member["content_hash"]
+            }
+            for document, member, is_duplicate in zip(created, members, deduplicated)
+        ],
+        "skipped": skipped
+    }
+
+
+def _get_upload_session(store: UploadSessionStore, upload_id: str, current_user: User) -> Dict[str, Any]:
+    record = store.get(upload_id, current_user.id)
+    if not record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="문서 파일을 찾을 수 없습니다."
+            detail="업로드 세션을 찾을 수 없습니다."
         )
+    return record
+
+
+@router.post("/uploads", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    request: UploadSessionCreate,
+    http_request: Request,
+    response: Response,
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """
+    이어받기(청크) 업로드 세션 생성
     
-    logger.info(f"문서 다운로드: ID {document_id}")
+    - 단일 요청 업로드 제한보다 큰 파일용 (최대 RESUMABLE_UPLOAD_CONFIG['max_size'])
+    - 이후 PATCH /uploads/{upload_id} 로 Upload-Offset 헤더와 함께 청크 전송 (순서 무관, 병렬 가능)
+    - 모든 구간을 받은 뒤 POST /uploads/{upload_id}/complete 로 문서 생성
+    """
+    _check_upload_extension(request.filename)
     
-    # 파일 다운로드 응답
-    filename = os.path.basename(document.file_path)
-    return FileResponse(
-        path=document.file_path,
-        filename=filename,
-        media_type="application/octet-stream"
+    if request.total_size > RESUMABLE_UPLOAD_CONFIG['max_size']:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"파일 크기가 제한({RESUMABLE_UPLOAD_CONFIG['max_size'] // (1024 * 1024)}MB)을 초과했습니다."
+        )
+    
+    record = await run_in_threadpool(
+        UploadSessionStore(mongo_db).create,
+        current_user.id, request.filename, request.total_size,
+        {"title": request.title, "document_type": request.document_type, "description": request.description}
     )
+    
+    response.headers["Location"] = f"{http_request.url.path.rstrip('/')}/{record['_id']}"
+    return {
+        **UploadSessionStore.to_status(record),
+        "chunk_size": RESUMABLE_UPLOAD_CONFIG['chunk_size'],
+        "max_chunk_size": RESUMABLE_UPLOAD_CONFIG['max_chunk_size']
+    }
 
 
-@router.get("/templates", response_model=List[Dict[str, Any]])
-async def get_document_templates(
-    document_type: Optional[str] = Query(None, description="문서 유형별 필터링"),
-    db: Session = Depends(get_db),
+@router.get("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def get_upload_session(
+    response: Response,
+    upload_id: str = Path(..., description="업로드 세션 ID"),
+    mongo_db: Database = Depends(get_mongo_db),
     current_user: User = Depends(get_current_active_user)
-) -> List[Dict[str, Any]]:
+) -> Dict[str, Any]:
     """
-    문서 템플릿 목록 조회
+    업로드 세션 진행 상황 조회
     
-    - 문서 유형별 필터링 지원
+    - offset: 처음부터 빠짐없이 받은 바이트 수 (Upload-Offset 헤더에도 포함)
+    - received_ranges: 받은 구간 목록 (병렬 업로드 시 누락 구간 확인용)
+    """
+    record = _get_upload_session(UploadSessionStore(mongo_db), upload_id, current_user)
+    session_status = UploadSessionStore.to_status(record)
+    response.headers["Upload-Offset"] = str(session_status["offset"])
+    return session_status
+
+
+@router.patch("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def upload_chunk(
+    http_request: Request,
+    response: Response,
+    upload_id: str = Path(..., description="업로드 세션 ID"),
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0, description="청크 시작 위치 (바이트)"),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
     """
-    # 쿼리 설정
-    query = db.query(DocumentTemplate)
+    청크 업로드 (요청 본문이 Upload-Offset 위치부터의 파일 내용)
     
-    # 필터 적용
-    if document_type:
-        query = query.filter(DocumentTemplate.template_type == document_type)
+    - 실패한 청크는 같은 오프셋으로 다시 전송
+    """
+    store = UploadSessionStore(mongo_db)
+    record = _get_upload_session(store, upload_id, current_user)
     
-    templates = query.all()
+    if record["status"] != "uploading":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 완료 처리된 업로드 세션입니다."
+        )
     
-    # 결과 목록
-    result = []
-    
-    for template in templates:
-        result.append({
-            "id": template.id,
-            "name": template.name,
-            "description": template.description,
-            "template_type": template.template_type,
-            "content_structure": template.content_structure,
-            "required_fields": template.required_fields,
-            "usage_count": template.usage_count,
-            "creator_id": template.creator_id
-        })
+    # 본문을 받으면서 청크/파일 크기 제한 확인
+    limit = min(RESUMABLE_UPLOAD_CONFIG['max_chunk_size'], record["total_size"] - upload_offset)
+    if limit <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload-Offset 이 파일 크기를 벗어났습니다."
+        )
     
-    logger.info(f"템플릿 목록 조회: {len(result)}개 결과")
-    return result
+    data = bytearray()
+    async for chunk in http_request.stream():
+        data.extend(chunk)
+        if len(data) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="청크가 최대 크기 또는 남은 파일 크기를 초과했습니다."
+            )
+    
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="청크 내용이 비어 있습니다."
+        )
+    
+    try:
+        record = await run_in_threadpool(store.write_chunk, record, upload_offset, bytes(data))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 완료 처리된 업로드 세션입니다."
+        )
+    except Exception as e:
+        logger.error(f"청크 저장 중 오류 발생: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="청크 저장 중 오류가 발생했습니다."
+        )
+    
+    session_status = UploadSessionStore.to_status(record)
+    response.headers["Upload-Offset"] = str(session_status["offset"])
+    return session_status
 
 
-@router.post("/templates", response_model=Dict[str, Any])
-async def create_document_template(
-    name: str = Body(...),
-    description: str = Body(None),
-    template_type: str = Body(...),
-    content_structure: Dict[str, Any] = Body(...),
-    required_fields: Optional[Dict[str, Any]] = Body(None),
+@router.post("/uploads/{upload_id}/complete", response_model=Dict[str, Any])
+async def complete_upload_session(
+    upload_id: str = Path(..., description="업로드 세션 ID"),
     db: Session = Depends(get_db),
+    mongo_db: Database = Depends(get_mongo_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Dict[str, Any]:
     """
-    문서 템플릿 생성
+    업로드 완료 및 문서 생성
     
-    - 템플릿 이름, 유형, 구조 필요
+    - 모든 구간을 받아야 완료 가능 (누락 구간이 있으면 409)
+    - 이미 완료된 세션은 같은 결과 반환
+    - 완료 처리가 실패해도 세션 임시 파일은 유지되므로 다시 요청 가능 (파일이 손상된 경우에만 410)
     """
-    # 템플릿 중복 확인
-    existing_template = db.query(DocumentTemplate).filter(
-        DocumentTemplate.name == name,
-        DocumentTemplate.template_type == template_type
-    ).first()
+    store = UploadSessionStore(mongo_db)
+    record = _get_upload_session(store, upload_id, current_user)
     
-    if existing_template:
-        logger.warning(f"템플릿 생성 실패: 템플릿 이름 중복 ({name})")
+    if record["status"] == "completed":
+        return record["result"]
+    
+    if record["status"] == "failed":
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="같은 이름과 유형의 템플릿이 이미 존재합니다."
+            status_code=status.HTTP_410_GONE,
+            detail="업로드 세션을 복구할 수 없습니다. 새 세션으로 다시 업로드해 주세요."
         )
     
-    # 템플릿 생성
-    db_template = DocumentTemplate(
-        name=name,
-        description=description,
-        template_type=template_type,
-        content_structure=content_structure,
-        required_fields=required_fields,
-        usage_count=0,
-        creator_id=current_user.id
-    )
+    if not UploadSessionStore.is_complete(record):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"아직 받지 않은 구간이 있습니다 (받은 크기: {UploadSessionStore.received_bytes(record)}/{record['total_size']}바이트)."
+        )
     
-    db.add(db_template)
-    db.commit()
-    db.refresh(db_template)
+    if not store.begin_finalize(record):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="업로드 완료 처리 또는 청크 기록이 진행 중입니다. 잠시 후 다시 시도하세요."
+        )
     
-    logger.info(f"템플릿 생성: ID {db_template.id}, 이름: {name}")
+    finalize_path = None
+    try:
+        content_hash = await run_in_threadpool(store.finish_hash, record)
+        filename = record["filename"]
+        metadata = record.get("metadata", {})
+        
+        # 텍스트 형식 파일은 본문 요약/서명/검색 색인에 사용 (단일 요청 업로드 제한 이내 크기만)
+        text_content = None
+        if os.path.splitext(filename)[1].lower() in NEAR_DUPLICATE_CONFIG['text_extensions'] \
+                and record["total_size"] <= MAX_UPLOAD_SIZE:
+            with open(record["staging_path"], "rb") as f:
+                text_content = f.read().decode("utf-8", errors="ignore")
+        
+        # 문서 생성은 세션 파일의 복사본을 소비하므로 실패해도 세션 파일은 그대로 남음
+        finalize_path = await run_in_threadpool(store.finalize_path, record)
+        result = await _finalize_upload(
+            db, mongo_db, current_user, finalize_path, filename, record["total_size"], content_hash,
+            text_content, metadata.get("title"), metadata.get("document_type"), metadata.get("description")
+        )
+    
+    except BaseException as e:
+        # 파일 저장소로 옮겨지기 전에 실패한 경우의 복사본 정리 (세션 파일은 유지)
+        get_blob_storage().discard(finalize_path)
+        new_status = store.abort_finalize(record, str(e))
+        logger.warning(f"이어받기 업로드 완료 처리 실패: {upload_id} (상태: {new_status})")
+        raise
+    
+    store.complete(record, result)
+    logger.info(f"이어받기 업로드 완료: {upload_id} ({record['filename']})")
+    return result
+
+
+@router.delete("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def delete_upload_session(
+    upload_id: str = Path(..., description="업로드 세션 ID"),
+    mongo_db: Database = Depends(get_mongo_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """업로드 세션 취소 (받은 임시 파일 삭제)"""
+    store = UploadSessionStore(mongo_db)
+    record = _get_upload_session(store, upload_id, current_user)
     
+    if record["status"] == "finalizing":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="업로드 완료 처리가 진행 중입니다."
+        )
+    
+    await run_in_threadpool(store.delete, record)
     return {
-        "message": "템플릿이 성공적으로 생성되었습니다.",
-        "template_id": db_template.id,
-        "name": db_template.name
+        "message": "업로드 세션이 삭제되었습니다.",
+        "upload_id": upload_id
     }
+
+
+@router.get("/download/{document_id}", response_class=FileResponse)
+async def download_document(
+    request: Request,
+    document_id: int = Path(..., description="문서 ID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """
+    문서 파일 다운로드
+    
+    - 업로드된 문서 파일만 다운로드 가능
+    - ETag(콘텐츠 해시)/Last-Modified 조건부 요청은 304, Range 요청은 206 부분 응답
+    """
+    # 문서 조회
+    document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+    
+    if not document:
+        logger.warning(f"문서 ID {document_id}을 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서를 찾을 수 없습니다."
+        )
+    
+    # 파일 경로 확인
+    if not document.file_path or not os.path.exists(document.file_path):
+        logger.warning(f"문서 ID {document_id}의 파일을 찾을 수 없습니다.")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="문서 파일을 찾을 수 없습니다."
+        )
+    
+    logger.info(f"문서 다운로드: ID {document_id}")
+    
+    # 파일 다운로드 응답
+    # 콘텐츠 주소 저장소 파일은 경로가 해시이므로 제목과 형식으로 파일명 구성
+    if document.content_hash and document.file_format:
+        filename = f"{document.title}.{document.file_format}"
+    else:
+        filename = os.path.basename(document.file_path)
+    return build_file_response(
+        request,
+        document.file_path,
+        filename,
+        media_type="application/octet-stream",
+        content_hash=document.content_hash
+    )
@@ -68,6 +68,15 @@ MODEL_CONFIG = {
         "path": os.getenv("TRANSFORMER_MODEL_PATH", "models/transformer"),
         "batch_size": int(os.getenv("TRANSFORMER_BATCH_SIZE", "32")),
         "learning_rate": float(os.getenv("TRANSFORMER_LEARNING_RATE", "5e-5")),
+        # 추론 백엔드: pytorch (FP32), int8 (동적 양자화), onnx (ONNX Runtime)
+        "backend": os.getenv("TRANSFORMER_BACKEND", "pytorch"),
+        # ONNX 변환 결과 저장 위치 (최초 한 번 변환 후 재사용)
+        "onnx_dir": os.getenv("TRANSFORMER_ONNX_DIR", os.path.join(BASE_DIR, "models", "onnx")),
+        # 시작 시 생성기를 미리 초기화 (모델 로드와 품질 검증을 첫 요청 전에 완료)
+        "preload": os.getenv("TRANSFORMER_PRELOAD", "False").lower() == "true",
+        "quality_check": os.getenv("TRANSFORMER_QUALITY_CHECK", "False").lower() == "true",
+        "quality_min_token_agreement": float(os.getenv("TRANSFORMER_QUALITY_MIN_TOKEN_AGREEMENT", "0.6")),
+        "quality_max_perplexity_ratio": float(os.getenv("TRANSFORMER_QUALITY_MAX_PERPLEXITY_RATIO", "1.15")),
     },
     "prediction": {
         "path": os.getenv("PREDICTION_MODEL_PATH", "models/prediction"),
@@ -75,6 +84,106 @@ MODEL_CONFIG = {
     }
 }
 
+# 문서 생성 설정
+DOCUMENT_GENERATION_CONFIG = {
+    "template_repository": {
+        # DB 템플릿 변경 여부를 다른 프로세스와 동기화하기 위한 확인 주기(초)
+        "db_refresh_interval": float(os.getenv("TEMPLATE_DB_REFRESH_INTERVAL", "5")),
+        # 템플릿 디렉터리 변경(파일 추가/수정/삭제) 확인 주기(초)
+        "file_refresh_interval": float(os.getenv("TEMPLATE_FILE_REFRESH_INTERVAL", "5")),
+    },
+    "render_cache": {
+        "enabled": os.getenv("RENDER_CACHE_ENABLED", "True").lower() == "true",
+        "max_entries": int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "1024")),
+        # 설정 시 메모리에서 밀려난 결과도 디스크에서 재사용
+        "disk_dir": os.getenv("RENDER_CACHE_DIR") or None,
+    },
+    "section_cache": {
+        "enabled": os.getenv("SECTION_CACHE_ENABLED", "True").lower() == "true",
+        "max_entries": int(os.getenv("SECTION_CACHE_MAX_ENTRIES", "4096")),
+        "disk_dir": os.getenv("SECTION_CACHE_DIR") or None,
+    },
+    "stopping": {
+        "repetition_ngram_size": int(os.getenv("GENERATION_REPETITION_NGRAM_SIZE", "6")),
+        "diversity_window": int(os.getenv("GENERATION_DIVERSITY_WINDOW", "64")),
+        "min_diversity": float(os.getenv("GENERATION_MIN_DIVERSITY", "0.2")),
+        "check_interval": int(os.getenv("GENERATION_STOP_CHECK_INTERVAL", "4")),
+    },
+    "speculative": {
+        # 초안 모델 (비어 있으면 추측 디코딩 비활성화, 예: distilgpt2)
+        "draft_model": os.getenv("SPECULATIVE_DRAFT_MODEL", ""),
+        "num_draft_tokens": int(os.getenv("SPECULATIVE_NUM_DRAFT_TOKENS", "4")),
+        # 추측 디코딩을 적용할 장문 섹션
+        "sections": os.getenv("SPECULATIVE_SECTIONS", "제안 내용,기술적 접근").split(","),
+    },
+    "retrieval": {
+        "enabled": os.getenv("RETRIEVAL_ENABLED", "True").lower() == "true",
+        "index_dir": os.getenv("RETRIEVAL_INDEX_DIR", os.path.join(BASE_DIR, "indexes", "retrieval")),
+        "embedding_model": os.getenv("RETRIEVAL_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2"),
+        "past_bids_path": os.getenv("RETRIEVAL_PAST_BIDS_PATH", os.path.join(BASE_DIR.parent, "src", "data", "pastBids.json")),
+        "top_k": int(os.getenv("RETRIEVAL_TOP_K", "3")),
+        "snippet_chars": int(os.getenv("RETRIEVAL_SNIPPET_CHARS", "300")),
+        # exact (전체 행렬 내적), ivf / hnsw (faiss 필요), auto (코퍼스 크기에 따라 선택)
+        "index_mode": os.getenv("RETRIEVAL_INDEX_MODE", "auto"),
+        "ann_threshold": int(os.getenv("RETRIEVAL_ANN_THRESHOLD", "100000")),
+        "ivf_nlist": int(os.getenv("RETRIEVAL_IVF_NLIST", "256")),
+        "ivf_nprobe": int(os.getenv("RETRIEVAL_IVF_NPROBE", "16")),
+        "hnsw_m": int(os.getenv("RETRIEVAL_HNSW_M", "32")),
+        # 다른 프로세스가 재구축한 인덱스 버전 확인 주기(초)
+        "reload_interval": float(os.getenv("RETRIEVAL_RELOAD_INTERVAL", "30")),
+        # 유지할 인덱스 버전 수 (이전 버전을 열고 있는 프로세스를 위해 2 이상 권장)
+        "keep_versions": int(os.getenv("RETRIEVAL_KEEP_VERSIONS", "2")),
+    },
+    "context_compression": {
+        "enabled": os.getenv("CONTEXT_COMPRESSION_ENABLED", "True").lower() == "true",
+        # 섹션 프롬프트에 포함할 컨텍스트의 최대 토큰 수 (GPT-2 창 1024 토큰 중)
+        "token_budget": int(os.getenv("CONTEXT_TOKEN_BUDGET", "384")),
+        # 입찰 설명 요약에 할당하는 최대 토큰 수
+        "description_tokens": int(os.getenv("CONTEXT_DESCRIPTION_TOKENS", "192")),
+        # 콘텐츠 요구사항 항목별 최대 글자 수
+        "requirement_chars": int(os.getenv("CONTEXT_REQUIREMENT_CHARS", "200")),
+        "max_entries": int(os.getenv("TENDER_SUMMARY_CACHE_MAX_ENTRIES", "1024")),
+        "disk_dir": os.getenv("TENDER_SUMMARY_CACHE_DIR") or None,
+    },
+    "routing": {
+        # 지연 시간 목표를 만족하는 생성기 중 앞쪽을 우선 선택
+        "preference": os.getenv("GENERATOR_ROUTING_PREFERENCE", "hybrid,transformer,template").split(","),
+        # 생성기별 동시 실행 한도 (초과 시 포화 상태로 간주)
+        "max_concurrency": {
+            "transformer": int(os.getenv("TRANSFORMER_MAX_CONCURRENCY", "2")),
+            "hybrid": int(os.getenv("HYBRID_MAX_CONCURRENCY", "2")),
+            "template": int(os.getenv("TEMPLATE_MAX_CONCURRENCY", "64")),
+        },
+        # 측정값이 없을 때 사용하는 예상 지연 시간(ms)
+        "default_latency_ms": {
+            "transformer": 30000.0,
+            "hybrid": 15000.0,
+            "template": 50.0,
+        },
+        "window": int(os.getenv("GENERATOR_LATENCY_WINDOW", "50")),
+        "min_samples": int(os.getenv("GENERATOR_LATENCY_MIN_SAMPLES", "5")),
+        "percentile": float(os.getenv("GENERATOR_LATENCY_PERCENTILE", "90")),
+    },
+    "bulk": {
+        # 일괄 렌더링 요청당 최대 입찰 수
+        "max_tenders": int(os.getenv("BULK_GENERATION_MAX_TENDERS", "1000")),
+        # 렌더링 및 저장 배치 크기 (배치마다 insert_many 한 번, SQL 커밋 한 번)
+        "batch_size": int(os.getenv("BULK_GENERATION_BATCH_SIZE", "100")),
+        "workers": int(os.getenv("BULK_GENERATION_WORKERS", "4")),
+    },
+    "cancellation": {
+        # 생성 중 클라이언트 연결 종료 확인 주기(초)
+        "disconnect_poll_interval": float(os.getenv("GENERATION_DISCONNECT_POLL_INTERVAL", "0.5")),
+    },
+    "checkpoint": {
+        "enabled": os.getenv("GENERATION_CHECKPOINT_ENABLED", "True").lower() == "true",
+        # 완료/실패한 작업 기록 보관 시간(초)
+        "ttl_seconds": int(os.getenv("GENERATION_CHECKPOINT_TTL_SECONDS", "604800")),
+        # 실행 중 작업의 유효 시간(초) - 섹션 저장 시 연장되며, 지나면 중단된 작업으로 보고 다른 요청이 이어받음
+        "lease_seconds": int(os.getenv("GENERATION_CHECKPOINT_LEASE_SECONDS", "600")),
+    },
+}
+
 # 로깅 설정
 LOGGING_CONFIG = {
     "version": 1,
@@ -131,8 +240,77 @@ KAFKA_CONFIG = {
 
 # 파일 업로드 설정
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
-ALLOWED_UPLOAD_EXTENSIONS = [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".csv", ".txt", ".json"]
+ALLOWED_UPLOAD_EXTENSIONS = [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".csv", ".txt", ".json", ".zip"]
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 업로드 스트리밍 청크 (1MB)
+# 이어받기(청크) 업로드 설정 - 단일 요청 업로드 제한(MAX_UPLOAD_SIZE)보다 큰 파일용
+RESUMABLE_UPLOAD_CONFIG = {
+    "max_size": int(os.getenv("RESUMABLE_UPLOAD_MAX_SIZE", str(2 * 1024 * 1024 * 1024))),  # 2GB
+    "max_chunk_size": int(os.getenv("RESUMABLE_UPLOAD_MAX_CHUNK_SIZE", str(64 * 1024 * 1024))),  # 64MB
+    # 권장 청크 크기 (세션 생성 응답에 포함)
+    "chunk_size": int(os.getenv("RESUMABLE_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024))),  # 8MB
+    # 마지막 청크 이후 세션 보관 시간(초) - 지나면 임시 파일과 함께 삭제
+    "session_ttl_seconds": int(os.getenv("RESUMABLE_UPLOAD_SESSION_TTL", "86400")),
+    # 청크 기록 예약 유효 시간(초) - 기록 중 프로세스가 중단되어도 이 시간이 지나면 완료 처리 가능
+    "write_lease_seconds": int(os.getenv("RESUMABLE_UPLOAD_WRITE_LEASE", "300")),
+}
+# 압축 파일(RFP 패키지) 업로드 설정 - 구성 파일마다 문서 생성
+ARCHIVE_UPLOAD_CONFIG = {
+    "extensions": [".zip"],
+    "max_members": int(os.getenv("ARCHIVE_MAX_MEMBERS", "200")),
+    # 압축 해제 후 전체 크기 제한 (압축 폭탄 방지)
+    "max_total_size": int(os.getenv("ARCHIVE_MAX_TOTAL_SIZE", str(4 * 1024 * 1024 * 1024))),  # 4GB
+    "workers": int(os.getenv("ARCHIVE_EXTRACT_WORKERS", "4")),
+}
+
+# 업로드 문서 텍스트 추출 설정 (백그라운드 작업 큐 + 프로세스 풀)
+EXTRACTION_CONFIG = {
+    "enabled": os.getenv("EXTRACTION_ENABLED", "True").lower() == "true",
+    "workers": int(os.getenv("EXTRACTION_WORKERS", "2")),
+    # 대기 작업이 없을 때 큐 확인 주기(초)
+    "poll_interval": float(os.getenv("EXTRACTION_POLL_INTERVAL", "2.0")),
+    # 파일 하나의 추출 제한 시간(초) - 작업 점유 시간(lease_seconds)보다 짧아야 함
+    "timeout_seconds": float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "300")),
+    "lease_seconds": int(os.getenv("EXTRACTION_LEASE_SECONDS", "600")),
+    "max_attempts": int(os.getenv("EXTRACTION_MAX_ATTEMPTS", "3")),
+    # Document.content 에 저장하는 최대 문자 수
+    "max_chars": int(os.getenv("EXTRACTION_MAX_CHARS", "2000000")),
+    # 시작 시 본문이 없는 기존 업로드 문서를 큐에 추가
+    "backfill_on_startup": os.getenv("EXTRACTION_BACKFILL_ON_STARTUP", "True").lower() == "true",
+}
+
+# 업로드 파일은 SHA-256 기준 콘텐츠 주소 경로({root}/ab/cd/{hash})에 한 번만 저장
+BLOB_STORAGE_CONFIG = {
+    "root": os.getenv("BLOB_STORAGE_ROOT", os.path.join(UPLOAD_DIR, "blobs")),
+    "shard_depth": int(os.getenv("BLOB_STORAGE_SHARD_DEPTH", "2")),
+}
+
+# 유사 문서 탐지 설정 (MinHash/LSH)
+NEAR_DUPLICATE_CONFIG = {
+    "num_perm": int(os.getenv("MINHASH_NUM_PERM", "128")),
+    "bands": int(os.getenv("MINHASH_LSH_BANDS", "32")),
+    "shingle_size": int(os.getenv("MINHASH_SHINGLE_SIZE", "5")),
+    "threshold": float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8")),
+    # 생성 전 확인 시 기존 문서를 제안하는 요청 유사도 기준
+    "reuse_threshold": float(os.getenv("NEAR_DUPLICATE_REUSE_THRESHOLD", "0.9")),
+    "max_candidates": int(os.getenv("NEAR_DUPLICATE_MAX_CANDIDATES", "1000")),
+    # 텍스트로 읽어 서명을 계산하는 업로드 형식
+    "text_extensions": [".txt", ".csv", ".json"],
+}
+
+# 문서 전문 검색 설정 (인메모리 역색인, BM25)
+SEARCH_CONFIG = {
+    "enabled": os.getenv("SEARCH_INDEX_ENABLED", "True").lower() == "true",
+    # 다른 프로세스의 문서 변경 여부 확인 주기(초)
+    "refresh_interval": float(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", "5")),
+    # 한 검색어로 페이지를 넘기며 조회할 수 있는 최대 결과 수 (점수 상위 N건)
+    "max_results": int(os.getenv("SEARCH_MAX_RESULTS", "1000")),
+    "bm25_k1": float(os.getenv("SEARCH_BM25_K1", "1.2")),
+    "bm25_b": float(os.getenv("SEARCH_BM25_B", "0.75")),
+    # 제목/태그 용어 가중치 (본문 대비)
+    "title_weight": float(os.getenv("SEARCH_TITLE_WEIGHT", "3.0")),
+    "tag_weight": float(os.getenv("SEARCH_TAG_WEIGHT", "2.0")),
+}
 
 # NLP 설정
 NLP_CONFIG = {
@@ -150,3 +328,14 @@ SECURITY_CONFIG = {
     "max_login_attempts": int(os.getenv("MAX_LOGIN_ATTEMPTS", "5")),
     "lockout_time_minutes": int(os.getenv("LOCKOUT_TIME_MINUTES", "30")),
 }
+
+# 멱등성 키 설정 (Idempotency-Key 헤더)
+IDEMPOTENCY_CONFIG = {
+    # 완료된 요청의 결과를 보관하는 시간(초)
+    "ttl_seconds": int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+    # 처리 중 기록의 유효 시간(초) - 처리하던 프로세스가 중단되면 이후 다른 요청이 이어받음
+    "lease_seconds": int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "900")),
+    # 다른 프로세스에서 처리 중인 같은 요청의 완료를 기다리는 최대 시간(초)
+    "wait_timeout": float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "600")),
+    "poll_interval": float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.5")),
+}
@@ -0,0 +1,134 @@
+"""
+압축 파일 모듈 - ZIP 형식 RFP 패키지의 구성 파일을 작업자 풀에서 병렬로 풀어 저장합니다.
+
+- 압축 파일 전체를 메모리에 올리지 않고 구성 파일별로 청크 단위 스트리밍 해제합니다.
+- 각 구성 파일은 파일 저장소 임시 경로에 기록하면서 SHA-256 을 계산합니다.
+- 구성 파일 본문은 메모리에 보관하지 않으며, 본문/요약/서명은 추출 작업자가 저장된 파일에서 처리합니다.
+"""
+
+import os
+import hashlib
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import ALLOWED_UPLOAD_EXTENSIONS, ARCHIVE_UPLOAD_CONFIG, UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# ZIP 일반 목적 플래그
+_FLAG_ENCRYPTED = 0x1
+_FLAG_UTF8 = 0x800
+
+
+class ArchiveError(ValueError):
+    """읽을 수 없거나 제한을 넘는 압축 파일"""
+
+
+def _member_filename(info: zipfile.ZipInfo) -> str:
+    """구성 파일 이름 (UTF-8 플래그가 없는 한국어 압축 파일은 CP949 로 해석)"""
+    name = info.filename
+    if not info.flag_bits & _FLAG_UTF8:
+        try:
+            name = name.encode("cp437").decode("cp949")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+    return name
+
+
+def _plan_members(archive: zipfile.ZipFile) -> Tuple[List[Tuple[zipfile.ZipInfo, str]], List[Dict[str, Any]]]:
+    """해제할 구성 파일과 건너뛸 파일 분류 (개수/크기 제한 확인)"""
+    members = []
+    skipped = []
+    total_size = 0
+
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+
+        name = _member_filename(info)
+        basename = os.path.basename(name)
+        extension = os.path.splitext(basename)[1].lower()
+
+        if not basename or basename.startswith(".") or name.startswith("__MACOSX/"):
+            continue
+        if info.flag_bits & _FLAG_ENCRYPTED:
+            skipped.append({"name": name, "reason": "암호화된 파일"})
+            continue
+        if extension not in ALLOWED_UPLOAD_EXTENSIONS or extension in ARCHIVE_UPLOAD_CONFIG['extensions']:
+            skipped.append({"name": name, "reason": f"허용되지 않은 파일 형식 ({extension})"})
+            continue
+
+        total_size += info.file_size
+        members.append((info, name))
+
+    if len(members) > ARCHIVE_UPLOAD_CONFIG['max_members']:
+        raise ArchiveError(f"압축 파일의 구성 파일 수({len(members)})가 제한({ARCHIVE_UPLOAD_CONFIG['max_members']})을 초과했습니다")
+    if total_size > ARCHIVE_UPLOAD_CONFIG['max_total_size']:
+        raise ArchiveError("압축 해제 후 크기가 제한을 초과했습니다")
+
+    return members, skipped
+
+
+def _extract_member(archive_path: str, info: zipfile.ZipInfo, name: str, staging_path: str) -> Dict[str, Any]:
+    """구성 파일 하나를 임시 경로에 풀면서 해시 계산 (작업자마다 압축 파일을 따로 열어 병렬 읽기)"""
+    digest = hashlib.sha256()
+    size = 0
+
+    with zipfile.ZipFile(archive_path) as archive, archive.open(info) as source, open(staging_path, "wb") as target:
+        while True:
+            chunk = source.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > info.file_size:
+                # 헤더에 기록된 크기보다 큰 내용 (변조된 압축 파일)
+                raise ArchiveError(f"구성 파일 크기가 헤더와 다릅니다: {name}")
+            digest.update(chunk)
+            target.write(chunk)
+
+    return {
+        "name": name,
+        "filename": os.path.basename(name),
+        "extension": os.path.splitext(name)[1].lower(),
+        "file_size": size,
+        "content_hash": digest.hexdigest(),
+        "staging_path": staging_path
+    }
+
+
+def extract_archive(archive_path: str, staging_path_factory: Callable[[], str],
+                    workers: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    압축 파일의 구성 파일을 작업자 풀에서 병렬로 해제 -> (해제된 파일 목록, 건너뛴 파일 목록)
+
+    - 해제된 파일은 압축 파일 내 순서를 유지하며, 임시 파일은 호출자가 저장소로 옮기거나 삭제
+    - 하나라도 실패하면 이미 해제한 임시 파일을 삭제하고 예외 발생
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members, skipped = _plan_members(archive)
+    except zipfile.BadZipFile as e:
+        raise ArchiveError(f"올바른 ZIP 파일이 아닙니다: {str(e)}")
+
+    staging_paths = [staging_path_factory() for _ in members]
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers or ARCHIVE_UPLOAD_CONFIG['workers']) as executor:
+            futures = [
+                executor.submit(_extract_member, archive_path, info, name, staging_path)
+                for (info, name), staging_path in zip(members, staging_paths)
+            ]
+            extracted = [future.result() for future in futures]
+
+    except BaseException as e:
+        for staging_path in staging_paths:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+        if isinstance(e, (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError)):
+            raise ArchiveError(f"압축 해제 중 오류가 발생했습니다: {str(e)}")
+        raise
+
+    logger.info(f"압축 파일 해제 완료: {archive_path} (파일 {len(extracted)}개, 건너뜀 {len(skipped)}개)")
+    return extracted, skipped
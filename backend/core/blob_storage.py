@@ -0,0 +1,146 @@
+"""
+파일 저장소 모듈 - 업로드 파일을 SHA-256 기준 콘텐츠 주소 경로에 저장하고 참조 수로 중복을 제거합니다.
+
+- 같은 내용의 파일은 한 번만 저장되며, 중복 업로드는 참조 수만 증가시킵니다.
+- 참조 수는 file_blobs 테이블에서 문서 저장과 같은 트랜잭션으로 관리합니다.
+- 참조 수가 0 이 되어도 행은 남겨 두고(tombstone), 파일 삭제는 collect 가 행을 잠근 상태에서
+  참조 수를 다시 확인한 뒤 수행하므로 같은 내용의 동시 업로드와 경쟁하지 않습니다.
+"""
+
+import os
+import uuid
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import BLOB_STORAGE_CONFIG
+from models.document import FileBlob
+
+logger = logging.getLogger(__name__)
+
+# 저장소로 새로 옮긴 파일 경로와 그 트랜잭션 (Session.info 키, 값: (최상위 트랜잭션, [경로]))
+_CREATED_BLOBS_KEY = "blob_storage_created"
+
+
+class BlobStorage:
+    """SHA-256 콘텐츠 주소 파일 저장소 ({root}/ab/cd/{hash})"""
+
+    def __init__(self, root: Optional[str] = None, shard_depth: Optional[int] = None):
+        self.root = root or BLOB_STORAGE_CONFIG['root']
+        self.shard_depth = shard_depth if shard_depth is not None else BLOB_STORAGE_CONFIG['shard_depth']
+        self.staging_dir = os.path.join(self.root, "staging")
+
+    def path_for(self, content_hash: str) -> str:
+        """해시의 저장 경로 (앞 2글자씩 shard_depth 단계 디렉터리)"""
+        shards = [content_hash[i * 2:i * 2 + 2] for i in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, content_hash)
+
+    def staging_path(self) -> str:
+        """업로드 중인 파일을 기록할 임시 경로 (저장소와 같은 파일시스템이므로 이동은 rename)"""
+        os.makedirs(self.staging_dir, exist_ok=True)
+        return os.path.join(self.staging_dir, uuid.uuid4().hex)
+
+    @staticmethod
+    def discard(path: Optional[str]) -> None:
+        """임시 파일 또는 참조가 없어진 파일 삭제"""
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.error(f"파일 삭제 중 오류 발생: {str(e)}")
+
+    def _lock_blob(self, db: Session, content_hash: str) -> Optional[FileBlob]:
+        return db.query(FileBlob).filter(FileBlob.content_hash == content_hash).with_for_update().first()
+
+    def store(self, db: Session, staging_path: str, content_hash: str, file_size: int) -> Tuple[str, bool]:
+        """
+        임시 파일을 저장소에 반영하고 참조 수 증가 -> (저장 경로, 중복 여부)
+
+        - 이미 저장된 내용이면 임시 파일을 삭제하고 기존 파일 참조
+        - 참조 수 변경은 호출자의 커밋으로 확정되며, 실패 시 호출자는 db.rollback() 대신 rollback(db) 호출
+        """
+        blob_path = self.path_for(content_hash)
+        blob = self._lock_blob(db, content_hash)
+
+        if blob is None:
+            try:
+                with db.begin_nested():
+                    blob = FileBlob(content_hash=content_hash, file_size=file_size, ref_count=0)
+                    db.add(blob)
+            except IntegrityError:
+                # 다른 요청이 같은 내용을 먼저 저장한 경우
+                blob = self._lock_blob(db, content_hash)
+
+        deduplicated = blob.ref_count > 0 and os.path.exists(blob_path)
+        if deduplicated:
+            self.discard(staging_path)
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(staging_path, blob_path)
+            # 트랜잭션이 취소되면 rollback 에서 삭제 (행 잠금 보유 중이므로 다른 요청이 참조할 수 없음)
+            transaction = db.get_transaction()
+            created = db.info.get(_CREATED_BLOBS_KEY)
+            if created is None or created[0] is not transaction:
+                created = db.info[_CREATED_BLOBS_KEY] = (transaction, [])
+            created[1].append(blob_path)
+
+        blob.ref_count += 1
+        db.flush()
+
+        return blob_path, deduplicated
+
+    def rollback(self, db: Session) -> None:
+        """트랜잭션 취소 (이번 트랜잭션에서 저장소로 옮긴 파일은 잠금이 풀리기 전에 삭제)"""
+        created = db.info.pop(_CREATED_BLOBS_KEY, None)
+        # 이미 커밋된 이전 트랜잭션의 기록이면 무시
+        if created is not None and created[0] is db.get_transaction():
+            for blob_path in created[1]:
+                self.discard(blob_path)
+        db.rollback()
+
+    def release(self, db: Session, content_hash: str) -> bool:
+        """
+        참조 수 감소 -> 참조가 없어졌는지 여부
+
+        - 행과 파일은 남겨 두며, 호출자가 커밋한 뒤 collect 로 정리
+        """
+        blob = self._lock_blob(db, content_hash)
+        if blob is None:
+            return False
+
+        blob.ref_count = max(blob.ref_count - 1, 0)
+        return blob.ref_count == 0
+
+    def collect(self, db: Session, content_hash: str) -> bool:
+        """
+        참조가 없는 파일과 행 삭제 (별도 트랜잭션) -> 삭제 여부
+
+        - 행을 잠근 상태에서 참조 수를 다시 확인하므로, 그 사이 같은 내용이 다시 업로드되었으면 삭제하지 않음
+        - 같은 내용을 저장하려는 요청은 이 행의 잠금을 기다린 뒤 새 행과 파일을 만듦
+        """
+        try:
+            blob = self._lock_blob(db, content_hash)
+            if blob is None or blob.ref_count > 0:
+                db.rollback()
+                return False
+
+            self.discard(self.path_for(content_hash))
+            db.delete(blob)
+            db.commit()
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"참조가 없는 파일 정리 중 오류 발생: {str(e)}")
+            return False
+
+
+# 전역 파일 저장소
+blob_storage = BlobStorage()
+
+
+def get_blob_storage() -> BlobStorage:
+    """전역 파일 저장소 반환"""
+    return blob_storage
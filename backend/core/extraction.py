@@ -0,0 +1,585 @@
+"""
+텍스트 추출 모듈 - 업로드된 PDF/DOCX/XLSX 등의 본문과 섹션을 백그라운드에서 추출합니다.
+
+- 추출 작업은 MongoDB extraction_jobs 컬렉션에 저장되어 서버가 재시작되어도 이어서 처리됩니다.
+- 작업은 점유 시간(lease)을 두고 가져가므로 여러 프로세스가 같은 큐를 처리할 수 있고,
+  처리 중 중단된 작업은 점유 시간이 지나면 다시 처리됩니다.
+- 파싱은 CPU 를 사용하므로 작업 슬롯마다 전용 자식 프로세스(spawn)에서 실행하며,
+  제한 시간을 넘기거나 비정상 종료된 프로세스는 종료 후 새로 시작합니다.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import multiprocessing
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.database import Database
+from sqlalchemy.orm import Session
+
+from config.settings import EXTRACTION_CONFIG
+from models.document import Document, DocumentSection, build_document_summary
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_COLLECTION = "extraction_jobs"
+
+
+class ExtractionError(Exception):
+    """추출할 수 없는 파일 (다시 시도해도 실패)"""
+
+
+class ExtractionTimeout(Exception):
+    """추출 제한 시간 초과 (자식 프로세스는 종료됨)"""
+
+
+# ----------------------------------------------------------------------
+# 형식별 추출기 (프로세스 풀에서 실행되므로 모듈 최상위 함수)
+# ----------------------------------------------------------------------
+def _extract_pdf(path: str) -> List[Dict[str, str]]:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ExtractionError("PDF 추출에는 pypdf 패키지가 필요합니다") from e
+
+    reader = PdfReader(path)
+    return [
+        {"title": f"페이지 {number}", "content": (page.extract_text() or "").strip()}
+        for number, page in enumerate(reader.pages, start=1)
+    ]
+
+
+def _extract_docx(path: str) -> List[Dict[str, str]]:
+    """제목(Heading) 스타일 단락을 기준으로 섹션 분할"""
+    try:
+        import docx
+    except ImportError as e:
+        raise ExtractionError("DOCX 추출에는 python-docx 패키지가 필요합니다") from e
+
+    sections: List[Dict[str, str]] = []
+    title, lines = "본문", []
+
+    for paragraph in docx.Document(path).paragraphs:
+        text = paragraph.text.strip()
+        if not text:
+            continue
+        style = paragraph.style.name if paragraph.style is not None else ""
+        if style.startswith("Heading") or style == "Title":
+            if lines:
+                sections.append({"title": title, "content": "\n".join(lines)})
+            title, lines = text, []
+        else:
+            lines.append(text)
+
+    if lines:
+        sections.append({"title": title, "content": "\n".join(lines)})
+    return sections
+
+
+def _extract_xlsx(path: str) -> List[Dict[str, str]]:
+    """시트별 섹션 (행은 탭으로 구분한 한 줄)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ExtractionError("XLSX 추출에는 openpyxl 패키지가 필요합니다") from e
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sections = []
+        for sheet in workbook.worksheets:
+            rows = [
+                "\t".join("" if value is None else str(value) for value in row)
+                for row in sheet.iter_rows(values_only=True)
+                if any(value is not None for value in row)
+            ]
+            sections.append({"title": sheet.title, "content": "\n".join(rows)})
+        return sections
+    finally:
+        workbook.close()
+
+
+def _extract_plain_text(path: str) -> List[Dict[str, str]]:
+    with open(path, "rb") as f:
+        return [{"title": "본문", "content": f.read().decode("utf-8", errors="ignore")}]
+
+
+def _extract_json(path: str) -> List[Dict[str, str]]:
+    """최상위 키별 섹션 (객체가 아니면 전체를 하나의 섹션으로)"""
+    with open(path, "rb") as f:
+        data = json.loads(f.read().decode("utf-8", errors="ignore"))
+
+    if not isinstance(data, dict):
+        return [{"title": "본문", "content": json.dumps(data, ensure_ascii=False, indent=2)}]
+    return [
+        {"title": str(key), "content": value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=2)}
+        for key, value in data.items()
+    ]
+
+
+EXTRACTORS: Dict[str, Callable[[str], List[Dict[str, str]]]] = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "xlsx": _extract_xlsx,
+    "txt": _extract_plain_text,
+    "csv": _extract_plain_text,
+    "json": _extract_json,
+}
+
+
+def is_extractable(file_format: Optional[str]) -> bool:
+    return (file_format or "").lower() in EXTRACTORS
+
+
+def extract_document(path: str, file_format: str) -> Dict[str, Any]:
+    """
+    파일 본문과 섹션 추출 -> {"sections", "content", "extract_seconds"}
+
+    - 내용이 없는 섹션은 제외
+    """
+    started = time.perf_counter()
+    extractor = EXTRACTORS.get((file_format or "").lower())
+    if extractor is None:
+        raise ExtractionError(f"지원하지 않는 파일 형식입니다: {file_format}")
+    if not os.path.exists(path):
+        raise ExtractionError(f"파일을 찾을 수 없습니다: {path}")
+
+    sections = [section for section in extractor(path) if section["content"].strip()]
+    return {
+        "sections": sections,
+        "content": "\n\n".join(section["content"] for section in sections),
+        "extract_seconds": round(time.perf_counter() - started, 4)
+    }
+
+
+def _extraction_process_main(conn: Any) -> None:
+    """추출 자식 프로세스 루프 (요청: (경로, 형식), 응답: (상태, 결과 또는 오류))"""
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+
+        try:
+            conn.send(("ok", extract_document(*job)))
+        except ExtractionError as e:
+            conn.send(("unsupported", str(e)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+
+
+class ExtractionProcess:
+    """
+    작업 슬롯 전용 추출 프로세스
+
+    - spawn 으로 시작하므로 부모 프로세스의 모델/스레드 풀 상태를 물려받지 않음
+    - 제한 시간을 넘기면 프로세스를 종료(kill)하고 다음 작업에서 새로 시작
+    """
+
+    def __init__(self):
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        self.kill()
+
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_extraction_process_main, args=(child_conn,), name="extraction-worker", daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def run(self, path: str, file_format: str, timeout: float) -> Dict[str, Any]:
+        """파일 하나 추출 (블로킹이므로 스레드 풀에서 호출)"""
+        self._ensure_started()
+        self._conn.send((path, file_format))
+
+        if not self._conn.poll(timeout):
+            self.kill()
+            raise ExtractionTimeout(f"추출 시간 초과 ({timeout:.0f}초)")
+
+        try:
+            status, payload = self._conn.recv()
+        except (EOFError, OSError):
+            # 메모리 부족 등으로 자식 프로세스가 종료된 경우
+            exitcode = self._process.exitcode if self._process else None
+            self.kill()
+            raise RuntimeError(f"추출 프로세스가 비정상 종료되었습니다 (종료 코드: {exitcode})")
+
+        if status == "ok":
+            return payload
+        if status == "unsupported":
+            raise ExtractionError(payload)
+        raise RuntimeError(payload)
+
+    def kill(self) -> None:
+        """자식 프로세스 종료"""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(timeout=5)
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ----------------------------------------------------------------------
+# 작업 큐
+# ----------------------------------------------------------------------
+class ExtractionQueue:
+    """MongoDB 기반 추출 작업 큐 (상태: queued, running, completed, failed)"""
+
+    def __init__(self, mongo_db: Database):
+        self.collection = mongo_db[EXTRACTION_COLLECTION]
+        self.lease = timedelta(seconds=EXTRACTION_CONFIG['lease_seconds'])
+
+    @staticmethod
+    def create_indexes(mongo_db: Database) -> None:
+        """문서별 작업 및 대기 작업 조회 인덱스 생성"""
+        collection = mongo_db[EXTRACTION_COLLECTION]
+        collection.create_index([("document_id", ASCENDING)], unique=True)
+        collection.create_index([("status", ASCENDING), ("queued_at", ASCENDING)])
+
+    @staticmethod
+    def _enqueue_operation(document_id: int, file_path: str, file_format: str, force: bool) -> UpdateOne:
+        now = datetime.utcnow()
+        job = {
+            "file_path": file_path,
+            "file_format": file_format,
+            "status": "queued",
+            "attempts": 0,
+            "queued_at": now,
+            "updated_at": now
+        }
+        if force:
+            return UpdateOne(
+                {"document_id": document_id},
+                {"$set": job, "$unset": {"error": "", "timings": "", "lease_expires_at": ""}},
+                upsert=True
+            )
+        return UpdateOne({"document_id": document_id}, {"$setOnInsert": job}, upsert=True)
+
+    def enqueue_many(self, documents: List[Dict[str, Any]], force: bool = False) -> int:
+        """
+        추출 작업 추가 (항목: document_id, file_path, file_format) -> 추가된 작업 수
+
+        - 이미 작업이 있는 문서는 force 일 때만 다시 대기 상태로 변경
+        """
+        operations = [
+            self._enqueue_operation(d["document_id"], d["file_path"], d["file_format"], force)
+            for d in documents if is_extractable(d.get("file_format")) and d.get("file_path")
+        ]
+        if not operations:
+            return 0
+        result = self.collection.bulk_write(operations, ordered=False)
+        return result.upserted_count + (result.modified_count if force else 0)
+
+    def enqueue(self, document_id: int, file_path: str, file_format: str, force: bool = False) -> int:
+        return self.enqueue_many(
+            [{"document_id": document_id, "file_path": file_path, "file_format": file_format}], force
+        )
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """대기 중이거나 점유 시간이 지난 작업 하나를 가져옴 (먼저 추가된 순서)"""
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + self.lease,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("queued_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def complete(self, job: Dict[str, Any], timings: Dict[str, float], stats: Dict[str, Any]) -> None:
+        self.collection.update_one(
+            {"_id": job["_id"], "worker_id": job["worker_id"]},
+            {
+                "$set": {"status": "completed", "timings": timings, "stats": stats,
+                         "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()},
+                "$unset": {"lease_expires_at": "", "error": ""}
+            }
+        )
+
+    def fail(self, job: Dict[str, Any], error: str, retry: bool, timings: Optional[Dict[str, float]] = None) -> None:
+        """실패 기록 (재시도 가능하고 시도 횟수가 남았으면 다시 대기 상태로)"""
+        retry = retry and job.get("attempts", 0) < EXTRACTION_CONFIG['max_attempts']
+        fields: Dict[str, Any] = {
+            "status": "queued" if retry else "failed",
+            "error": error,
+            "updated_at": datetime.utcnow()
+        }
+        if timings:
+            fields["timings"] = timings
+        if not retry:
+            fields["finished_at"] = datetime.utcnow()
+
+        self.collection.update_one(
+            {"_id": job["_id"], "worker_id": job["worker_id"]},
+            {"$set": fields, "$unset": {"lease_expires_at": ""}}
+        )
+
+    def get(self, document_id: int) -> Optional[Dict[str, Any]]:
+        job = self.collection.find_one({"document_id": document_id}, {"_id": 0, "worker_id": 0})
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """상태별 작업 수와 완료 작업의 평균 처리 시간"""
+        counts = {
+            row["_id"]: row["count"]
+            for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+        timings = list(self.collection.aggregate([
+            {"$match": {"status": "completed"}},
+            {"$group": {
+                "_id": None,
+                "avg_wait_seconds": {"$avg": "$timings.wait_seconds"},
+                "avg_extract_seconds": {"$avg": "$timings.extract_seconds"},
+                "max_extract_seconds": {"$max": "$timings.extract_seconds"},
+                "avg_total_seconds": {"$avg": "$timings.total_seconds"}
+            }}
+        ]))
+        summary = timings[0] if timings else {}
+        summary.pop("_id", None)
+        return {"counts": counts, "timings": summary}
+
+
+# ----------------------------------------------------------------------
+# 작업자
+# ----------------------------------------------------------------------
+class ExtractionWorker:
+    """
+    애플리케이션 프로세스에서 실행되는 추출 작업 루프
+
+    - workers 개의 작업 슬롯이 큐에서 작업을 가져와 슬롯별 추출 프로세스에서 추출
+    - 추출 결과는 Document.content/summary 와 DocumentSection 행으로 저장
+    """
+
+    def __init__(self, workers: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.workers = workers or EXTRACTION_CONFIG['workers']
+        self.poll_interval = poll_interval if poll_interval is not None else EXTRACTION_CONFIG['poll_interval']
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._processes: List[ExtractionProcess] = []
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @staticmethod
+    def _mongo_db() -> Database:
+        from db.session import mongo_db
+        return mongo_db
+
+    @staticmethod
+    def _session() -> Session:
+        from db.session import SessionLocal
+        return SessionLocal()
+
+    async def start(self) -> None:
+        if self._tasks or not EXTRACTION_CONFIG['enabled']:
+            return
+
+        self._processes = [ExtractionProcess() for _ in range(self.workers)]
+        self._wakeup = asyncio.Event()
+
+        if EXTRACTION_CONFIG['backfill_on_startup']:
+            try:
+                added = await run_in_threadpool(self.backfill)
+                if added:
+                    logger.info(f"본문이 없는 업로드 문서 {added}개를 추출 큐에 추가했습니다")
+            except Exception as e:
+                logger.error(f"추출 큐 초기화 중 오류 발생: {str(e)}")
+
+        self._tasks = [asyncio.create_task(self._run_slot(slot)) for slot in range(self.workers)]
+        logger.info(f"텍스트 추출 작업자 시작: {self.worker_id} (슬롯 {self.workers}개)")
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for process in self._processes:
+            process.kill()
+        self._processes = []
+        logger.info(f"텍스트 추출 작업자 종료: {self.worker_id}")
+
+    def notify(self) -> None:
+        """새 작업이 추가되었음을 알림 (대기 중인 슬롯이 바로 큐 확인)"""
+        self._wakeup.set()
+
+    def backfill(self) -> int:
+        """본문이 없는 업로드 문서를 큐에 추가 (이미 작업이 있는 문서는 제외)"""
+        db = self._session()
+        try:
+            rows = db.query(Document.id, Document.file_path, Document.file_format).filter(
+                Document.is_deleted == False,
+                Document.is_ai_generated == False,
+                Document.content.is_(None),
+                Document.file_path.isnot(None),
+                Document.file_format.in_(list(EXTRACTORS))
+            ).all()
+        finally:
+            db.close()
+
+        return ExtractionQueue(self._mongo_db()).enqueue_many([
+            {"document_id": row.id, "file_path": row.file_path, "file_format": row.file_format} for row in rows
+        ])
+
+    async def _run_slot(self, slot: int) -> None:
+        queue = ExtractionQueue(self._mongo_db())
+
+        while True:
+            try:
+                job = await run_in_threadpool(queue.claim, self.worker_id)
+            except Exception as e:
+                logger.error(f"추출 작업 조회 중 오류 발생: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(queue, job, self._processes[slot])
+
+    async def _process(self, queue: ExtractionQueue, job: Dict[str, Any], process: ExtractionProcess) -> None:
+        document_id = job["document_id"]
+        started = time.perf_counter()
+        timings = {"wait_seconds": round((job["started_at"] - job["queued_at"]).total_seconds(), 4)}
+
+        try:
+            result = await run_in_threadpool(
+                process.run, job["file_path"], job["file_format"], EXTRACTION_CONFIG['timeout_seconds']
+            )
+            timings["extract_seconds"] = result["extract_seconds"]
+
+            store_started = time.perf_counter()
+            stats = await run_in_threadpool(self._store_result, document_id, result)
+            timings["store_seconds"] = round(time.perf_counter() - store_started, 4)
+            timings["total_seconds"] = round(time.perf_counter() - started, 4)
+
+            queue.complete(job, timings, stats)
+            logger.info(
+                f"텍스트 추출 완료: 문서 ID {document_id} ({job['file_format']}, "
+                f"대기 {timings['wait_seconds']:.2f}초, 추출 {timings['extract_seconds']:.2f}초, "
+                f"저장 {timings['store_seconds']:.2f}초, 섹션 {stats['sections_count']}개)"
+            )
+
+        except asyncio.CancelledError:
+            # 종료 시 중단된 작업은 점유 시간이 지나면 다른 작업자가 다시 처리
+            raise
+
+        except ExtractionError as e:
+            timings["total_seconds"] = round(time.perf_counter() - started, 4)
+            logger.warning(f"텍스트 추출 불가: 문서 ID {document_id} ({str(e)})")
+            queue.fail(job, str(e), retry=False, timings=timings)
+
+        except ExtractionTimeout as e:
+            # 자식 프로세스는 이미 종료되었으므로 슬롯은 다음 작업을 바로 처리
+            timings["total_seconds"] = round(time.perf_counter() - started, 4)
+            logger.error(f"텍스트 추출 시간 초과: 문서 ID {document_id}")
+            queue.fail(job, str(e), retry=True, timings=timings)
+
+        except Exception as e:
+            timings["total_seconds"] = round(time.perf_counter() - started, 4)
+            logger.error(f"텍스트 추출 중 오류 발생 (문서 ID {document_id}): {str(e)}")
+            queue.fail(job, str(e), retry=True, timings=timings)
+
+    def _store_result(self, document_id: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """추출 결과를 문서 본문/요약/섹션으로 저장하고 검색 색인과 유사 문서 서명 갱신"""
+        max_chars = EXTRACTION_CONFIG['max_chars']
+        content = result["content"][:max_chars]
+        sections = result["sections"]
+
+        db = self._session()
+        try:
+            document = db.query(Document).filter(Document.id == document_id, Document.is_deleted == False).first()
+            if document is None:
+                return {"sections_count": 0, "content_length": 0, "skipped": "document_deleted"}
+
+            # 이전 추출 결과 섹션 교체
+            db.query(DocumentSection).filter(
+                DocumentSection.document_id == document_id,
+                DocumentSection.is_ai_generated == False
+            ).delete(synchronize_session=False)
+
+            db.add_all([
+                DocumentSection(
+                    title=section["title"][:200],
+                    content=section["content"],
+                    order=order,
+                    is_ai_generated=False,
+                    generation_parameters={"source": "extraction"},
+                    document_id=document_id
+                )
+                for order, section in enumerate(sections)
+            ])
+
+            document.content = content
+            document.summary = build_document_summary(content, len(sections))
+            document.updated_at = datetime.utcnow()
+            db.commit()
+
+            title, tags, description, creator_id = document.title, document.tags, document.description, document.creator_id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        from core.search_index import get_search_index
+        search_index = get_search_index()
+        if search_index:
+            search_index.add_document(document_id, title, content, tags, description)
+
+        if content:
+            try:
+                from ai_analysis.near_duplicate import NearDuplicateIndex
+                NearDuplicateIndex(self._mongo_db()).add(document_id, content, source="upload", creator_id=creator_id)
+            except Exception as e:
+                logger.error(f"문서 서명 저장 중 오류 발생: {str(e)}")
+
+        return {"sections_count": len(sections), "content_length": len(content), "truncated": len(result["content"]) > max_chars}
+
+
+# 전역 추출 작업자
+extraction_worker = ExtractionWorker()
+
+
+def get_extraction_worker() -> ExtractionWorker:
+    """전역 추출 작업자 반환"""
+    return extraction_worker
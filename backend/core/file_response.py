@@ -0,0 +1,203 @@
+"""
+파일 응답 모듈 - 문서 다운로드에 ETag/Last-Modified 재검증(304)과 HTTP Range(206) 응답을 제공합니다.
+
+- ETag 는 저장된 콘텐츠 해시(SHA-256)로 만든 강한 검증자이며, 해시가 없는 이전 파일은 수정 시각/크기로 만든 약한 검증자를 사용합니다.
+- 서버가 ASGI zero-copy send 확장(http.response.zerocopysend)을 지원하면 파일 내용을
+  애플리케이션을 거치지 않고 커널 sendfile 로 전송하고, 지원하지 않으면 청크 단위로 읽어 전송합니다.
+"""
+
+import os
+import stat
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+# zero-copy 확장이 없을 때 한 번에 읽어 보내는 크기
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeFileResponse(Response):
+    """파일의 일부(offset 부터 length 바이트) 또는 전체를 전송하는 응답"""
+
+    def __init__(self, path: str, offset: int, length: int, status_code: int = 200,
+                 headers: Optional[Dict[str, str]] = None, media_type: Optional[str] = None,
+                 send_body: bool = True):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.send_body = send_body
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False
+                })
+            return
+
+        remaining = self.length
+        async with await anyio.open_file(self.path, mode="rb") as f:
+            await f.seek(self.offset)
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+        if remaining > 0:
+            # 전송 중 파일이 줄어든 경우 응답만 종료
+            logger.warning(f"파일 전송 중 크기 불일치: {self.path} ({remaining}바이트 누락)")
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _etag(content_hash: Optional[str], stat_result: os.stat_result) -> str:
+    if content_hash:
+        return f'"{content_hash}"'
+    return f'W/"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """If-None-Match(약한 비교) / If-Range(강한 비교) 값과 ETag 비교"""
+    candidates = [tag.strip() for tag in header.split(",")]
+    if "*" in candidates:
+        return True
+    if weak:
+        return _strip_weak(etag) in (_strip_weak(tag) for tag in candidates)
+    return not etag.startswith("W/") and etag in candidates
+
+
+def _not_modified_since(header: Optional[str], mtime: float) -> bool:
+    if not header:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Range 헤더 해석 -> [(시작, 끝)] (끝 포함)
+
+    - bytes 단위가 아니거나 형식이 잘못되면 None (Range 무시)
+    - 만족할 수 있는 범위가 없으면 빈 목록 (416)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        start_text, sep, end_text = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if not start_text:
+                # 마지막 N 바이트
+                suffix = int(end_text)
+                if suffix <= 0:
+                    continue
+                ranges.append((max(size - suffix, 0), size - 1))
+                continue
+
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        except ValueError:
+            return None
+
+        if start > end:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    return ranges
+
+
+def build_file_response(request: Request, path: str, filename: str,
+                        media_type: str = "application/octet-stream",
+                        content_hash: Optional[str] = None) -> Response:
+    """
+    조건부/부분 요청을 처리한 다운로드 응답
+
+    - If-None-Match 또는 If-Modified-Since 가 일치하면 304
+    - Range 가 단일 범위이면 206, 만족할 수 없으면 416 (여러 범위는 전체 파일로 응답)
+    - If-Range 가 현재 ETag 와 다르면 Range 를 무시하고 전체 파일 전송
+    """
+    stat_result = os.stat(path)
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise FileNotFoundError(path)
+
+    size = stat_result.st_size
+    etag = _etag(content_hash, stat_result)
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "accept-ranges": "bytes",
+        "cache-control": "private, no-cache",
+        "content-disposition": _content_disposition(filename)
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag, weak=True)
+    else:
+        not_modified = _not_modified_since(request.headers.get("if-modified-since"), stat_result.st_mtime)
+
+    if not_modified:
+        headers.pop("content-disposition")
+        return Response(status_code=304, headers=headers)
+
+    send_body = request.method != "HEAD"
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and not _etag_matches(if_range, etag, weak=False):
+        range_header = None
+
+    ranges = parse_range(range_header, size) if range_header else None
+    if ranges is not None and not ranges:
+        return Response(status_code=416, headers={"content-range": f"bytes */{size}", "accept-ranges": "bytes"})
+
+    if ranges is not None and len(ranges) == 1:
+        start, end = ranges[0]
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(end - start + 1)
+        return RangeFileResponse(path, start, end - start + 1, 206, headers, media_type, send_body)
+
+    headers["content-length"] = str(size)
+    return RangeFileResponse(path, 0, size, 200, headers, media_type, send_body)
@@ -0,0 +1,193 @@
+"""
+멱등성 모듈 - Idempotency-Key 헤더로 재시도된 요청에 저장된 결과를 반환합니다.
+
+- 같은 키로 완료된 요청이 있으면 다시 실행하지 않고 저장된 응답 반환
+- 같은 프로세스에서 처리 중인 요청에는 완료를 기다렸다가 같은 결과 반환
+- 다른 프로세스에서 처리 중이면 완료될 때까지 MongoDB 기록을 확인
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pymongo import ASCENDING
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from config.settings import IDEMPOTENCY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_COLLECTION = "idempotency_keys"
+MAX_KEY_LENGTH = 255
+
+# 같은 프로세스에서 처리 중인 요청 (레코드 ID -> (지문, Future))
+_in_flight: Dict[str, Tuple[str, "asyncio.Future"]] = {}
+
+
+def request_fingerprint(user_id: int, scope: str, payload: Any) -> str:
+    """요청 지문 (사용자 + 엔드포인트 + 요청 내용의 SHA-256)"""
+    serialized = json.dumps(
+        {"user_id": user_id, "scope": scope, "payload": payload},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """MongoDB 기반 멱등성 키 저장소"""
+
+    def __init__(self, mongo_db: Database):
+        self.collection = mongo_db[IDEMPOTENCY_COLLECTION]
+        self.ttl = timedelta(seconds=IDEMPOTENCY_CONFIG['ttl_seconds'])
+        self.lease = timedelta(seconds=IDEMPOTENCY_CONFIG['lease_seconds'])
+
+    @staticmethod
+    def create_indexes(mongo_db: Database) -> None:
+        """만료 시각 TTL 인덱스 생성"""
+        mongo_db[IDEMPOTENCY_COLLECTION].create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    @staticmethod
+    def _record_id(user_id: int, scope: str, key: str) -> str:
+        return f"{user_id}:{scope}:{key}"
+
+    @staticmethod
+    def _check_fingerprint(stored: str, fingerprint: str) -> None:
+        if stored != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="같은 Idempotency-Key 로 다른 내용의 요청이 전송되었습니다."
+            )
+
+    def _acquire(self, record_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """처리 권한 획득 (획득하면 None, 이미 기록이 있으면 기존 기록 반환)"""
+        now = datetime.utcnow()
+        try:
+            self.collection.insert_one({
+                "_id": record_id,
+                "fingerprint": fingerprint,
+                "status": "in_progress",
+                "created_at": now,
+                "lease_expires_at": now + self.lease,
+                "expires_at": now + self.ttl
+            })
+            return None
+        except DuplicateKeyError:
+            pass
+
+        # 처리하던 프로세스가 중단되어 유효 시간이 지난 기록은 이어받음
+        taken_over = self.collection.find_one_and_update(
+            {"_id": record_id, "status": "in_progress", "fingerprint": fingerprint,
+             "lease_expires_at": {"$lt": now}},
+            {"$set": {"lease_expires_at": now + self.lease}}
+        )
+        if taken_over:
+            logger.warning(f"만료된 멱등성 처리 기록을 이어받습니다: {record_id}")
+            return None
+
+        existing = self.collection.find_one({"_id": record_id})
+        if existing is None:
+            # 확인하는 사이에 기록이 삭제(실패 또는 만료)된 경우 다시 시도
+            return self._acquire(record_id, fingerprint)
+        return existing
+
+    def _complete(self, record_id: str, result: Dict[str, Any]) -> None:
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": record_id},
+            {"$set": {
+                "status": "completed",
+                "response": json.dumps(result, ensure_ascii=False, default=str),
+                "completed_at": now,
+                "expires_at": now + self.ttl
+            }}
+        )
+
+    def _release(self, record_id: str) -> None:
+        """실패한 요청은 기록을 삭제해 재시도 시 다시 실행되도록 함"""
+        self.collection.delete_one({"_id": record_id, "status": "in_progress"})
+
+    async def _wait_for_other_process(self, record_id: str, fingerprint: str) -> Dict[str, Any]:
+        deadline = asyncio.get_running_loop().time() + IDEMPOTENCY_CONFIG['wait_timeout']
+
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(IDEMPOTENCY_CONFIG['poll_interval'])
+            record = self.collection.find_one({"_id": record_id})
+
+            if not record:
+                break
+            self._check_fingerprint(record.get("fingerprint"), fingerprint)
+            if record.get("status") == "completed":
+                return json.loads(record["response"])
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="같은 Idempotency-Key 의 요청이 아직 처리 중입니다. 잠시 후 다시 시도하세요."
+        )
+
+    async def run(self, key: str, user_id: int, scope: str, fingerprint: str,
+                  func: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        멱등성 키로 요청 실행 -> (응답, 저장된 응답 재사용 여부)
+
+        - 실패한 요청(예외)은 저장하지 않으므로 같은 키로 다시 시도할 수 있음
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key 는 1~{MAX_KEY_LENGTH}자여야 합니다."
+            )
+
+        record_id = self._record_id(user_id, scope, key)
+
+        # 같은 프로세스에서 처리 중인 요청에 합류
+        in_flight = _in_flight.get(record_id)
+        if in_flight:
+            self._check_fingerprint(in_flight[0], fingerprint)
+            logger.info(f"처리 중인 요청에 합류: {record_id}")
+            return await asyncio.shield(in_flight[1]), True
+
+        future = asyncio.get_running_loop().create_future()
+        _in_flight[record_id] = (fingerprint, future)
+
+        try:
+            existing = self._acquire(record_id, fingerprint)
+
+            if existing is not None:
+                self._check_fingerprint(existing.get("fingerprint"), fingerprint)
+                if existing.get("status") == "completed":
+                    result = json.loads(existing["response"])
+                else:
+                    result = await self._wait_for_other_process(record_id, fingerprint)
+                logger.info(f"저장된 응답 재사용: {record_id}")
+                future.set_result(result)
+                return result, True
+
+            try:
+                result = await func()
+            except BaseException:
+                self._release(record_id)
+                raise
+
+            # 응답은 JSON 으로 직렬화한 형태로 저장/반환 (재시도 응답과 동일한 형태)
+            result = json.loads(json.dumps(result, ensure_ascii=False, default=str))
+            self._complete(record_id, result)
+            future.set_result(result)
+            return result, False
+
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # 합류한 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록 처리
+                    future.exception()
+            raise
+
+        finally:
+            _in_flight.pop(record_id, None)
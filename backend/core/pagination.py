@@ -0,0 +1,131 @@
+"""
+페이지네이션 모듈 - (created_at, id) 기준 키셋(커서) 페이지네이션을 구현합니다.
+검색 결과는 (점수, id) 기준 키셋으로 페이지를 나눕니다.
+
+OFFSET 은 건너뛴 행을 모두 읽어야 하므로 뒤쪽 페이지일수록 느려지지만,
+키셋 방식은 마지막 행의 (created_at, id) 다음부터 복합 인덱스로 바로 조회합니다.
+"""
+
+import json
+import base64
+import bisect
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import desc
+
+logger = logging.getLogger(__name__)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """커서 값을 불투명한 URL 안전 문자열로 인코딩"""
+    serialized = json.dumps(
+        {key: value.isoformat() if isinstance(value, datetime) else value for key, value in values.items()},
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(serialized.encode('utf-8')).decode('ascii').rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """커서 문자열 디코딩 (형식이 잘못되면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, dict):
+            raise ValueError("커서 형식 오류")
+        return values
+    except Exception:
+        logger.warning(f"잘못된 페이지 커서: {cursor}")
+        raise _invalid_cursor()
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="잘못된 페이지 커서입니다."
+    )
+
+
+def paginate_by_created(query: Query, model: Any, limit: int, cursor: Optional[str] = None,
+                        offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """
+    최신순 (created_at, id) 키셋 페이지 조회 -> (행 목록, 다음 페이지 커서)
+
+    - limit + 1 개를 조회하여 다음 페이지 존재 여부 확인
+    - 다음 페이지가 없으면 커서는 None
+    - offset 은 기존 skip 파라미터 호환용 (커서가 있으면 무시)
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            created_at = datetime.fromisoformat(values["c"])
+            last_id = int(values["i"])
+        except (KeyError, TypeError, ValueError):
+            raise _invalid_cursor()
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+        offset = 0
+
+    query = query.order_by(desc(model.created_at), desc(model.id))
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"c": rows[-1].created_at, "i": rows[-1].id})
+
+    return rows, next_cursor
+
+
+def paginate_rows_by_id(rows: List[Dict[str, Any]], limit: int, cursor: Optional[str] = None,
+                        offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """id 오름차순으로 정렬된 메모리 목록의 키셋 페이지 -> (행 목록, 다음 페이지 커서)"""
+    start = offset
+    if cursor:
+        try:
+            last_id = int(decode_cursor(cursor)["i"])
+        except (KeyError, TypeError, ValueError):
+            raise _invalid_cursor()
+        start = bisect.bisect_right([row["id"] for row in rows], last_id)
+
+    page = rows[start:start + limit]
+    next_cursor = None
+    if start + limit < len(rows) and page:
+        next_cursor = encode_cursor({"i": page[-1]["id"]})
+
+    return page, next_cursor
+
+
+def paginate_ranked(rows: List[Any], scores: Dict[int, float], limit: int, cursor: Optional[str] = None,
+                    offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """
+    (점수 내림차순, id 내림차순)으로 정렬된 검색 결과의 키셋 페이지 -> (행 목록, 다음 페이지 커서)
+
+    - 커서는 마지막 행의 (점수, id) 이므로 페이지 사이에 색인이 바뀌어도 순위 위치가 아닌 값 기준으로 이어짐
+    - offset 은 기존 skip 파라미터 호환용 (커서가 있으면 무시)
+    """
+    start = offset
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            last_key = (float(values["s"]), int(values["i"]))
+        except (KeyError, TypeError, ValueError):
+            raise _invalid_cursor()
+        start = next(
+            (index for index, row in enumerate(rows) if (scores[row.id], row.id) < last_key),
+            len(rows)
+        )
+
+    page = rows[start:start + limit]
+    next_cursor = None
+    if start + limit < len(rows) and page:
+        next_cursor = encode_cursor({"s": scores[page[-1].id], "i": page[-1].id})
+
+    return page, next_cursor
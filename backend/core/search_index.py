@@ -0,0 +1,304 @@
+"""
+검색 인덱스 모듈 - 문서 제목, 설명, 본문, 태그에 대한 프로세스 내 역색인과 BM25 순위를 제공합니다.
+
+- 한글은 띄어쓰기/조사와 무관하게 찾을 수 있도록 음절 bigram 으로, 영문/숫자는 단어 단위로 색인합니다.
+- 생성/수정/삭제 시 해당 문서만 갱신하며, 다른 프로세스의 변경은 주기적으로
+  (행 수, 최대 ID, 최종 수정 시각)을 확인하여 바뀐 행만 다시 색인합니다.
+"""
+
+import re
+import math
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo.database import Database
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from config.settings import SEARCH_CONFIG
+from models.document import Document
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절 연속 또는 영문/숫자 단어
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+# MongoDB 본문 조회 배치 크기
+_MONGO_BATCH_SIZE = 500
+
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    검색용 토큰 목록
+
+    - 한글: 음절 bigram ("입찰서류" -> 입찰, 찰서, 서류), 한 글자 단어는 그대로
+    - 영문/숫자: 소문자 단어
+    """
+    tokens: List[str] = []
+    for match in TOKEN_PATTERN.finditer((text or "").lower()):
+        word = match.group()
+        if _is_hangul(word[0]) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class SearchIndex:
+    """BM25 순위를 사용하는 문서 역색인 (용어 -> {문서 ID: 가중 빈도})"""
+
+    def __init__(self, refresh_interval: Optional[float] = None):
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None else SEARCH_CONFIG['refresh_interval']
+        )
+        self.k1 = SEARCH_CONFIG['bm25_k1']
+        self.b = SEARCH_CONFIG['bm25_b']
+        self.title_weight = SEARCH_CONFIG['title_weight']
+        self.tag_weight = SEARCH_CONFIG['tag_weight']
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+
+        self._loaded = False
+        self._checked_at = 0.0
+        self._row_count: Optional[int] = None
+        self._max_id: Optional[int] = None
+        self._last_updated_at: Optional[datetime] = None
+        # 색인 시점에 확인한 모든 행 ID (소프트 삭제 포함) - 행 수 변화의 원인 파악용
+        self._row_ids: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+    def _term_weights(self, title: Optional[str], description: Optional[str], content: Optional[str],
+                      tags: Optional[Iterable[str]]) -> Dict[str, float]:
+        weights: Counter = Counter()
+        for token in tokenize(title):
+            weights[token] += self.title_weight
+        for token in tokenize(" ".join(tags or [])):
+            weights[token] += self.tag_weight
+        for token in tokenize(description):
+            weights[token] += 1.0
+        for token in tokenize(content):
+            weights[token] += 1.0
+        return dict(weights)
+
+    def _remove_locked(self, document_id: int) -> None:
+        terms = self._doc_terms.pop(document_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(document_id, None)
+                if not postings:
+                    del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(document_id, 0.0)
+
+    def add_document(self, document_id: int, title: Optional[str] = None, content: Optional[str] = None,
+                     tags: Optional[Iterable[str]] = None, description: Optional[str] = None) -> None:
+        """문서 색인 (같은 ID 의 기존 색인은 교체)"""
+        terms = self._term_weights(title, description, content, tags)
+
+        with self._lock:
+            self._remove_locked(document_id)
+            if not terms:
+                return
+
+            self._doc_terms[document_id] = terms
+            length = sum(terms.values())
+            self._doc_lengths[document_id] = length
+            self._total_length += length
+
+            for term, weight in terms.items():
+                self._postings.setdefault(term, {})[document_id] = weight
+
+    def remove_document(self, document_id: int) -> None:
+        """문서 색인 삭제"""
+        with self._lock:
+            self._remove_locked(document_id)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        BM25 점수 순 검색 결과 -> [(문서 ID, 점수)]
+
+        - 질의 토큰 중 하나라도 포함한 문서를 점수 순으로 반환
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        limit = limit or SEARCH_CONFIG['max_results']
+        if not terms:
+            return []
+
+        scores: Dict[int, float] = {}
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if doc_count == 0:
+                return []
+            average_length = self._total_length / doc_count
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1.0 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for document_id, frequency in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[document_id] / average_length)
+                    scores[document_id] = scores.get(document_id, 0.0) + (
+                        idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+                    )
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [(document_id, round(score, 6)) for document_id, score in ranked[:limit]]
+
+    # ------------------------------------------------------------------
+    # DB 동기화
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _fetch_mongo_contents(mongo_db: Optional[Database], rows: List[Any]) -> Dict[str, str]:
+        """AI 생성 문서의 MongoDB 본문을 $in 배치 조회 (mongodb_id -> 본문)"""
+        mongo_ids = [
+            row.generation_parameters["mongodb_id"]
+            for row in rows
+            if row.is_ai_generated and not row.content and row.generation_parameters
+            and "mongodb_id" in row.generation_parameters
+        ]
+        if mongo_db is None or not mongo_ids:
+            return {}
+
+        from db.session import to_mongo_id
+
+        contents: Dict[str, str] = {}
+        for start in range(0, len(mongo_ids), _MONGO_BATCH_SIZE):
+            batch = [to_mongo_id(mongo_id) for mongo_id in mongo_ids[start:start + _MONGO_BATCH_SIZE]]
+            for record in mongo_db.documents.find({"_id": {"$in": batch}}, {"content": 1, "sections.content": 1}):
+                content = record.get("content") or "\n".join(
+                    section.get("content", "") for section in record.get("sections", [])
+                )
+                contents[str(record["_id"])] = content
+        return contents
+
+    def _index_rows(self, rows: List[Any], mongo_db: Optional[Database]) -> None:
+        contents = self._fetch_mongo_contents(mongo_db, rows)
+
+        for row in rows:
+            if row.is_deleted:
+                self.remove_document(row.id)
+                continue
+
+            content = row.content
+            if not content and row.generation_parameters and "mongodb_id" in row.generation_parameters:
+                content = contents.get(str(row.generation_parameters["mongodb_id"]))
+
+            self.add_document(row.id, row.title, content, row.tags, row.description)
+
+    def _reconcile_row_ids(self, db: Session, mongo_db: Optional[Database]) -> None:
+        """
+        행 ID 목록을 대조하여 누락된 행을 색인하고 사라진 행을 제거
+
+        - 먼저 ID 를 할당받았지만 늦게 커밋된 행은 최대 ID/최종 수정 시각이 바뀌지 않아도 행 수로 드러남
+        """
+        row_ids = {row_id for (row_id,) in db.query(Document.id).all()}
+
+        missing = row_ids - self._row_ids
+        if missing:
+            missing_list = list(missing)
+            for start in range(0, len(missing_list), _MONGO_BATCH_SIZE):
+                batch = missing_list[start:start + _MONGO_BATCH_SIZE]
+                self._index_rows(db.query(Document).filter(Document.id.in_(batch)).all(), mongo_db)
+
+        for row_id in self._row_ids - row_ids:
+            self._remove_locked(row_id)
+
+        self._row_ids = row_ids
+        if missing:
+            logger.info(f"검색 인덱스 누락 행 색인: 문서 {len(missing)}개")
+
+    def sync(self, db: Session, mongo_db: Optional[Database] = None) -> None:
+        """
+        필요한 경우에만 DB 와 동기화
+
+        - 처음 호출 시 전체 색인
+        - 이후에는 refresh_interval 마다 (행 수, 최대 ID, 최종 수정 시각)을 확인하여
+          수정 시각이나 ID 가 마지막 확인 이후인 행만 다시 색인
+        - 그래도 행 수가 색인한 행 ID 수와 다르면 (늦게 커밋된 행, 영구 삭제) ID 목록을 대조
+        """
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._loaded and now - self._checked_at < self.refresh_interval:
+                return
+
+            try:
+                row_count, max_id, last_updated_at = db.query(
+                    func.count(Document.id), func.max(Document.id), func.max(Document.updated_at)
+                ).one()
+                self._checked_at = now
+
+                if self._loaded:
+                    if (row_count, max_id, last_updated_at) == (self._row_count, self._max_id, self._last_updated_at):
+                        return
+
+                    conditions = []
+                    if self._last_updated_at is not None:
+                        conditions.append(Document.updated_at > self._last_updated_at)
+                    if self._max_id is not None:
+                        conditions.append(Document.id > self._max_id)
+
+                    query = db.query(Document)
+                    if conditions:
+                        query = query.filter(or_(*conditions))
+                    rows = query.all()
+                    self._index_rows(rows, mongo_db)
+                    self._row_ids.update(row.id for row in rows)
+                    logger.info(f"검색 인덱스 갱신: 문서 {len(rows)}개")
+
+                    if row_count != len(self._row_ids):
+                        self._reconcile_row_ids(db, mongo_db)
+                else:
+                    self._postings.clear()
+                    self._doc_terms.clear()
+                    self._doc_lengths.clear()
+                    self._total_length = 0.0
+
+                    rows = db.query(Document).all()
+                    self._index_rows([row for row in rows if not row.is_deleted], mongo_db)
+                    self._row_ids = {row.id for row in rows}
+                    logger.info(f"검색 인덱스 생성: 문서 {len(self._doc_lengths)}개")
+
+                self._row_count = row_count
+                self._max_id = max_id
+                self._last_updated_at = last_updated_at
+                self._loaded = True
+
+            except Exception as e:
+                logger.error(f"검색 인덱스 동기화 중 오류 발생: {str(e)}")
+
+# 전역 검색 인덱스
+search_index = SearchIndex()
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """전역 검색 인덱스 반환 (비활성화된 경우 None)"""
+    return search_index if SEARCH_CONFIG['enabled'] else None
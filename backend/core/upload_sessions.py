@@ -0,0 +1,301 @@
+"""
+이어받기 업로드 모듈 - 큰 파일을 여러 청크(오프셋 지정, 병렬 가능)로 나누어 업로드하는 세션을 관리합니다.
+
+- 세션 기록은 MongoDB upload_sessions 컬렉션에, 파일은 파일 저장소의 임시 경로에 저장됩니다.
+- 각 청크는 지정된 오프셋에 바로 기록(pwrite)하고, 앞에서부터 이어진 구간까지 SHA-256 을 점진적으로 계산합니다.
+- 청크 기록은 세션 기록에 먼저 예약하며, 완료 처리는 진행 중인 기록이 없을 때만 시작하므로
+  완료 처리 중인 파일에는 더 이상 기록되지 않습니다.
+- 다른 프로세스가 받은 청크가 있거나 서버가 재시작된 경우 완료 시점에 남은 구간만 파일에서 읽어 해시를 마무리합니다.
+"""
+
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.database import Database
+
+from config.settings import RESUMABLE_UPLOAD_CONFIG
+from core.blob_storage import get_blob_storage
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_SESSION_COLLECTION = "upload_sessions"
+
+# 해시 마무리 시 파일에서 한 번에 읽는 크기
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """받은 구간([시작, 끝)) 목록을 정렬 후 겹치거나 맞닿은 구간끼리 병합"""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def contiguous_offset(ranges: List[List[int]]) -> int:
+    """파일 처음부터 빠짐없이 받은 바이트 수"""
+    merged = merge_ranges(ranges)
+    return merged[0][1] if merged and merged[0][0] == 0 else 0
+
+
+class _HashState:
+    """세션별 점진적 해시 상태 (offset 까지 계산됨)"""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.offset = 0
+        self.lock = threading.Lock()
+
+    def advance_from_file(self, path: str, end: int) -> None:
+        """파일에서 offset 부터 end 까지 읽어 해시 갱신 (lock 보유 상태에서 호출)"""
+        if end <= self.offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            while self.offset < end:
+                chunk = f.read(min(_READ_CHUNK_SIZE, end - self.offset))
+                if not chunk:
+                    raise IOError(f"업로드 임시 파일이 예상보다 짧습니다: {path}")
+                self.digest.update(chunk)
+                self.offset += len(chunk)
+
+
+# 이 프로세스에서 생성한 세션의 해시 상태 (업로드 ID -> 상태)
+_hash_states: Dict[str, _HashState] = {}
+
+
+class UploadSessionStore:
+    """MongoDB 기반 이어받기 업로드 세션 저장소 (상태: uploading, finalizing, completed, failed)"""
+
+    def __init__(self, mongo_db: Database):
+        self.collection = mongo_db[UPLOAD_SESSION_COLLECTION]
+        self.ttl = timedelta(seconds=RESUMABLE_UPLOAD_CONFIG['session_ttl_seconds'])
+        self.write_lease = timedelta(seconds=RESUMABLE_UPLOAD_CONFIG['write_lease_seconds'])
+
+    @staticmethod
+    def create_indexes(mongo_db: Database) -> None:
+        """사용자별 조회 및 만료 세션 정리용 인덱스 생성"""
+        collection = mongo_db[UPLOAD_SESSION_COLLECTION]
+        collection.create_index([("user_id", ASCENDING), ("created_at", ASCENDING)])
+        collection.create_index([("expires_at", ASCENDING)])
+
+    def create(self, user_id: int, filename: str, total_size: int,
+               metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """세션 생성 (임시 파일을 전체 크기로 미리 할당)"""
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        staging_path = get_blob_storage().staging_path()
+        with open(staging_path, "wb") as f:
+            f.truncate(total_size)
+
+        now = datetime.utcnow()
+        record = {
+            "_id": upload_id,
+            "user_id": user_id,
+            "filename": filename,
+            "total_size": total_size,
+            "staging_path": staging_path,
+            "ranges": [],
+            "active_writes": [],
+            "status": "uploading",
+            "metadata": metadata or {},
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": now + self.ttl
+        }
+        self.collection.insert_one(record)
+        _hash_states[upload_id] = _HashState()
+
+        logger.info(f"이어받기 업로드 세션 생성: {upload_id} ({filename}, {total_size}바이트)")
+        return record
+
+    def get(self, upload_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        return self.collection.find_one({"_id": upload_id, "user_id": user_id})
+
+    def _reserve_write(self, upload_id: str) -> str:
+        """청크 기록 예약 (uploading 상태일 때만) -> 예약 ID"""
+        write_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        reserved = self.collection.find_one_and_update(
+            {"_id": upload_id, "status": "uploading"},
+            {
+                "$push": {"active_writes": {"id": write_id, "expires_at": now + self.write_lease}},
+                "$set": {"updated_at": now, "expires_at": now + self.ttl}
+            }
+        )
+        if reserved is None:
+            raise ValueError(f"업로드 세션이 이미 완료되었거나 삭제되었습니다: {upload_id}")
+        return write_id
+
+    def write_chunk(self, record: Dict[str, Any], offset: int, data: bytes) -> Dict[str, Any]:
+        """
+        청크를 오프셋 위치에 기록하고 받은 구간 갱신 -> 갱신된 세션
+
+        - 기록 전에 세션에 예약하므로 완료 처리가 시작된 뒤에는 파일에 기록하지 않음 (ValueError)
+        - 같은 구간의 재전송은 같은 내용을 덮어쓰므로 안전
+        - 블로킹 I/O 이므로 스레드 풀에서 호출
+        """
+        upload_id = record["_id"]
+        write_id = self._reserve_write(upload_id)
+
+        try:
+            fd = os.open(record["staging_path"], os.O_WRONLY)
+            try:
+                written = 0
+                while written < len(data):
+                    written += os.pwrite(fd, data[written:], offset + written)
+            finally:
+                os.close(fd)
+        except BaseException as e:
+            self.collection.update_one({"_id": upload_id}, {"$pull": {"active_writes": {"id": write_id}}})
+            if isinstance(e, FileNotFoundError):
+                raise ValueError(f"업로드 세션 임시 파일이 없습니다: {upload_id}")
+            raise
+
+        now = datetime.utcnow()
+        updated = self.collection.find_one_and_update(
+            {"_id": upload_id, "status": "uploading"},
+            {
+                "$push": {"ranges": [offset, offset + len(data)]},
+                "$pull": {"active_writes": {"id": write_id}},
+                "$set": {"updated_at": now, "expires_at": now + self.ttl}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            raise ValueError(f"업로드 세션이 이미 완료되었거나 삭제되었습니다: {upload_id}")
+
+        state = _hash_states.get(upload_id)
+        if state is not None:
+            with state.lock:
+                # 이어지는 청크는 받은 바이트로 바로 계산하고, 먼저 도착한 뒤쪽 청크는 파일에서 읽음
+                if offset <= state.offset < offset + len(data):
+                    state.digest.update(data[state.offset - offset:])
+                    state.offset = offset + len(data)
+                state.advance_from_file(record["staging_path"], contiguous_offset(updated["ranges"]))
+
+        return updated
+
+    @staticmethod
+    def received_bytes(record: Dict[str, Any]) -> int:
+        return sum(end - start for start, end in merge_ranges(record.get("ranges", [])))
+
+    @staticmethod
+    def is_complete(record: Dict[str, Any]) -> bool:
+        return contiguous_offset(record.get("ranges", [])) >= record["total_size"]
+
+    def begin_finalize(self, record: Dict[str, Any]) -> bool:
+        """
+        완료 처리 시작 (동시에 들어온 완료 요청 중 하나만 True)
+
+        - 유효한 청크 기록 예약이 남아 있으면 False (기록이 끝난 뒤 다시 요청)
+        """
+        now = datetime.utcnow()
+        return self.collection.update_one(
+            {"_id": record["_id"], "status": "uploading",
+             "active_writes": {"$not": {"$elemMatch": {"expires_at": {"$gt": now}}}}},
+            {"$set": {"status": "finalizing", "active_writes": [], "updated_at": now}}
+        ).modified_count == 1
+
+    @staticmethod
+    def finalize_path(record: Dict[str, Any]) -> str:
+        """
+        문서 생성에 넘길 임시 파일 경로 (블로킹 I/O 이므로 스레드 풀에서 호출)
+
+        - 세션 임시 파일의 복사본이므로 파일 저장소에 저장된 파일과 세션 파일은 서로 독립적
+          (완료 처리가 실패해도 세션 파일로 다시 완료 요청 가능)
+        """
+        finalize_path = get_blob_storage().staging_path()
+        shutil.copyfile(record["staging_path"], finalize_path)
+        return finalize_path
+
+    def abort_finalize(self, record: Dict[str, Any], error: str) -> str:
+        """
+        완료 처리 실패 기록 -> 변경된 상태
+
+        - 세션 임시 파일이 온전하면 다시 완료를 요청할 수 있도록 uploading 으로 되돌림
+        - 임시 파일이 없거나 크기가 다르면 failed (처음부터 다시 업로드해야 함)
+        """
+        staging_path = record["staging_path"]
+        recoverable = os.path.exists(staging_path) and os.path.getsize(staging_path) == record["total_size"]
+        if not recoverable:
+            _hash_states.pop(record["_id"], None)
+
+        new_status = "uploading" if recoverable else "failed"
+        self.collection.update_one(
+            {"_id": record["_id"], "status": "finalizing"},
+            {"$set": {"status": new_status, "error": error, "updated_at": datetime.utcnow()}}
+        )
+        return new_status
+
+    def finish_hash(self, record: Dict[str, Any]) -> str:
+        """
+        전체 파일의 SHA-256 (블로킹 I/O 이므로 스레드 풀에서 호출)
+
+        - 이 프로세스에서 계산한 구간 이후만 파일에서 읽음 (상태가 없으면 처음부터)
+        """
+        state = _hash_states.get(record["_id"]) or _HashState()
+        with state.lock:
+            state.advance_from_file(record["staging_path"], record["total_size"])
+            return state.digest.hexdigest()
+
+    def complete(self, record: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """완료 기록 후 세션 임시 파일 삭제 (파일 저장소에는 finalize_path 로 반영됨, 재요청 시 같은 결과 반환)"""
+        _hash_states.pop(record["_id"], None)
+        get_blob_storage().discard(record["staging_path"])
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": record["_id"]},
+            {"$set": {"status": "completed", "result": result, "updated_at": now,
+                      "expires_at": now + self.ttl}}
+        )
+
+    def delete(self, record: Dict[str, Any]) -> None:
+        """세션과 임시 파일 삭제"""
+        _hash_states.pop(record["_id"], None)
+        if record.get("status") != "completed":
+            get_blob_storage().discard(record.get("staging_path"))
+        self.collection.delete_one({"_id": record["_id"]})
+
+    def cleanup_expired(self) -> int:
+        """만료된 세션과 임시 파일 정리 -> 정리한 세션 수"""
+        now = datetime.utcnow()
+        # 완료 처리 중인 세션은 처리하던 프로세스가 중단된 경우에만 정리
+        expired = list(self.collection.find(
+            {"expires_at": {"$lt": now},
+             "$or": [{"status": {"$ne": "finalizing"}}, {"updated_at": {"$lt": now - self.ttl}}]},
+            {"staging_path": 1, "status": 1}
+        ))
+        for record in expired:
+            self.delete(record)
+
+        if expired:
+            logger.info(f"만료된 업로드 세션 정리: {len(expired)}개")
+        return len(expired)
+
+    @classmethod
+    def to_status(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        """세션 진행 상황 (API 응답 형식)"""
+        ranges = merge_ranges(record.get("ranges", []))
+        return {
+            "upload_id": record["_id"],
+            "filename": record["filename"],
+            "status": record["status"],
+            "total_size": record["total_size"],
+            "offset": contiguous_offset(ranges),
+            "received_bytes": cls.received_bytes(record),
+            "received_ranges": ranges,
+            "expires_at": record.get("expires_at"),
+            "result": record.get("result")
+        }
@@ -3,10 +3,12 @@
 """
 
 import logging
-from typing import Generator
-from sqlalchemy import create_engine
+from datetime import datetime
+from typing import Any, Generator
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from bson import ObjectId
 from pymongo import MongoClient
 from pymongo.database import Database
 
@@ -63,6 +65,28 @@ class DatabaseManager:
         from models.base import Base
         Base.metadata.create_all(bind=engine)
         logger.info("PostgreSQL 데이터베이스 테이블 생성 완료")
+        DatabaseManager.create_search_indexes()
+
+    @staticmethod
+    def create_search_indexes() -> None:
+        """문서 제목/본문 부분 일치 검색용 pg_trgm GIN 인덱스 생성 (검색 인덱스 비활성화 시 ILIKE 에 사용)"""
+        if engine.dialect.name != "postgresql":
+            return
+
+        try:
+            with engine.begin() as connection:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                connection.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_documents_title_trgm "
+                    "ON documents USING gin (title gin_trgm_ops)"
+                ))
+                connection.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_documents_content_trgm "
+                    "ON documents USING gin (content gin_trgm_ops)"
+                ))
+            logger.info("문서 검색용 trigram 인덱스 생성 완료")
+        except Exception as e:
+            logger.error(f"trigram 인덱스 생성 중 오류 발생: {str(e)}")
     
     @staticmethod
     def close_connections() -> None:
@@ -89,6 +113,26 @@ class DatabaseManager:
             mongo_db.analysis_results.create_index("tender_id")
             mongo_db.analysis_results.create_index("created_at")
             
+            # 유사 문서 탐지용 LSH 밴드 인덱스
+            from ai_analysis.near_duplicate import NearDuplicateIndex
+            NearDuplicateIndex.create_indexes(mongo_db)
+            
+            # 멱등성 키 만료(TTL) 인덱스
+            from core.idempotency import IdempotencyStore
+            IdempotencyStore.create_indexes(mongo_db)
+            
+            # 문서 생성 체크포인트 인덱스
+            from ai_analysis.checkpoint import CheckpointStore
+            CheckpointStore.create_indexes(mongo_db)
+            
+            # 이어받기 업로드 세션 인덱스
+            from core.upload_sessions import UploadSessionStore
+            UploadSessionStore.create_indexes(mongo_db)
+            
+            # 텍스트 추출 작업 큐 인덱스
+            from core.extraction import ExtractionQueue
+            ExtractionQueue.create_indexes(mongo_db)
+            
             logger.info("MongoDB 인덱스 생성 완료")
         
         except Exception as e:
@@ -126,6 +170,13 @@ def get_collection(collection_name: str):
     return mongo_db[collection_name]
 
 
+def to_mongo_id(value: Any) -> Any:
+    """문자열로 저장된 MongoDB ID 를 ObjectId 로 변환 (ObjectId 형식이 아니면 그대로 반환)"""
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+
 # 블록체인 데이터베이스 스토리지 (추상화된 인터페이스)
 class BlockchainStorage:
     """블록체인 데이터 스토리지 클래스"""
@@ -154,6 +205,49 @@ class BlockchainStorage:
         
         return transaction_id
     
+    @staticmethod
+    def store_document_hashes(entries: list) -> list:
+        """여러 문서 해시를 한 번에 저장하고 트랜잭션 ID 목록 반환 (입력 순서 유지)
+        
+        entries: {"document_id", "document_hash", "metadata"} 딕셔너리 목록
+        """
+        if not entries:
+            return []
+        
+        blockchain_collection = get_collection("blockchain_transactions")
+        timestamp = datetime.utcnow()
+        
+        transactions = [
+            {
+                "document_id": entry["document_id"],
+                "document_hash": entry["document_hash"],
+                "timestamp": timestamp,
+                "metadata": entry.get("metadata") or {},
+                "transaction_type": "document_hash"
+            }
+            for entry in entries
+        ]
+        
+        result = blockchain_collection.insert_many(transactions, ordered=True)
+        transaction_ids = [str(inserted_id) for inserted_id in result.inserted_ids]
+        
+        logger.info(f"문서 해시 일괄 저장: {len(transaction_ids)}건")
+        
+        return transaction_ids
+    
+    @staticmethod
+    def revoke_document_hashes(transaction_ids: list) -> int:
+        """저장이 취소된 문서의 해시 트랜잭션 삭제 (보상 처리용) -> 삭제된 건수"""
+        if not transaction_ids:
+            return 0
+        
+        blockchain_collection = get_collection("blockchain_transactions")
+        result = blockchain_collection.delete_many({"_id": {"$in": [to_mongo_id(tx_id) for tx_id in transaction_ids]}})
+        
+        logger.info(f"문서 해시 취소: {result.deleted_count}건")
+        
+        return result.deleted_count
+    
     @staticmethod
     def verify_document_hash(document_id: int, document_hash: str) -> bool:
         """저장된 문서 해시 검증"""
@@ -1,6 +1,7 @@
 import os
 import logging
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
@@ -8,7 +9,7 @@ from fastapi.staticfiles import StaticFiles
 # 내부 모듈 임포트
 from config.settings import (
     API_TITLE, API_DESCRIPTION, API_VERSION, API_V1_STR,
-    CORS_ORIGIN_WHITELIST, LOGGING_CONFIG
+    CORS_ORIGIN_WHITELIST, LOGGING_CONFIG, MODEL_CONFIG, DOCUMENT_GENERATION_CONFIG
 )
 from api.routes import (
     auth_router, user_router, data_collection_router, 
@@ -16,6 +17,8 @@ from api.routes import (
     blockchain_router, monitoring_router
 )
 from core.security import get_current_active_user
+from core.extraction import get_extraction_worker
+from ai_analysis.document_generator import preload_document_generators
 
 # 로깅 설정
 logging.config.dictConfig(LOGGING_CONFIG)
@@ -35,6 +38,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 커서 페이지네이션, 다운로드 재검증/이어받기, 청크 업로드
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range", "Accept-Ranges", "Location", "Upload-Offset"],
 )
 
 # 정적 파일 제공
@@ -80,6 +85,29 @@ app.include_router(
     dependencies=[Depends(get_current_active_user)]
 )
 
+@app.on_event("startup")
+async def preload_generators():
+    """생성기 사전 초기화 (품질 검증은 요청마다가 아니라 시작 시 한 번만 실행)"""
+    transformer_config = MODEL_CONFIG['transformer']
+    if transformer_config['preload'] or transformer_config['quality_check']:
+        generator_types = [
+            t for t in DOCUMENT_GENERATION_CONFIG['routing']['preference'] if t in ("transformer", "hybrid")
+        ]
+        await run_in_threadpool(preload_document_generators, generator_types)
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """업로드 문서 텍스트 추출 작업자 시작"""
+    await get_extraction_worker().start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """백그라운드 작업자 종료 (처리 중이던 추출 작업은 점유 시간이 지나면 다시 처리됨)"""
+    await get_extraction_worker().stop()
+
+
 @app.get("/", tags=["루트"])
 async def root():
     """
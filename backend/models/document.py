@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator
 
@@ -17,9 +17,29 @@ class DocumentType(str, Enum):
     TEMPLATE = "template"  # 템플릿
     OTHER = "other"  # 기타
 
+# 목록 조회 미리보기 길이 (문자 수)
+CONTENT_PREVIEW_CHARS = 200
+
+
+def build_document_summary(content: Optional[str], sections_count: int = 0,
+                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """목록 조회용 문서 요약 (쓰기 시점에 계산하여 Document.summary 에 저장)"""
+    content = content or ""
+    summary = {
+        "sections_count": sections_count,
+        "content_length": len(content),
+        "content_words": len(content.split()),
+        "content_preview": content[:CONTENT_PREVIEW_CHARS] + ("..." if len(content) > CONTENT_PREVIEW_CHARS else "")
+    }
+    if metadata:
+        summary["metadata"] = metadata
+    return summary
+
 class Document(BaseDBModel):
     """문서 데이터베이스 모델"""
     __tablename__ = "documents"
+    # 최신순 키셋 페이지네이션용 복합 인덱스
+    __table_args__ = (Index("ix_documents_created_at_id", "created_at", "id"),)
     
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
@@ -27,6 +47,7 @@ class Document(BaseDBModel):
     file_path = Column(String(500), nullable=True)
     file_size = Column(Integer, nullable=True)  # 바이트 단위
     file_format = Column(String(20), nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # 업로드 파일 원본 바이트의 SHA-256
     content = Column(Text, nullable=True)
     
     # 메타데이터
@@ -34,6 +55,8 @@ class Document(BaseDBModel):
     is_template = Column(Boolean, default=False)
     is_ai_generated = Column(Boolean, default=False)
     generation_parameters = Column(JSON, nullable=True)
+    # 목록 조회용 요약 (섹션 수, 본문 길이, 단어 수, 미리보기) - build_document_summary 참조
+    summary = Column(JSON, nullable=True)
     
     # 버전 관리
     version = Column(Integer, default=1)
@@ -56,6 +79,17 @@ class Document(BaseDBModel):
     def __repr__(self):
         return f"<Document {self.id}: {self.title}>"
 
+class FileBlob(BaseDBModel):
+    """콘텐츠 주소 저장소의 파일 (같은 내용의 업로드는 하나의 파일을 참조)"""
+    __tablename__ = "file_blobs"
+    
+    content_hash = Column(String(64), nullable=False, unique=True, index=True)  # SHA-256
+    file_size = Column(Integer, nullable=False)  # 바이트 단위
+    ref_count = Column(Integer, nullable=False, default=0)  # 참조하는 문서 수 (0 이면 정리 대기, BlobStorage.collect 참조)
+    
+    def __repr__(self):
+        return f"<FileBlob {self.content_hash[:12]}: refs={self.ref_count}>"
+
 class DocumentSection(BaseDBModel):
     """문서 섹션 데이터베이스 모델"""
     __tablename__ = "document_sections"
@@ -136,7 +170,9 @@ class DocumentAIUpdate(BaseModel):
 class DocumentInDBBase(DocumentBase, BaseSchema):
     id: Optional[int] = None
     creator_id: int
+    content_hash: Optional[str] = None
     ai_analysis: Optional[Dict[str, Any]] = None
+    summary: Optional[Dict[str, Any]] = None
     blockchain_hash: Optional[str] = None
 
 class Document(DocumentInDBBase):
@@ -206,9 +242,50 @@ class DocumentGenerationRequest(BaseModel):
     max_tokens: Optional[int] = 4000
     include_sections: Optional[List[str]] = None
     exclude_sections: Optional[List[str]] = None
+    # 부분 재생성: 기존 생성 문서(MongoDB ID)에서 지정한 섹션만 다시 생성
+    base_document_id: Optional[str] = None
+    regenerate_sections: Optional[List[str]] = None
+    section_requirements: Optional[Dict[str, str]] = None  # 섹션별 추가 요구사항
+    # 생성 전 확인: 요청 내용이 거의 같은 기존 문서가 있으면 생성하지 않고 해당 문서 제안
+    reuse_near_duplicate: bool = False
+    # 응답 지연 시간 목표(ms): 생성기 선택에 사용 (generator_type 미지정 시)
+    latency_slo_ms: Optional[int] = None
+    # 작업 ID: 같은 ID 로 다시 요청하면 이전 실행에서 완료된 섹션부터 재개
+    job_id: Optional[str] = Field(None, max_length=128)
     
     @validator('target_length')
     def target_length_positive(cls, v):
         if v is not None and v <= 0:
             raise ValueError('대상 길이는 양수여야 합니다')
         return v
+    
+    @validator('latency_slo_ms')
+    def latency_slo_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('지연 시간 목표는 양수여야 합니다')
+        return v
+
+class UploadSessionCreate(BaseModel):
+    """이어받기(청크) 업로드 세션 생성 요청 스키마"""
+    filename: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0, description="전체 파일 크기 (바이트)")
+    title: Optional[str] = None
+    document_type: Optional[str] = None
+    description: Optional[str] = None
+
+class DocumentBulkGenerationRequest(BaseModel):
+    """템플릿 일괄 렌더링(메일 머지) 요청 스키마"""
+    tender_ids: List[int]
+    document_type: DocumentType
+    template_id: Optional[int] = None
+    # 문서 제목 ({{tender_title}} 사용 가능, 비어 있으면 입찰 제목 사용)
+    title: Optional[str] = None
+    content_requirements: Optional[Dict[str, Any]] = None
+    include_sections: Optional[List[str]] = None
+    exclude_sections: Optional[List[str]] = None
+    
+    @validator('tender_ids')
+    def tender_ids_not_empty(cls, v):
+        if not v:
+            raise ValueError('입찰 ID 목록이 비어 있습니다')
+        return list(dict.fromkeys(v))  # 순서를 유지하며 중복 제거
@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, JSON, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator
 
@@ -29,6 +29,8 @@ class TenderType(str, Enum):
 class Tender(BaseDBModel):
     """입찰 데이터베이스 모델"""
     __tablename__ = "tenders"
+    # 최신순 키셋 페이지네이션용 복합 인덱스
+    __table_args__ = (Index("ix_tenders_created_at_id", "created_at", "id"),)
     
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)